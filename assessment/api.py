@@ -0,0 +1,212 @@
+# assessment/api.py
+"""
+Lightweight JSON API for patients and assessments, for ambulance tablets and
+ED dashboards. Responses are built straight from model data without rendering
+templates.
+
+Writes need either a logged-in session, with Django's usual CSRF check, or an
+"Authorization: Bearer <token>" header with one of the API_TOKENS in settings.
+"""
+
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods
+
+from .conditional import (
+    assessment_validators, board_validators, not_modified_response, set_validators, timeline_validators,
+)
+from .forms import PatientForm, StrokeAssessmentForm
+from .ingest import ingest_assessments
+from .models import Patient, StrokeAssessment, current_change_sequence
+from .pagination import InvalidCursor, get_page_size, paginate_patients
+from .serializers import serialize_assessment, serialize_patient
+from .timeline import build_timeline, timeline_rows
+
+# Compact separators keep payloads small for mobile clients.
+COMPACT_JSON = {'separators': (',', ':')}
+
+
+def api_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params=COMPACT_JSON)
+
+
+def api_error(message, status, errors=None):
+    data = {'error': message}
+    if errors is not None:
+        data['errors'] = errors
+    return api_response(data, status=status)
+
+
+class _CsrfCheck(CsrfViewMiddleware):
+    def _reject(self, request, reason):
+        # Return the failure reason instead of a 403 page.
+        return reason
+
+
+def _bearer_token_is_valid(request):
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+    return any(constant_time_compare(token, known) for known in getattr(settings, 'API_TOKENS', ()))
+
+
+def api_write_access(view):
+    """
+    Lets unsafe requests (POST) through only with a valid API bearer token,
+    or from a logged-in user whose request passes the CSRF check. Otherwise
+    responds 401 (not authenticated) or 403 (CSRF failure). Safe requests
+    pass unchecked.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE') and not _bearer_token_is_valid(request):
+            if not request.user.is_authenticated:
+                response = api_error("Authentication required.", 401)
+                response['WWW-Authenticate'] = 'Bearer'
+                return response
+            check = _CsrfCheck(lambda request: None)
+            check.process_request(request)
+            reason = check.process_view(request, None, (), {})
+            if reason is not None:
+                return api_error(f"CSRF check failed: {reason}", 403)
+        return view(request, *args, **kwargs)
+    # Token requests carry no cookies, so CSRF is checked above for sessions only.
+    return csrf_exempt(wrapped)
+
+
+def parse_json_body(request):
+    """
+    Decodes the request body as a JSON object. Returns None if it isn't one.
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@api_write_access
+@require_http_methods(['GET', 'POST'])
+def patients_api_view(request):
+    """
+    GET: lists patients newest arrival first, keyset-paginated like the HTML list.
+    POST: creates a patient from a JSON object with PatientForm fields.
+    """
+    if request.method == 'POST':
+        data = parse_json_body(request)
+        if data is None:
+            return api_error("Request body must be a JSON object.", 400)
+        form = PatientForm(data)
+        if not form.is_valid():
+            return api_error("Invalid patient data.", 400, form.errors.get_json_data())
+        patient = form.save()
+        return api_response(serialize_patient(patient), status=201)
+
+    etag, last_modified = board_validators(current_change_sequence())
+    response = not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+    try:
+        patients, next_cursor = paginate_patients(
+            Patient.objects.with_latest_assessment(),
+            cursor=request.GET.get('after'),
+            page_size=get_page_size(request),
+        )
+    except InvalidCursor:
+        return api_error("Invalid pagination cursor.", 400)
+    response = api_response({
+        'results': [serialize_patient(patient) for patient in patients],
+        'next_cursor': next_cursor,
+    })
+    return set_validators(request, response, etag, last_modified)
+
+
+@api_write_access
+@require_http_methods(['POST'])
+def assessment_create_api_view(request, patient_id):
+    """
+    Creates an assessment for a patient from a JSON object with
+    StrokeAssessmentForm fields, and returns it with its computed decisions.
+    """
+    try:
+        patient = Patient.objects.get(pk=patient_id)
+    except Patient.DoesNotExist:
+        return api_error("Patient not found.", 404)
+    data = parse_json_body(request)
+    if data is None:
+        return api_error("Request body must be a JSON object.", 400)
+    form = StrokeAssessmentForm(data)
+    if not form.is_valid():
+        return api_error("Invalid assessment data.", 400, form.errors.get_json_data())
+    assessment = form.save(commit=False)
+    assessment.patient = patient
+    assessment.save()
+    return api_response(serialize_assessment(assessment), status=201)
+
+
+@require_GET
+def assessment_detail_api_view(request, patient_id, assessment_id):
+    """
+    Returns one assessment with its computed clinical decisions.
+    """
+    try:
+        assessment = StrokeAssessment.objects.select_related('patient').get(
+            pk=assessment_id, patient_id=patient_id
+        )
+    except StrokeAssessment.DoesNotExist:
+        return api_error("Assessment not found.", 404)
+    # Checked before serializing, which evaluates the clinical decisions.
+    etag, last_modified = assessment_validators(assessment)
+    response = not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+    response = api_response(serialize_assessment(assessment))
+    set_validators(request, response, etag, last_modified, revalidate=False)
+    # Assessments rarely change after being recorded, so let clients reuse them briefly.
+    patch_cache_control(response, private=True, max_age=getattr(settings, 'API_ASSESSMENT_MAX_AGE', 60))
+    return response
+
+
+@require_GET
+def assessment_timeline_api_view(request, patient_id):
+    """
+    Returns all of a patient's assessments oldest first, delta-encoded: the
+    first entry has every field, later ones only the fields that changed.
+    Includes the NIHSS trend across the timeline.
+    """
+    etag, last_modified = timeline_validators(patient_id)
+    response = not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+    entries, trend = build_timeline(timeline_rows(patient_id))
+    # Only look the patient up when there is nothing to show, to tell "no assessments" from "no patient".
+    if not entries and not Patient.objects.filter(pk=patient_id).exists():
+        return api_error("Patient not found.", 404)
+    response = api_response({'patient_id': patient_id, 'assessments': entries, 'trend': trend})
+    return set_validators(request, response, etag, last_modified)
+
+
+@api_write_access
+@require_http_methods(['POST'])
+def assessment_bulk_api_view(request):
+    """
+    Ingests many assessments at once. The body is a JSON object with an
+    'assessments' list of rows, each holding 'patient_id', an optional
+    'assessment_time' and StrokeAssessmentForm fields.
+    Valid rows are created; invalid rows are reported by position.
+    """
+    data = parse_json_body(request)
+    if data is None or not isinstance(data.get('assessments'), list):
+        return api_error("Request body must be a JSON object with an 'assessments' list.", 400)
+    max_rows = getattr(settings, 'API_BULK_MAX_ROWS', 10000)
+    if len(data['assessments']) > max_rows:
+        return api_error(f"At most {max_rows} assessments can be sent per request.", 400)
+    result = ingest_assessments(data['assessments'])
+    return api_response(result.as_dict(), status=201 if result.created else 400)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AssessmentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'assessment'
+
+    def ready(self):
+        # Compile the triage rule table at startup, so a bad TRIAGE_RULES
+        # setting fails fast instead of on the first assessment.
+        from .rules import get_rule_engine
+        get_rule_engine()
+        # Connect the signal handlers that drop cached assessment detail renders.
+        from . import fragments  # noqa: F401
@@ -0,0 +1,199 @@
+# assessment/columnar.py
+"""
+Columnar (Arrow/Parquet) export of patients and assessments for analytics.
+
+Record batches are built straight from values_list cursors, with derived
+scores computed per batch by the vectorized engine in scoring.py, and written
+as Parquet datasets partitioned by patient arrival month.
+
+Requires pyarrow and NumPy.
+"""
+
+import shutil
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from .models import Patient, StrokeAssessment
+from .rules import get_rule_engine
+from .scoring import batch_columns, score_columns
+from .serializers import ASSESSMENT_FIELDS
+
+PARTITION_COLUMN = 'arrival_month'
+DEFAULT_BATCH_SIZE = 50000
+
+PATIENT_FIELDS = (
+    'id',
+    'arrival_time',
+    'last_known_well_time',
+    'age',
+    'weight_kg',
+    'systolic_bp',
+    'diastolic_bp',
+    'blood_glucose',
+    'anticoagulant_status',
+    'anticoagulant_medication',
+    'last_anticoagulant_dose',
+)
+
+# Stored assessment columns exported as-is.
+ASSESSMENT_EXPORT_FIELDS = ('id', 'patient_id', 'assessment_time') + ASSESSMENT_FIELDS
+
+_TIMESTAMP = pa.timestamp('us', tz='UTC')
+_ARROW_TYPES = {
+    'AutoField': pa.int64(),
+    'BigAutoField': pa.int64(),
+    'ForeignKey': pa.int64(),
+    'IntegerField': pa.int64(),
+    'FloatField': pa.float64(),
+    'DecimalField': pa.float64(),
+    'BooleanField': pa.bool_(),
+    'CharField': pa.string(),
+    'TextField': pa.string(),
+    'DateTimeField': _TIMESTAMP,
+}
+
+# Derived columns added to the assessment dataset, with their Arrow types.
+DERIVED_SCHEMA = [
+    ('time_since_lkw_hours', pa.float64()),
+    ('within_tpa_window', pa.bool_()),
+    ('within_thrombectomy_window', pa.bool_()),
+    ('nihss_total_score', pa.int64()),
+    ('race_score', pa.int64()),
+    ('tpa_eligibility_status', pa.dictionary(pa.int8(), pa.string())),
+    ('thrombectomy_candidacy', pa.dictionary(pa.int8(), pa.string())),
+    ('tpa_dose', pa.float64()),
+]
+
+
+def _model_field_schema(model, names):
+    fields = []
+    for name in names:
+        field = model._meta.get_field('patient' if name == 'patient_id' else name)
+        fields.append((name, _ARROW_TYPES[field.get_internal_type()]))
+    return fields
+
+
+def patient_schema():
+    return pa.schema(_model_field_schema(Patient, PATIENT_FIELDS) + [(PARTITION_COLUMN, pa.string())])
+
+
+def assessment_schema():
+    return pa.schema(
+        _model_field_schema(StrokeAssessment, ASSESSMENT_EXPORT_FIELDS)
+        + DERIVED_SCHEMA
+        + [(PARTITION_COLUMN, pa.string())]
+    )
+
+
+def _arrow_column(values, arrow_type):
+    if pa.types.is_floating(arrow_type):
+        # Decimal fields arrive as Decimal objects.
+        values = [None if v is None else float(v) for v in values]
+    return pa.array(values, type=arrow_type)
+
+
+def _nullable_array(values, arrow_type):
+    """
+    Converts a float array using NaN for None into an Arrow array with nulls.
+    """
+    missing = np.isnan(values)
+    if pa.types.is_integer(arrow_type):
+        values = np.where(missing, 0, values).astype(np.int64)
+    return pa.array(values, type=arrow_type, mask=missing)
+
+
+def _months(datetimes):
+    return pa.array([f"{value:%Y-%m}" for value in datetimes], type=pa.string())
+
+
+def _iter_row_batches(queryset, columns, batch_size):
+    rows = queryset.values_list(*columns).iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield dict(zip(columns, zip(*batch)))
+
+
+def iter_patient_batches(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yields Arrow record batches of all patients, with the arrival_month partition column.
+    """
+    schema = patient_schema()
+    queryset = Patient.objects.order_by('arrival_time', 'id')
+    for columns in _iter_row_batches(queryset, PATIENT_FIELDS, batch_size):
+        arrays = [_arrow_column(columns[name], schema.field(name).type) for name in PATIENT_FIELDS]
+        arrays.append(_months(columns['arrival_time']))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def iter_assessment_batches(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Yields Arrow record batches of all assessments with derived scores and the
+    arrival_month (of the patient) partition column.
+    """
+    schema = assessment_schema()
+    columns_needed = list(dict.fromkeys(
+        ASSESSMENT_EXPORT_FIELDS + batch_columns() + ('patient__arrival_time',)
+    ))
+    outcomes = get_rule_engine().outcomes
+    tpa_statuses = pa.array(outcomes['tpa_eligibility_status'], type=pa.string())
+    thrombectomy_statuses = pa.array(outcomes['thrombectomy_candidacy'], type=pa.string())
+    queryset = StrokeAssessment.objects.order_by('patient__arrival_time', 'id')
+    for columns in _iter_row_batches(queryset, columns_needed, batch_size):
+        scores = score_columns(columns)
+        arrays = [
+            _arrow_column(columns[name], schema.field(name).type) for name in ASSESSMENT_EXPORT_FIELDS
+        ]
+        arrays += [
+            _nullable_array(scores['time_since_lkw_hours'], pa.float64()),
+            pa.array(scores['within_tpa_window']),
+            pa.array(scores['within_thrombectomy_window']),
+            _nullable_array(scores['nihss_total_score'], pa.int64()),
+            _nullable_array(scores['race_score'], pa.int64()),
+            pa.DictionaryArray.from_arrays(scores['tpa_status'], tpa_statuses),
+            pa.DictionaryArray.from_arrays(scores['thrombectomy_status'], thrombectomy_statuses),
+            _nullable_array(scores['tpa_dose'], pa.float64()),
+            _months(columns['patient__arrival_time']),
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_dataset(batches, schema, base_dir):
+    """
+    Writes record batches as a Parquet dataset under base_dir, Hive-partitioned
+    by arrival month (base_dir/arrival_month=YYYY-MM/part-0.parquet), replacing
+    the partitions it writes. Batches are pulled in the calling thread, which
+    owns the database connection; pyarrow.dataset.write_dataset() would pull
+    them from its own threads.
+    """
+    file_schema = schema.remove(schema.get_field_index(PARTITION_COLUMN))
+    writers = {}
+    try:
+        for batch in batches:
+            table = pa.Table.from_batches([batch])
+            months = table.column(PARTITION_COLUMN)
+            for month in pc.unique(months).to_pylist():
+                writer = writers.get(month)
+                if writer is None:
+                    directory = Path(base_dir) / f"{PARTITION_COLUMN}={month}"
+                    shutil.rmtree(directory, ignore_errors=True)
+                    directory.mkdir(parents=True)
+                    writer = writers[month] = pq.ParquetWriter(directory / 'part-0.parquet', file_schema)
+                writer.write_table(table.filter(pc.equal(months, month)).select(file_schema.names))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+
+def export_parquet(output_dir, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Exports the patients and assessments datasets under output_dir.
+    """
+    write_dataset(iter_patient_batches(batch_size), patient_schema(), f"{output_dir}/patients")
+    write_dataset(iter_assessment_batches(batch_size), assessment_schema(), f"{output_dir}/assessments")
@@ -0,0 +1,90 @@
+# assessment/conditional.py
+"""
+ETag / Last-Modified validators for the patient list, assessment detail and
+their API equivalents.
+
+Validators come from cheap queries (the change sequence counter, or the
+change sequence numbers and updated_at of the rows shown), so a wall display polling an unchanged page gets a
+304 Not Modified without anything being rendered or serialized.
+"""
+
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .fragments import fragment_tag
+from .models import StrokeAssessment
+
+
+def make_etag(*parts):
+    """
+    Returns a quoted strong ETag derived from parts (any repr()-able values).
+    """
+    return '"' + hashlib.sha1(repr(parts).encode()).hexdigest()[:24] + '"'
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value is not None else None
+
+
+def board_validators(change_seq):
+    """
+    Returns (etag, last_modified) for anything listing patients, given the
+    current change sequence number. Creates, updates and deletes all advance
+    it, so it is the whole validator; there is no Last-Modified, as a delete
+    leaves no updated_at behind.
+    """
+    return make_etag('board', change_seq), None
+
+
+def assessment_validators(assessment):
+    """
+    Returns (etag, last_modified) for one assessment with its patient loaded.
+    Uses the same tag as the cached detail render, so both change together.
+    """
+    last_modified = max(assessment.updated_at, assessment.patient.updated_at)
+    return make_etag(*fragment_tag(assessment)), _timestamp(last_modified)
+
+
+def timeline_validators(patient_id):
+    """
+    Returns (etag, last_modified) for a patient's assessment timeline.
+    """
+    stats = StrokeAssessment.objects.filter(patient_id=patient_id).aggregate(
+        count=Count('pk'), change_seq=Max('change_seq'), updated_at=Max('updated_at'),
+    )
+    return make_etag(stats['count'], stats['change_seq']), _timestamp(stats['updated_at'])
+
+
+def _has_pending_messages(request):
+    # Pages showing a flash message must not be reused later, so they get no validators.
+    return hasattr(request, '_messages') and len(get_messages(request)) > 0
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Returns a 304 (or 412) response when the request's If-None-Match /
+    If-Modified-Since headers match the validators, else None.
+    """
+    if _has_pending_messages(request):
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(request, response, etag, last_modified, revalidate=True):
+    """
+    Adds ETag and Last-Modified headers to a successful response. With
+    revalidate, browsers are told to check back (cheaply, with the
+    validators) before every reuse.
+    """
+    if response.status_code != 200 or _has_pending_messages(request):
+        return response
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    if revalidate:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,162 @@
+# assessment/events.py
+"""
+Server-sent events for the live triage board.
+
+The patient list keeps one connection open and receives small JSON deltas for
+patients and assessments as they are saved, instead of being reloaded and
+re-rendered. Changes are read through the change_seq columns (see
+models.ChangeTrackedModel) and deletes through their DeletedRecord tombstones;
+each event's id is its change sequence number, so a reconnecting browser
+resumes from Last-Event-ID without missing a change.
+
+The stream is an async generator: serve it under the ASGI application
+(stroke_project/asgi.py), where an idle connection costs no worker thread.
+Under WSGI it would be buffered whole and hold a worker thread for every open
+board, so there the view answers 204 No Content, which tells the browser not
+to reconnect, and the board is a plain page (see live_board_enabled()).
+"""
+
+import asyncio
+import json
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .models import DeletedRecord, Patient, StrokeAssessment, acurrent_change_sequence
+from .serializers import plain_value
+
+# Values sent for each kind of row; the board updates its cards from these.
+PATIENT_EVENT_FIELDS = (
+    'id',
+    'arrival_time',
+    'last_known_well_time',
+    'age',
+    'weight_kg',
+)
+ASSESSMENT_EVENT_FIELDS = (
+    'id',
+    'patient_id',
+    'assessment_time',
+    'nihss_total_score',
+    'race_score',
+    'hours_since_lkw',
+    'hemorrhage_present',
+    'lvo_status',
+    'tpa_eligibility',
+    'thrombectomy_eligibility',
+)
+
+# Largest number of rows of each kind read per poll.
+EVENT_BATCH_SIZE = 500
+
+
+def live_board_enabled(request):
+    """
+    Returns whether request is served under ASGI, where the board can keep its
+    event stream open.
+    """
+    return isinstance(request, ASGIRequest)
+
+
+def format_event(seq, name, data):
+    """
+    Formats one event in the text/event-stream wire format.
+    """
+    payload = json.dumps({key: plain_value(value) for key, value in data.items()}, separators=(',', ':'))
+    return f"id: {seq}\nevent: {name}\ndata: {payload}\n\n"
+
+
+async def achanges_since(since, limit=EVENT_BATCH_SIZE):
+    """
+    Returns (change_seq, event name, values) for patients and assessments
+    changed or deleted after since, ordered by change sequence number. A
+    'delete' event's values are the deleted row's model name and id.
+    If any table has more than limit changes, the result stops at the last
+    sequence number every read covers, so no change is skipped.
+    """
+    batches = []
+    for name, model, fields in (
+        ('patient', Patient, PATIENT_EVENT_FIELDS),
+        ('assessment', StrokeAssessment, ASSESSMENT_EVENT_FIELDS),
+        ('delete', DeletedRecord, ('model_name', 'object_id')),
+    ):
+        queryset = model.objects.filter(change_seq__gt=since).order_by('change_seq')
+        rows = [row async for row in queryset.values('change_seq', *fields)[:limit]]
+        batches.append((name, rows))
+    for row in batches[-1][1]:
+        row['model'] = row.pop('model_name')
+        row['id'] = row.pop('object_id')
+
+    cutoff = None
+    for _, rows in batches:
+        if len(rows) == limit:
+            last = rows[-1]['change_seq']
+            cutoff = last if cutoff is None else min(cutoff, last)
+    events = [
+        (row.pop('change_seq'), name, row)
+        for name, rows in batches
+        for row in rows
+        if cutoff is None or row['change_seq'] <= cutoff
+    ]
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+async def stream_board_events(since):
+    """
+    Yields board events for every change after since until the connection
+    has been open BOARD_EVENTS_MAX_SECONDS; the browser then reconnects.
+    Polls the single-row change counter and only reads the tables when it moved.
+    """
+    poll_seconds = getattr(settings, 'BOARD_EVENTS_POLL_SECONDS', 1.0)
+    max_seconds = getattr(settings, 'BOARD_EVENTS_MAX_SECONDS', 300)
+    keepalive_seconds = getattr(settings, 'BOARD_EVENTS_KEEPALIVE_SECONDS', 15)
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    last_sent = loop.time()
+    # Tell the browser how soon to reconnect once this stream ends.
+    yield f"retry: {int(poll_seconds * 1000)}\n\n"
+    while loop.time() < deadline:
+        current = await acurrent_change_sequence()
+        if current > since:
+            events = await achanges_since(since)
+            for seq, name, data in events:
+                yield format_event(seq, name, data)
+                since = seq
+                last_sent = loop.time()
+            if not events:
+                # Everything up to current has committed and none of it is
+                # on the board, so don't read the tables again for it.
+                since = current
+        if loop.time() - last_sent >= keepalive_seconds:
+            # Comment line; keeps proxies from closing an idle connection.
+            yield ": keepalive\n\n"
+            last_sent = loop.time()
+        await asyncio.sleep(poll_seconds)
+
+
+@require_GET
+async def board_events_view(request):
+    """
+    Streams patient and assessment changes as server-sent events.
+    Starts after the Last-Event-ID header (set by the browser on reconnect),
+    else after the 'since' query parameter (the change sequence number the
+    board was rendered at), else from now. Answers 204 No Content under WSGI.
+    """
+    if not live_board_enabled(request):
+        return HttpResponse(status=204)
+    since = request.headers.get('Last-Event-ID') or request.GET.get('since')
+    if since is None:
+        since = await acurrent_change_sequence()
+    try:
+        since = int(since)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid event id.")
+    response = StreamingHttpResponse(stream_board_events(since), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream.
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,165 @@
+# assessment/export.py
+"""
+Streaming export of stroke assessments with their computed scores.
+
+Rows are produced lazily from a chunked queryset iterator, so memory use stays
+constant no matter how many assessments are exported. Incremental exports only
+emit rows whose assessment or patient changed since the last persisted watermark,
+followed by a tombstone row (deleted=True) for each assessment deleted since.
+"""
+
+import csv
+import json
+
+from django.db import models, transaction
+
+from .models import DeletedRecord, ExportWatermark, Patient, StrokeAssessment
+from .serializers import ASSESSMENT_FIELDS, plain_value
+
+# Patient columns copied onto every exported assessment row, as (column, field).
+PATIENT_COLUMNS = (
+    ('patient_arrival_time', 'arrival_time'),
+    ('patient_last_known_well_time', 'last_known_well_time'),
+    ('patient_age', 'age'),
+    ('patient_weight_kg', 'weight_kg'),
+    ('patient_systolic_bp', 'systolic_bp'),
+    ('patient_diastolic_bp', 'diastolic_bp'),
+    ('patient_blood_glucose', 'blood_glucose'),
+    ('patient_anticoagulant_status', 'anticoagulant_status'),
+)
+
+# Computed columns, taken from StrokeAssessment.get_clinical_decisions().
+COMPUTED_COLUMNS = (
+    'time_since_lkw_hours',
+    'nihss_total_score',
+    'race_score',
+    'tpa_eligibility_status',
+    'thrombectomy_candidacy',
+    'tpa_dose',
+)
+
+EXPORT_COLUMNS = (
+    ('id', 'patient_id', 'assessment_time', 'updated_at', 'change_seq', 'deleted')
+    + tuple(column for column, _ in PATIENT_COLUMNS)
+    + ASSESSMENT_FIELDS
+    + COMPUTED_COLUMNS
+)
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def export_row(assessment):
+    """
+    Returns the export row (a dict keyed by EXPORT_COLUMNS) for one assessment.
+    """
+    patient = assessment.patient
+    row = {
+        'id': assessment.id,
+        'patient_id': assessment.patient_id,
+        'assessment_time': plain_value(assessment.assessment_time),
+        'updated_at': plain_value(assessment.updated_at),
+        # A row changes when either its assessment or its patient does.
+        'change_seq': max(assessment.change_seq, patient.change_seq),
+        'deleted': False,
+    }
+    for column, field in PATIENT_COLUMNS:
+        row[column] = plain_value(getattr(patient, field))
+    for field in ASSESSMENT_FIELDS:
+        row[field] = plain_value(getattr(assessment, field))
+    decisions = assessment.get_clinical_decisions()
+    for column in COMPUTED_COLUMNS:
+        row[column] = decisions[column]
+    return row
+
+
+def iter_export_rows(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields export rows for every assessment in queryset (all by default),
+    oldest first, fetching chunk_size rows from the database at a time.
+    """
+    if queryset is None:
+        queryset = StrokeAssessment.objects.all()
+    queryset = queryset.select_related('patient').order_by('pk')
+    for assessment in queryset.iterator(chunk_size=chunk_size):
+        yield export_row(assessment)
+
+
+def changed_assessments(since=None, until=None):
+    """
+    Returns assessments whose own row or patient row was changed with a change
+    sequence number in (since, until]. Either bound may be None.
+    """
+    queryset = StrokeAssessment.objects.all()
+    if since is not None:
+        changed_patients = Patient.objects.filter(change_seq__gt=since).values('pk')
+        queryset = queryset.filter(
+            models.Q(change_seq__gt=since) | models.Q(patient__in=changed_patients)
+        )
+    if until is not None:
+        # Rows changed after the export started are picked up by the next run.
+        queryset = queryset.filter(change_seq__lte=until, patient__change_seq__lte=until)
+    return queryset
+
+
+def iter_deleted_rows(since=None, until=None):
+    """
+    Yields a tombstone export row for each assessment deleted with a change
+    sequence number in (since, until], in that order. Only id, change_seq,
+    updated_at (the time of the delete) and deleted are set.
+    """
+    queryset = DeletedRecord.objects.filter(model_name=StrokeAssessment._meta.model_name)
+    if since is not None:
+        queryset = queryset.filter(change_seq__gt=since)
+    if until is not None:
+        queryset = queryset.filter(change_seq__lte=until)
+    records = queryset.order_by('change_seq').values_list('object_id', 'change_seq', 'deleted_at')
+    for object_id, change_seq, deleted_at in records.iterator():
+        row = dict.fromkeys(EXPORT_COLUMNS)
+        row.update(id=object_id, change_seq=change_seq, updated_at=plain_value(deleted_at), deleted=True)
+        yield row
+
+
+def get_watermark(name):
+    """
+    Returns the change sequence number last exported under name, or None if
+    that export has never run (meaning everything should be exported).
+    """
+    return ExportWatermark.objects.filter(name=name).values_list('change_seq', flat=True).first()
+
+
+def set_watermark(name, change_seq):
+    with transaction.atomic():
+        ExportWatermark.objects.update_or_create(name=name, defaults={'change_seq': change_seq})
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, so csv.writer can feed a generator.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """
+    Yields CSV lines (header first) for an iterable of export rows.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([row[column] for column in EXPORT_COLUMNS])
+
+
+def stream_ndjson(rows):
+    """
+    Yields one compact JSON object per line for an iterable of export rows.
+    """
+    for row in rows:
+        yield json.dumps(row, separators=(',', ':')) + '\n'
+
+
+STREAM_WRITERS = {
+    'csv': (stream_csv, 'text/csv'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
@@ -0,0 +1,84 @@
+# assessment/fragments.py
+"""
+Cache of rendered assessment detail fragments.
+
+Assessments rarely change once saved, yet the consultant, the neurologist and
+the transfer center all open the same detail page. Its body is rendered once
+and kept in the 'assessment_fragments' cache (locmem, file or Redis, chosen by
+ASSESSMENT_FRAGMENT_CACHE in settings) under the assessment id.
+
+Each entry is tagged with the change sequence numbers of the assessment and
+its patient and with the triage rule table it was rendered under; a tag
+mismatch counts as a miss, which also covers writes that skip signals
+(bulk_update). Save and delete signals drop entries eagerly.
+"""
+
+import hashlib
+from functools import lru_cache
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Patient, StrokeAssessment
+from .rules import get_rule_engine
+
+FRAGMENT_CACHE_ALIAS = 'assessment_fragments'
+
+FRAGMENT_TEMPLATE = 'assessment/assessment_detail_body.html'
+
+# Bump when FRAGMENT_TEMPLATE changes, so persistent caches stop serving old renders.
+FRAGMENT_TEMPLATE_VERSION = 1
+
+
+def fragment_cache():
+    return caches[FRAGMENT_CACHE_ALIAS]
+
+
+def fragment_key(assessment_id):
+    return f"assessment-detail:{FRAGMENT_TEMPLATE_VERSION}:{assessment_id}"
+
+
+@lru_cache(maxsize=4)
+def _rules_digest(engine):
+    # Stable across processes, unlike hash(), so file and Redis entries stay valid.
+    return hashlib.sha1(engine.source.encode()).hexdigest()[:12]
+
+
+def fragment_tag(assessment):
+    """
+    Returns what a cached render of this assessment must match to be reused.
+    """
+    return (assessment.change_seq, assessment.patient.change_seq, _rules_digest(get_rule_engine()))
+
+
+async def arender_assessment_detail(assessment, context):
+    """
+    Returns the rendered FRAGMENT_TEMPLATE for assessment (with its patient
+    loaded), from the cache when a render with a matching tag is stored.
+    """
+    cache = fragment_cache()
+    key = fragment_key(assessment.id)
+    tag = fragment_tag(assessment)
+    cached = await cache.aget(key)
+    if cached is not None and cached[0] == tag:
+        return mark_safe(cached[1])
+    html = render_to_string(FRAGMENT_TEMPLATE, context)
+    await cache.aset(key, (tag, str(html)))
+    return mark_safe(html)
+
+
+@receiver([post_save, post_delete], sender=StrokeAssessment)
+def _drop_assessment_fragment(sender, instance, **kwargs):
+    fragment_cache().delete(fragment_key(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Patient)
+def _drop_patient_fragments(sender, instance, created=False, **kwargs):
+    # A new patient has no assessments yet; a deleted one had them deleted (and dropped) first.
+    if created or kwargs['signal'] is post_delete:
+        return
+    assessment_ids = StrokeAssessment.objects.filter(patient_id=instance.pk).values_list('pk', flat=True)
+    fragment_cache().delete_many([fragment_key(pk) for pk in assessment_ids])
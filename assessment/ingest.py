@@ -0,0 +1,136 @@
+# assessment/ingest.py
+"""
+Bulk ingestion of stroke assessments, e.g. nightly batches from regional registries.
+
+Rows are validated column by column with the StrokeAssessmentForm field rules,
+their patients are resolved in a single query, and each assessment built from
+them is then run through full_clean() as the form's own validation would, so a
+row is rejected exactly when the form would reject it. Valid rows are written
+with bulk_create in transactions. Invalid rows are skipped and reported.
+"""
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .forms import StrokeAssessmentForm
+from .models import Patient, StrokeAssessment, stamp_changes
+
+# Optional per-row time of the pre-hospital assessment; defaults to the ingest time.
+_assessment_time_field = forms.DateTimeField(required=False)
+
+# Model fields the form doesn't edit, left out of full_clean() as the form leaves them out.
+_FULL_CLEAN_EXCLUDE = [
+    field.name for field in StrokeAssessment._meta.fields
+    if field.name not in StrokeAssessmentForm.base_fields and field.name != 'assessment_time'
+]
+
+
+class IngestResult:
+    """
+    Outcome of an ingest run: created assessment ids and per-row errors.
+    Row numbers are 0-based positions in the input.
+    """
+
+    def __init__(self):
+        self.created_ids = []
+        self.errors = []
+
+    @property
+    def created(self):
+        return len(self.created_ids)
+
+    def add_error(self, row, errors):
+        self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self):
+        return {'created': self.created, 'created_ids': self.created_ids, 'errors': self.errors}
+
+
+def validate_rows(rows):
+    """
+    Cleans every row with the StrokeAssessmentForm field rules.
+    Works column by column, reusing each form field for all rows instead of
+    building one form per row.
+    Returns (cleaned rows, {row index: {field: [messages]}}); a cleaned row is
+    None when the row had errors.
+    """
+    fields = dict(StrokeAssessmentForm.base_fields)
+    fields['assessment_time'] = _assessment_time_field
+    cleaned = [{} for _ in rows]
+    errors = {}
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors[index] = {'__all__': ["Row must be an object."]}
+            continue
+        try:
+            cleaned[index]['patient_id'] = int(row['patient_id'])
+        except KeyError:
+            errors.setdefault(index, {})['patient_id'] = ["This field is required."]
+        except (TypeError, ValueError):
+            errors.setdefault(index, {})['patient_id'] = ["Enter a whole number."]
+
+    for name, field in fields.items():
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                continue
+            value = row.get(name)
+            if value == '':
+                value = None
+            try:
+                cleaned[index][name] = field.clean(value)
+            except ValidationError as error:
+                errors.setdefault(index, {})[name] = list(error.messages)
+
+    for index in errors:
+        cleaned[index] = None
+    return cleaned, errors
+
+
+def ingest_assessments(rows, batch_size=500):
+    """
+    Validates and inserts assessment rows (dicts with 'patient_id', optional
+    'assessment_time' and StrokeAssessmentForm fields).
+    Valid rows are created even if other rows fail; returns an IngestResult.
+    """
+    rows = list(rows)
+    result = IngestResult()
+    cleaned_rows, errors = validate_rows(rows)
+
+    patient_ids = {row['patient_id'] for row in cleaned_rows if row is not None}
+    patients = Patient.objects.in_bulk(patient_ids)
+
+    assessments = []
+    for index, row in enumerate(cleaned_rows):
+        if row is None:
+            continue
+        patient = patients.get(row.pop('patient_id'))
+        if patient is None:
+            errors[index] = {'patient_id': ["Patient not found."]}
+            continue
+        if row['assessment_time'] is None:
+            # Let the model default (now) apply.
+            del row['assessment_time']
+        assessment = StrokeAssessment(patient=patient, **row)
+        # The rest of what StrokeAssessmentForm.is_valid() checks: model validation
+        # (model clean(), constraints) beyond the field rules applied above.
+        try:
+            assessment.full_clean(exclude=_FULL_CLEAN_EXCLUDE)
+        except ValidationError as error:
+            errors[index] = error.message_dict
+            continue
+        # bulk_create skips save(), so fill the stored scores here.
+        assessment.refresh_computed_scores()
+        assessments.append(assessment)
+
+    for start in range(0, len(assessments), batch_size):
+        batch = assessments[start:start + batch_size]
+        with transaction.atomic():
+            stamp_changes(batch)
+            created = StrokeAssessment.objects.bulk_create(batch)
+        result.created_ids.extend(assessment.pk for assessment in created)
+
+    for index in sorted(errors):
+        result.add_error(index, errors[index])
+    return result
@@ -0,0 +1,39 @@
+# assessment/management/commands/backfill_computed_scores.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from assessment.models import StrokeAssessment, stamp_changes
+
+
+class Command(BaseCommand):
+    help = "Recomputes the stored NIHSS total, RACE score and hours since LKW for every assessment."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of assessments updated per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        assessments = StrokeAssessment.objects.select_related('patient').order_by('pk')
+        batch = []
+        updated = 0
+        for assessment in assessments.iterator(chunk_size=batch_size):
+            assessment.refresh_computed_scores()
+            batch.append(assessment)
+            if len(batch) >= batch_size:
+                updated += self._write_batch(batch)
+                batch = []
+        if batch:
+            updated += self._write_batch(batch)
+        self.stdout.write(self.style.SUCCESS(f"Updated computed scores for {updated} assessments."))
+
+    def _write_batch(self, batch):
+        with transaction.atomic():
+            stamp_changes(batch)
+            StrokeAssessment.objects.bulk_update(
+                batch, StrokeAssessment.COMPUTED_SCORE_FIELDS + StrokeAssessment.CHANGE_FIELDS
+            )
+        return len(batch)
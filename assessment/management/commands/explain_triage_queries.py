@@ -0,0 +1,59 @@
+# assessment/management/commands/explain_triage_queries.py
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from assessment.models import Patient, StrokeAssessment
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the query plan and average run time of the triage-board queries "
+        "against the current database. Run it before and after 'migrate' on a "
+        "seeded database to compare plans with and without the indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Number of timed runs per query (default: 5).",
+        )
+
+    def get_queries(self):
+        """
+        Returns (label, queryset) pairs for the query patterns used by the triage board.
+        """
+        newest_patient = Patient.objects.order_by('-arrival_time', '-id').first()
+        patient_id = newest_patient.id if newest_patient else 0
+        return [
+            ("Patient list page (newest arrivals + latest assessment)",
+             Patient.objects.with_latest_assessment().order_by('-arrival_time', '-id')[:50]),
+            ("Latest assessment for one patient",
+             StrokeAssessment.objects.filter(patient_id=patient_id).order_by('-assessment_time')[:1]),
+            ("Patients with LKW in the last 24 h",
+             Patient.objects.filter(
+                 last_known_well_time__gte=timezone.now() - timedelta(hours=24)
+             ).order_by('-last_known_well_time')),
+            ("Latest assessments marked tPA eligible",
+             StrokeAssessment.objects.filter(tpa_eligibility='ELIGIBLE').order_by('-assessment_time')[:50]),
+            ("Latest assessments marked thrombectomy eligible",
+             StrokeAssessment.objects.filter(thrombectomy_eligibility='ELIGIBLE').order_by('-assessment_time')[:50]),
+        ]
+
+    def handle(self, *args, **options):
+        repeat = max(1, options['repeat'])
+        self.stdout.write(
+            f"{Patient.objects.count()} patients, {StrokeAssessment.objects.count()} assessments\n"
+        )
+        for label, queryset in self.get_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(queryset.explain())
+            started = time.perf_counter()
+            for _ in range(repeat):
+                # list() forces evaluation; clone the queryset so results aren't cached between runs
+                list(queryset.all())
+            elapsed_ms = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write(f"average: {elapsed_ms:.2f} ms over {repeat} runs\n")
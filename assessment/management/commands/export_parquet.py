@@ -0,0 +1,25 @@
+# assessment/management/commands/export_parquet.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports patients and assessments (with derived scores) as Parquet datasets "
+        "partitioned by patient arrival month. Requires pyarrow and NumPy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('output_dir', help="Directory that will hold the patients/ and assessments/ datasets.")
+        parser.add_argument(
+            '--batch-size', type=int, default=50000,
+            help="Rows per Arrow record batch (default: 50000).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from assessment.columnar import export_parquet
+        except ImportError as exc:
+            raise CommandError(f"Parquet export needs pyarrow and numpy installed ({exc}).")
+        export_parquet(options['output_dir'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote Parquet datasets to {options['output_dir']}"))
@@ -0,0 +1,234 @@
+# assessment/management/commands/generate_synthetic_data.py
+
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from assessment.models import (
+    Patient, StrokeAssessment, CONTRAINDICATION_FIELDS, NIHSS_ITEM_MAXIMUMS, stamp_changes,
+)
+
+
+# Limb items that depend on the side of the deficit, as (left, right) pairs.
+LATERALIZED_ITEMS = (
+    ('nihss_5a_motor_left_arm', 'nihss_5b_motor_right_arm'),
+    ('nihss_6a_motor_left_leg', 'nihss_6b_motor_right_leg'),
+)
+
+# Rough per-assessment prevalence of each tPA contraindication.
+CONTRAINDICATION_RATES = {
+    'recent_surgery': 0.03,
+    'prior_stroke_head_trauma': 0.04,
+    'gi_urinary_hemorrhage': 0.02,
+    'low_platelets': 0.02,
+    'elevated_inr': 0.04,
+    'current_anticoagulant_use': 0.08,
+}
+
+ANTICOAGULANTS = ['Warfarin', 'Apixaban', 'Rivaroxaban', 'Dabigatran', 'Edoxaban']
+
+# Arrivals are spread over --days before this time unless --anchor is given,
+# so the same --seed gives the same data on every run.
+DEFAULT_ANCHOR = '2025-01-01T00:00:00+00:00'
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generates synthetic patients and stroke assessments with clinically "
+        "plausible distributions, for load testing and benchmarking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--patients', type=int, default=1000, help="Number of patients to create (default: 1000).")
+        parser.add_argument(
+            '--assessments-per-patient', type=int, default=1,
+            help="Assessments created for each patient, 15 minutes apart (default: 1).",
+        )
+        parser.add_argument('--seed', type=int, default=0, help="Random seed for reproducible data (default: 0).")
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help="Patients written per bulk_create/transaction (default: 2000).",
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help="Spread patient arrivals over this many days before --anchor (default: 365).",
+        )
+        parser.add_argument(
+            '--anchor', default=DEFAULT_ANCHOR,
+            help=(
+                "ISO 8601 time every generated time is derived from, or 'now' for the current "
+                f"time (default: {DEFAULT_ANCHOR}). Naive times are in TIME_ZONE."
+            ),
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete all existing patients and assessments first.",
+        )
+
+    def handle(self, *args, **options):
+        if options['patients'] < 0 or options['assessments_per_patient'] < 0:
+            raise CommandError("--patients and --assessments-per-patient must not be negative.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        self.rng = random.Random(options['seed'])
+        self.anchor = self.parse_anchor(options['anchor'])
+        self.days = options['days']
+
+        if options['clear']:
+            # Deleting patients cascades to their assessments.
+            Patient.objects.all().delete()
+
+        remaining = options['patients']
+        created_patients = created_assessments = 0
+        while remaining > 0:
+            batch_size = min(options['batch_size'], remaining)
+            with transaction.atomic():
+                patients = [self.make_patient() for _ in range(batch_size)]
+                stamp_changes(patients)
+                patients = Patient.objects.bulk_create(patients)
+                assessments = []
+                for patient in patients:
+                    assessments.extend(self.make_assessments(patient, options['assessments_per_patient']))
+                stamp_changes(assessments)
+                StrokeAssessment.objects.bulk_create(assessments, batch_size=options['batch_size'])
+            remaining -= batch_size
+            created_patients += len(patients)
+            created_assessments += len(assessments)
+            self.stdout.write(f"  {created_patients} patients, {created_assessments} assessments...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created_patients} patients and {created_assessments} assessments."
+        ))
+
+    def parse_anchor(self, value):
+        if value == 'now':
+            return timezone.now()
+        try:
+            anchor = parse_datetime(value)
+        except ValueError:
+            anchor = None
+        if anchor is None:
+            raise CommandError(f"--anchor must be an ISO 8601 date and time or 'now', not '{value}'.")
+        if timezone.is_naive(anchor):
+            anchor = timezone.make_aware(anchor)
+        return anchor
+
+    def make_patient(self):
+        """
+        Builds an unsaved Patient with plausible demographics and vitals.
+        """
+        rng = self.rng
+        arrival_time = self.anchor - timedelta(minutes=rng.uniform(0, self.days * 24 * 60))
+
+        # Most patients present within a few hours of onset; about 10% have unknown LKW.
+        last_known_well_time = None
+        if rng.random() >= 0.10:
+            onset_minutes = _clamp(rng.lognormvariate(4.8, 0.8), 10, 24 * 60)
+            last_known_well_time = arrival_time - timedelta(minutes=onset_minutes)
+
+        anticoagulant_status = rng.choices(
+            ['NONE', 'CURRENT', 'RECENT', 'UNKNOWN'], weights=[70, 12, 5, 13]
+        )[0]
+        anticoagulant_medication = last_anticoagulant_dose = None
+        if anticoagulant_status in ('CURRENT', 'RECENT'):
+            anticoagulant_medication = rng.choice(ANTICOAGULANTS)
+            last_anticoagulant_dose = arrival_time - timedelta(hours=rng.uniform(2, 48))
+
+        return Patient(
+            arrival_time=arrival_time,
+            last_known_well_time=last_known_well_time,
+            age=int(_clamp(rng.gauss(70, 13), 18, 100)),
+            weight_kg=Decimal(f"{_clamp(rng.gauss(80, 18), 40, 180):.2f}"),
+            systolic_bp=int(_clamp(rng.gauss(160, 25), 90, 240)),
+            diastolic_bp=int(_clamp(rng.gauss(90, 15), 50, 140)),
+            blood_glucose=Decimal(f"{_clamp(rng.gauss(130, 40), 40, 500):.2f}"),
+            anticoagulant_status=anticoagulant_status,
+            anticoagulant_medication=anticoagulant_medication,
+            last_anticoagulant_dose=last_anticoagulant_dose,
+        )
+
+    def make_assessments(self, patient, count):
+        """
+        Builds unsaved assessments for a patient: the first shortly after arrival,
+        then re-assessments every 15 minutes with small NIHSS drift.
+        """
+        rng = self.rng
+        assessments = []
+        # Latent severity (0-1) drives NIHSS items, LVO likelihood and imaging.
+        severity = rng.betavariate(1.5, 3.5)
+        left_sided = rng.random() < 0.5
+        hemorrhage = rng.random() < 0.12
+        lvo_present = not hemorrhage and rng.random() < 0.1 + 0.6 * severity
+        first_time = patient.arrival_time + timedelta(minutes=rng.uniform(5, 30))
+        ct_scan_time = patient.arrival_time + timedelta(minutes=rng.uniform(10, 45))
+
+        for index in range(count):
+            severity = _clamp(severity + rng.gauss(0, 0.05), 0, 1)
+            assessment = StrokeAssessment(
+                patient=patient,
+                assessment_time=first_time + timedelta(minutes=15 * index),
+                ct_scan_time=ct_scan_time,
+                hemorrhage_present=hemorrhage,
+                lvo_status='PRESENT' if lvo_present else rng.choices(['ABSENT', 'NOT_ASSESSED', 'UNKNOWN'], weights=[80, 15, 5])[0],
+                lvo_location=rng.choice(['ICA', 'M1', 'M2', 'Basilar']) if lvo_present else None,
+                aspects_score=None if rng.random() < 0.1 else int(_clamp(round(rng.gauss(9 - 4 * severity, 1.5)), 0, 10)),
+            )
+            self.fill_nihss(assessment, severity, left_sided)
+            for name in CONTRAINDICATION_FIELDS:
+                setattr(assessment, name, rng.random() < CONTRAINDICATION_RATES[name])
+            assessment.be_fast_balance = assessment.nihss_7_limb_ataxia not in (None, 0)
+            assessment.be_fast_eyes = assessment.nihss_3_visual_field not in (None, 0)
+            assessment.be_fast_face_drooping = assessment.nihss_4_facial_palsy not in (None, 0)
+            assessment.be_fast_arm_weakness = any(
+                getattr(assessment, name) not in (None, 0) for name in LATERALIZED_ITEMS[0]
+            )
+            assessment.be_fast_speech_difficulty = any(
+                getattr(assessment, name) not in (None, 0)
+                for name in ('nihss_9_best_language', 'nihss_10_dysarthria')
+            )
+            assessment.be_fast_time_to_call = True
+            assessment.be_fast_plus_other = rng.random() < 0.15
+
+            # bulk_create skips save(), so fill the stored scores and manual eligibility here.
+            assessment.refresh_computed_scores()
+            decisions = assessment.get_clinical_decisions()
+            if decisions['tpa_eligibility_status'] == "Potentially Eligible":
+                assessment.tpa_eligibility = 'ELIGIBLE'
+            elif decisions['tpa_eligibility_status'].startswith("Contraindicated"):
+                assessment.tpa_eligibility = 'CONTRAINDICATED'
+            else:
+                assessment.tpa_eligibility = 'NOT_ELIGIBLE'
+            if decisions['thrombectomy_candidacy'] == "Potentially Candidate":
+                assessment.thrombectomy_eligibility = 'ELIGIBLE'
+            elif decisions['thrombectomy_candidacy'].startswith("Pending"):
+                assessment.thrombectomy_eligibility = 'PENDING'
+            else:
+                assessment.thrombectomy_eligibility = 'NOT_ELIGIBLE'
+            assessments.append(assessment)
+        return assessments
+
+    def fill_nihss(self, assessment, severity, left_sided):
+        """
+        Draws each NIHSS item from a binomial over its range, scaled by severity.
+        Lateralized motor items are mostly spared on the unaffected side, and
+        about 3% of items are left unrecorded.
+        """
+        rng = self.rng
+        # A left-sided deficit spares the right limbs, and vice versa.
+        spared = {right if left_sided else left for left, right in LATERALIZED_ITEMS}
+        for name, maximum in NIHSS_ITEM_MAXIMUMS.items():
+            if rng.random() < 0.03:
+                setattr(assessment, name, None)
+                continue
+            probability = severity * 0.1 if name in spared else severity
+            setattr(assessment, name, sum(rng.random() < probability for _ in range(maximum)))
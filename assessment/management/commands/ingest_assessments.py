@@ -0,0 +1,71 @@
+# assessment/management/commands/ingest_assessments.py
+
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assessment.ingest import ingest_assessments
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-imports stroke assessments from a CSV, NDJSON or JSON file. Each row needs "
+        "'patient_id' plus StrokeAssessmentForm fields and may set 'assessment_time'. "
+        "Valid rows are imported; invalid rows are reported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import.")
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson', 'json'],
+            help="Input format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Rows inserted per transaction (default: 500).",
+        )
+        parser.add_argument(
+            '--errors-output',
+            help="Write per-row errors to this JSON file instead of printing them.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        input_format = options['format'] or path.suffix.lstrip('.').lower()
+        if input_format not in ('csv', 'ndjson', 'json'):
+            raise CommandError("Cannot guess the format; pass --format csv, ndjson or json.")
+
+        rows = self.read_rows(path, input_format)
+        result = ingest_assessments(rows, batch_size=options['batch_size'])
+
+        if result.errors:
+            if options['errors_output']:
+                with open(options['errors_output'], 'w') as fh:
+                    json.dump(result.errors, fh, indent=2)
+            else:
+                for error in result.errors:
+                    self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        style = self.style.SUCCESS if not result.errors else self.style.WARNING
+        self.stdout.write(style(
+            f"Imported {result.created} assessments; {len(result.errors)} rows rejected."
+        ))
+
+    def read_rows(self, path, input_format):
+        with open(path, newline='' if input_format == 'csv' else None) as fh:
+            if input_format == 'csv':
+                return list(csv.DictReader(fh))
+            try:
+                if input_format == 'ndjson':
+                    return [json.loads(line) for line in fh if line.strip()]
+                data = json.load(fh)
+            except ValueError as exc:
+                raise CommandError(f"Invalid JSON: {exc}")
+        if isinstance(data, dict):
+            data = data.get('assessments')
+        if not isinstance(data, list):
+            raise CommandError("JSON input must be a list of rows or an object with an 'assessments' list.")
+        return data
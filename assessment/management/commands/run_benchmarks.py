@@ -0,0 +1,206 @@
+# assessment/management/commands/run_benchmarks.py
+
+import io
+import json
+import statistics
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from assessment.fragments import fragment_cache
+from assessment.models import StrokeAssessment
+
+
+# Per-instance StrokeAssessment methods timed by the scoring benchmarks.
+SCORING_METHODS = (
+    'get_time_since_lkw_hours',
+    'calculate_nihss_total_score',
+    'calculate_race_score',
+    'get_aspects_interpretation',
+    'get_tpa_eligibility_status',
+    'calculate_tpa_dose',
+    'get_thrombectomy_candidacy',
+    'get_bp_management_target',
+    'get_stroke_center_recommendation',
+    'get_transfer_recommendation',
+    'get_critical_time_targets',
+)
+
+# A valid StrokeAssessmentForm submission used for the POST benchmark.
+ASSESSMENT_POST_DATA = {
+    'be_fast_face_drooping': 'on',
+    'be_fast_arm_weakness': 'on',
+    'nihss_1a_loc_alert': 0, 'nihss_1b_loc_questions': 1, 'nihss_1c_loc_commands': 0,
+    'nihss_2_best_gaze': 1, 'nihss_3_visual_field': 0, 'nihss_4_facial_palsy': 2,
+    'nihss_5a_motor_left_arm': 3, 'nihss_5b_motor_right_arm': 0,
+    'nihss_6a_motor_left_leg': 2, 'nihss_6b_motor_right_leg': 0,
+    'nihss_7_limb_ataxia': 0, 'nihss_8_sensory': 1, 'nihss_9_best_language': 2,
+    'nihss_10_dysarthria': 1, 'nihss_11_extinction_inattention': 1,
+    'aspects_score': 8,
+    'lvo_status': 'PRESENT',
+    'lvo_location': 'M1',
+    'tpa_eligibility': 'PENDING',
+    'thrombectomy_eligibility': 'PENDING',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the main views and StrokeAssessment scoring methods on synthetic "
+        "datasets of increasing size, recording timings and query counts as JSON. "
+        "Runs against a throwaway test database, never the configured one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+            help="Patient counts to benchmark (default: 100 1000 10000).",
+        )
+        parser.add_argument(
+            '--assessments-per-patient', type=int, default=2,
+            help="Assessments generated per patient (default: 2).",
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per view benchmark (default: 5).")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--label', default='', help="Free-form label stored with the results, e.g. a commit hash.")
+        parser.add_argument('--compare', help="Compare against a previous results JSON file and flag regressions.")
+        parser.add_argument(
+            '--threshold', type=float, default=1.2,
+            help="Slowdown ratio reported as a regression when comparing (default: 1.2).",
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        self.repeat = options['repeat']
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            results = []
+            for size in options['sizes']:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Dataset: {size} patients"))
+                call_command(
+                    'generate_synthetic_data', patients=size, seed=size, clear=True,
+                    assessments_per_patient=options['assessments_per_patient'], stdout=io.StringIO(),
+                )
+                for result in self.run_view_benchmarks(size) + self.run_scoring_benchmarks(size):
+                    self.report(result)
+                    results.append(result)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        payload = {'label': options['label'], 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(payload, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+        if options['compare']:
+            self.compare(results, options['compare'], options['threshold'])
+
+    def time_call(self, func, setup=None):
+        """
+        Runs func self.repeat times and returns (timings in ms, query count of the last run).
+        setup, if given, runs untimed before each call.
+        """
+        timings = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1000)
+        return timings, len(queries)
+
+    def make_result(self, name, size, timings, queries):
+        return {
+            'name': name,
+            'size': size,
+            'mean_ms': round(statistics.mean(timings), 3),
+            'min_ms': round(min(timings), 3),
+            'queries': queries,
+        }
+
+    def run_view_benchmarks(self, size):
+        client = Client()
+        assessment = StrokeAssessment.objects.select_related('patient').first()
+        patient = assessment.patient
+        list_url = reverse('assessment:patient_list')
+        detail_url = reverse('assessment:assessment_detail', args=[patient.id, assessment.id])
+        form_url = reverse('assessment:stroke_assessment_form', args=[patient.id])
+
+        def get(url):
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+
+        def post_assessment():
+            response = client.post(form_url, ASSESSMENT_POST_DATA)
+            assert response.status_code == 302, response.status_code
+
+        # (name, timed call, untimed setup before each call). The detail view is
+        # timed with its rendered body dropped from the fragment cache before every
+        # call (a full render) and, separately, served from the cache, which the
+        # last uncached call leaves filled. One untimed request loads the templates.
+        get(detail_url)
+        benchmarks = [
+            ('view:patient_list', lambda: get(list_url), None),
+            ('view:assessment_detail', lambda: get(detail_url), fragment_cache().clear),
+            ('view:assessment_detail_cached', lambda: get(detail_url), None),
+            ('view:stroke_assessment_form_post', post_assessment, None),
+        ]
+        return [self.make_result(name, size, *self.time_call(func, setup)) for name, func, setup in benchmarks]
+
+    def run_scoring_benchmarks(self, size):
+        """
+        Times each scoring method across every assessment in the dataset.
+        Instances are reloaded for each method so the decision cache starts cold:
+        a fresh queryset each time, as reusing one would return its cached instances.
+        """
+        results = []
+        for method in SCORING_METHODS:
+            assessments = list(StrokeAssessment.objects.select_related('patient'))
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for assessment in assessments:
+                    getattr(assessment, method)()
+                elapsed = (time.perf_counter() - started) * 1000
+            results.append(self.make_result(f'scoring:{method}', size, [elapsed], len(queries)))
+        return results
+
+    def report(self, result):
+        self.stdout.write(
+            f"  {result['name']:<50} {result['mean_ms']:>10.2f} ms  {result['queries']:>5} queries"
+        )
+
+    def compare(self, results, baseline_path, threshold):
+        with open(baseline_path) as fh:
+            baseline = {(r['name'], r['size']): r for r in json.load(fh)['results']}
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Comparison against {baseline_path}"))
+        regressions = 0
+        for result in results:
+            previous = baseline.get((result['name'], result['size']))
+            if previous is None:
+                continue
+            ratio = result['mean_ms'] / previous['mean_ms'] if previous['mean_ms'] else 1.0
+            line = (
+                f"  {result['name']:<50} n={result['size']:<7} {previous['mean_ms']:>9.2f} -> "
+                f"{result['mean_ms']:>9.2f} ms (x{ratio:.2f}), queries {previous['queries']} -> {result['queries']}"
+            )
+            if ratio > threshold or result['queries'] > previous['queries']:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        if regressions:
+            self.stdout.write(self.style.ERROR(f"{regressions} regression(s) found."))
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions found."))
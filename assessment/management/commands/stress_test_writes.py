@@ -0,0 +1,203 @@
+# assessment/management/commands/stress_test_writes.py
+
+import json
+import logging
+import math
+import multiprocessing
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from assessment.management.commands.run_benchmarks import ASSESSMENT_POST_DATA
+
+
+def _patient_post_data():
+    now = timezone.now()
+    return {
+        'arrival_time': now.strftime('%Y-%m-%d %H:%M'),
+        'last_known_well_time': (now - timedelta(hours=1)).strftime('%Y-%m-%d %H:%M'),
+        'age': 70,
+        'weight_kg': '80.00',
+        'systolic_bp': 160,
+        'diastolic_bp': 90,
+        'blood_glucose': '110.00',
+        'anticoagulant_status': 'NONE',
+    }
+
+
+def _is_lock_error(error):
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def _run_worker(iterations, results):
+    """
+    Registers iterations patients, each followed by an assessment, through
+    the views with a test client, appending one (outcome, seconds) per pair.
+    """
+    client = Client()
+    patient_url = reverse('assessment:patient_form')
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                response = client.post(patient_url, _patient_post_data())
+                if response.status_code != 302:
+                    results.append(('error', time.perf_counter() - started))
+                    continue
+                # The patient form redirects to the new patient's assessment form.
+                response = client.post(response['Location'], ASSESSMENT_POST_DATA)
+                outcome = 'ok' if response.status_code == 302 else 'error'
+            except OperationalError as error:
+                outcome = 'locked' if _is_lock_error(error) else 'error'
+            results.append((outcome, time.perf_counter() - started))
+    finally:
+        connections.close_all()
+
+
+def _run_threads(threads, iterations):
+    results = []
+    workers = [threading.Thread(target=_run_worker, args=(iterations, results)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def _run_process(args):
+    # Runs in a forked child; module-level so multiprocessing can call it.
+    return _run_threads(*args)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stress-tests concurrent writes: many threads (optionally in several processes) "
+        "register a patient and post an assessment through the views at once, and "
+        "throughput, latency and 'database is locked' errors are reported for each "
+        "SQLite tuning mode. Runs against a throwaway file-based test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help="Writer threads per process (default: 8).")
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help="Processes, each running --threads writers (default: 1). Needs the fork start method.",
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=25,
+            help="Patient + assessment pairs created by each writer (default: 25).",
+        )
+        parser.add_argument(
+            '--modes', nargs='+',
+            help="SQLITE_TUNING_MODES to compare (default: all of them).",
+        )
+        parser.add_argument(
+            '--busy-timeout', type=float,
+            help="Seconds a writer waits for a lock, overriding each mode's 'timeout' (default: SQLITE_BUSY_TIMEOUT).",
+        )
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+
+    def handle(self, *args, **options):
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            raise CommandError("stress_test_writes measures SQLite lock contention; DATABASE_ENGINE must be 'sqlite'.")
+        modes = options['modes'] or list(settings.SQLITE_TUNING_MODES)
+        unknown = set(modes) - set(settings.SQLITE_TUNING_MODES)
+        if unknown:
+            raise CommandError(f"Unknown tuning mode(s): {', '.join(sorted(unknown))}.")
+        if min(options['threads'], options['processes'], options['iterations']) < 1:
+            raise CommandError("--threads, --processes and --iterations must be at least 1.")
+        if options['processes'] > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+            raise CommandError("--processes needs the fork start method, which this platform lacks.")
+
+        # The default SQLite test database lives in memory, where there is no file locking to measure.
+        with tempfile.TemporaryDirectory() as directory:
+            db_settings = connections.settings['default']
+            db_settings['TEST'] = dict(db_settings.get('TEST') or {}, NAME=str(Path(directory) / 'stress.sqlite3'))
+            original_options = dict(db_settings['OPTIONS'])
+
+            # Lock errors are counted per request; don't also log a traceback for each one.
+            request_logger = logging.getLogger('django.request')
+            request_logger_disabled = request_logger.disabled
+            request_logger.disabled = True
+
+            setup_test_environment()
+            runner = DiscoverRunner(verbosity=0, interactive=False)
+            old_config = runner.setup_databases()
+            try:
+                results = [self.run_mode(mode, db_settings, options) for mode in modes]
+            finally:
+                connections.close_all()
+                db_settings['OPTIONS'] = original_options
+                runner.teardown_databases(old_config)
+                teardown_test_environment()
+                request_logger.disabled = request_logger_disabled
+
+        if options['output']:
+            payload = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+            with open(options['output'], 'w') as fh:
+                json.dump(payload, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
+
+    def run_mode(self, mode, db_settings, options):
+        """
+        Reconfigures new connections for mode and runs the writers. Every
+        connection is closed first, so each one opened afterwards applies the
+        mode's pragmas and transaction mode.
+        """
+        connections.close_all()
+        db_settings['OPTIONS'] = dict(settings.SQLITE_TUNING_MODES[mode])
+        if options['busy_timeout'] is not None:
+            db_settings['OPTIONS']['timeout'] = options['busy_timeout']
+
+        threads, processes, iterations = options['threads'], options['processes'], options['iterations']
+        started = time.perf_counter()
+        if processes == 1:
+            outcomes = _run_threads(threads, iterations)
+        else:
+            # Children inherit the reconfigured settings; close_all() above keeps them off our connection.
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                outcomes = [
+                    outcome
+                    for chunk in pool.map(_run_process, [(threads, iterations)] * processes)
+                    for outcome in chunk
+                ]
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds * 1000 for outcome, seconds in outcomes if outcome == 'ok')
+        result = {
+            'mode': mode,
+            'busy_timeout': db_settings['OPTIONS'].get('timeout'),
+            'writers': threads * processes,
+            'attempted': len(outcomes),
+            'ok': len(latencies),
+            'locked': sum(1 for outcome, _ in outcomes if outcome == 'locked'),
+            'errors': sum(1 for outcome, _ in outcomes if outcome == 'error'),
+            'seconds': round(elapsed, 3),
+            'pairs_per_second': round(len(latencies) / elapsed, 2) if elapsed else None,
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else None,
+            'p95_ms': round(latencies[math.ceil(len(latencies) * 0.95) - 1], 2) if latencies else None,
+        }
+        self.report(result)
+        return result
+
+    def report(self, result):
+        line = (
+            f"  {result['mode']:<12} {result['writers']:>3} writers  {result['ok']:>6}/{result['attempted']:<6} ok  "
+            f"{result['locked']:>5} locked  {result['errors']:>5} errors  "
+            f"{result['pairs_per_second'] or 0:>8.1f} pairs/s  p50 {result['p50_ms'] or 0:>8.1f} ms  "
+            f"p95 {result['p95_ms'] or 0:>8.1f} ms"
+        )
+        self.stdout.write(self.style.ERROR(line) if result['locked'] or result['errors'] else line)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0003_strokeassessment_current_anticoagulant_use_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strokeassessment',
+            name='hours_since_lkw',
+            field=models.FloatField(blank=True, db_index=True, editable=False, help_text='Stored hours from last known well to this assessment (see get_time_since_lkw_hours).', null=True),
+        ),
+        migrations.AddField(
+            model_name='strokeassessment',
+            name='nihss_total_score',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, help_text='Stored Modified NIHSS total (see calculate_nihss_total_score).', null=True),
+        ),
+        migrations.AddField(
+            model_name='strokeassessment',
+            name='race_score',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, help_text='Stored RACE score (see calculate_race_score).', null=True),
+        ),
+        migrations.AlterField(
+            model_name='strokeassessment',
+            name='assessment_time',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Time when this assessment was recorded.'),
+        ),
+    ]
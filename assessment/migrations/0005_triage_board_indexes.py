@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0004_strokeassessment_computed_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['arrival_time', 'id'], name='patient_arrival_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patient',
+            index=models.Index(fields=['last_known_well_time'], name='patient_lkw_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='strokeassessment',
+            index=models.Index(fields=['patient', '-assessment_time'], name='assessment_patient_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='strokeassessment',
+            index=models.Index(fields=['tpa_eligibility', '-assessment_time'], name='assessment_tpa_elig_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='strokeassessment',
+            index=models.Index(fields=['thrombectomy_eligibility', '-assessment_time'], name='assessment_thromb_elig_idx'),
+        ),
+    ]
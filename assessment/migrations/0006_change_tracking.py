@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 15:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0005_triage_board_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExportWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('change_seq', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='change_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, help_text='Change sequence number of the last write to this record.'),
+        ),
+        migrations.AddField(
+            model_name='patient',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Time this record was last changed.'),
+        ),
+        migrations.AddField(
+            model_name='strokeassessment',
+            name='change_seq',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, help_text='Change sequence number of the last write to this record.'),
+        ),
+        migrations.AddField(
+            model_name='strokeassessment',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Time this record was last changed.'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessment', '0006_change_tracking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(help_text="Model of the deleted row, e.g. 'strokeassessment'.", max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField(db_index=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -1,12 +1,252 @@
 # assessment/models.py
 
-from django.db import models
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils import timezone # NEW: Import timezone for working with datetimes
 from datetime import timedelta   # NEW: Import timedelta for calculating time differences
 
+from .race import race_score
+from .rules import get_rule_engine
+
+
+# NIHSS item fields, in scale order. Shared by the scoring methods below.
+NIHSS_FIELDS = (
+    'nihss_1a_loc_alert',
+    'nihss_1b_loc_questions',
+    'nihss_1c_loc_commands',
+    'nihss_2_best_gaze',
+    'nihss_3_visual_field',
+    'nihss_4_facial_palsy',
+    'nihss_5a_motor_left_arm',
+    'nihss_5b_motor_right_arm',
+    'nihss_6a_motor_left_leg',
+    'nihss_6b_motor_right_leg',
+    'nihss_7_limb_ataxia',
+    'nihss_8_sensory',
+    'nihss_9_best_language',
+    'nihss_10_dysarthria',
+    'nihss_11_extinction_inattention',
+)
+
+# Highest valid value of each NIHSS item on the scale.
+NIHSS_ITEM_MAXIMUMS = {
+    'nihss_1a_loc_alert': 3,
+    'nihss_1b_loc_questions': 2,
+    'nihss_1c_loc_commands': 2,
+    'nihss_2_best_gaze': 2,
+    'nihss_3_visual_field': 3,
+    'nihss_4_facial_palsy': 3,
+    'nihss_5a_motor_left_arm': 4,
+    'nihss_5b_motor_right_arm': 4,
+    'nihss_6a_motor_left_leg': 4,
+    'nihss_6b_motor_right_leg': 4,
+    'nihss_7_limb_ataxia': 2,
+    'nihss_8_sensory': 2,
+    'nihss_9_best_language': 3,
+    'nihss_10_dysarthria': 2,
+    'nihss_11_extinction_inattention': 2,
+}
+
+# Critical time targets (AHA/ASA), as (label, minutes after arrival).
+CRITICAL_TIME_TARGETS = (
+    # Door-to-CT/Imaging: ideally within 20 minutes of arrival
+    ('Door-to-CT Target', 20),
+    # Door-to-Needle (tPA) Target: ideally within 60 minutes of arrival
+    ('Door-to-Needle (tPA) Target', 60),
+    # Door-to-Groin Puncture (Thrombectomy) Target: ideally within 90 minutes of arrival
+    ('Door-to-Groin Puncture Target', 90),
+)
+
+# Treatment windows counted from last known well, as (label, window decision in rules.py).
+TREATMENT_WINDOWS = (
+    ('tPA Window', 'within_tpa_window'),
+    ('Thrombectomy Window', 'within_thrombectomy_window'),
+)
+
+# Boolean tPA contraindication fields recorded on each assessment.
+CONTRAINDICATION_FIELDS = (
+    'recent_surgery',
+    'prior_stroke_head_trauma',
+    'gi_urinary_hemorrhage',
+    'low_platelets',
+    'elevated_inr',
+    'current_anticoagulant_use',
+)
+
+
+class ChangeSequence(models.Model):
+    """
+    Single-row counter that hands out change sequence numbers to changed rows.
+    Deleting a change-tracked row advances it too (see DeletedRecord).
+    """
+    value = models.BigIntegerField(default=0)
+
+
+def allocate_change_sequence(count=1):
+    """
+    Reserves count consecutive change sequence numbers and returns the last one.
+    Must run inside the transaction that writes the changed rows: the counter
+    row stays locked until commit, so sequence numbers become visible in order
+    and an incremental export never skips one that commits later.
+    """
+    if not ChangeSequence.objects.filter(pk=1).update(value=models.F('value') + count):
+        ChangeSequence.objects.get_or_create(pk=1)
+        ChangeSequence.objects.filter(pk=1).update(value=models.F('value') + count)
+    return ChangeSequence.objects.values_list('value', flat=True).get(pk=1)
+
+
+def current_change_sequence():
+    """
+    Returns the highest committed change sequence number (0 if nothing changed yet).
+    """
+    return ChangeSequence.objects.filter(pk=1).values_list('value', flat=True).first() or 0
+
+
+async def acurrent_change_sequence():
+    """
+    Async version of current_change_sequence(), for async views.
+    """
+    return await ChangeSequence.objects.filter(pk=1).values_list('value', flat=True).afirst() or 0
+
+
+def stamp_changes(objects):
+    """
+    Gives each object a new change sequence number and updated_at time, in order.
+    Call inside a transaction before bulk_create/bulk_update, which skip save().
+    """
+    objects = list(objects)
+    if not objects:
+        return
+    last = allocate_change_sequence(len(objects))
+    now = timezone.now()
+    for seq, obj in zip(range(last - len(objects) + 1, last + 1), objects):
+        obj.change_seq = seq
+        obj.updated_at = now
+
+
+# Tombstones collected by the innermost batched_tombstones() block, if any.
+_pending_tombstones = ContextVar('pending_tombstones', default=None)
+
+
+@contextmanager
+def batched_tombstones(using=None):
+    """
+    Collects the DeletedRecord tombstones for deletes inside the block and
+    writes them with one counter update and one bulk insert at the end, in
+    the same transaction as the deletes. Nested blocks join the outer one.
+    """
+    if _pending_tombstones.get() is not None:
+        yield
+        return
+    pending = []
+    token = _pending_tombstones.set(pending)
+    try:
+        with transaction.atomic(using=using, savepoint=False):
+            yield
+            if pending:
+                last = allocate_change_sequence(len(pending))
+                DeletedRecord.objects.using(using).bulk_create(
+                    DeletedRecord(model_name=model_name, object_id=object_id, change_seq=seq)
+                    for seq, (model_name, object_id) in zip(range(last - len(pending) + 1, last + 1), pending)
+                )
+    finally:
+        _pending_tombstones.reset(token)
+
+
+class ChangeTrackedQuerySet(models.QuerySet):
+    def delete(self):
+        # Tombstones for the whole delete, cascades included, go in one insert.
+        with batched_tombstones(using=self.db):
+            return super().delete()
+
+
+class ChangeTrackedModel(models.Model):
+    """
+    Abstract base for rows tracked by incremental exports. Every save stamps
+    the row with updated_at and a monotonic change_seq.
+    Queryset update() bypasses this; use stamp_changes() with bulk operations.
+    Deletes leave a DeletedRecord tombstone per row.
+    """
+    CHANGE_FIELDS = ('updated_at', 'change_seq')
+
+    objects = ChangeTrackedQuerySet.as_manager()
+
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        help_text="Time this record was last changed."
+    )
+    change_seq = models.BigIntegerField(
+        default=0,
+        editable=False,
+        db_index=True,
+        help_text="Change sequence number of the last write to this record."
+    )
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            stamp_changes([self])
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.CHANGE_FIELDS)
+            super().save(*args, **kwargs)
+
+    def delete(self, using=None, keep_parents=False):
+        with batched_tombstones(using=using or router.db_for_write(self.__class__, instance=self)):
+            return super().delete(using=using, keep_parents=keep_parents)
+
+    class Meta:
+        abstract = True
+
+
+class ExportWatermark(models.Model):
+    """
+    Highest change sequence number already sent by a named incremental export.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    change_seq = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.change_seq}"
+
+
+class DeletedRecord(models.Model):
+    """
+    Tombstone for a deleted change-tracked row, stamped with the change
+    sequence number of the delete so incremental exports can send it on.
+    """
+    model_name = models.CharField(max_length=50, help_text="Model of the deleted row, e.g. 'strokeassessment'.")
+    object_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.model_name} {self.object_id} deleted @ {self.change_seq}"
+
+
+# Marks "no stored row" in Patient.save(), where None is a valid stored LKW time.
+_NO_ROW = object()
+
+
+class PatientQuerySet(ChangeTrackedQuerySet):
+    def with_latest_assessment(self):
+        """
+        Annotates each patient with latest_assessment_id (or None) using a
+        correlated subquery, so listing patients doesn't cost a query per row.
+        """
+        latest = StrokeAssessment.objects.filter(
+            patient=models.OuterRef('pk')
+        ).order_by('-assessment_time', '-id').values('id')[:1]
+        return self.annotate(latest_assessment_id=models.Subquery(latest))
+
 
 # Define the Patient model
-class Patient(models.Model):
+class Patient(ChangeTrackedModel):
     """
     This represents a patient in the stroke assessment system.
     This stores initial demographic and medical history information.
@@ -71,6 +311,30 @@ class Patient(models.Model):
         help_text="Date and time of last anticoagulant dose (if applicable)."
     )
 
+    objects = PatientQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic(using=kwargs.get('using')):
+            stored_lkw = _NO_ROW
+            if not self._state.adding and (update_fields is None or 'last_known_well_time' in update_fields):
+                stored = Patient.objects.filter(pk=self.pk).values_list('last_known_well_time', flat=True)[:1]
+                if stored:
+                    stored_lkw = stored[0]
+            super().save(*args, **kwargs)
+            # A NULL stored LKW is a real value here, so only a missing row skips the re-score.
+            if stored_lkw is not _NO_ROW and stored_lkw != self.last_known_well_time:
+                # hours_since_lkw on existing assessments depends on this patient's LKW time.
+                # Other patient changes reach exports through the patient's own change_seq.
+                assessments = list(self.assessments.all())
+                for assessment in assessments:
+                    assessment.patient = self
+                    assessment.refresh_computed_scores()
+                stamp_changes(assessments)
+                StrokeAssessment.objects.bulk_update(
+                    assessments, ('hours_since_lkw',) + StrokeAssessment.CHANGE_FIELDS
+                )
+
     # This method defines how a Patient object is represented as a string.
     # It's very useful for displaying objects in the Django admin and other places.
     def __str__(self):
@@ -81,8 +345,13 @@ class Patient(models.Model):
         verbose_name = "Patient Record"
         verbose_name_plural = "Patient Records"
         ordering = ['-arrival_time'] # Order patients by most recent arrival first
+        indexes = [
+            # Serves the default ordering and the (arrival_time, id) keyset pagination on the patient list
+            models.Index(fields=['arrival_time', 'id'], name='patient_arrival_idx'),
+            models.Index(fields=['last_known_well_time'], name='patient_lkw_idx'),
+        ]
 
-class StrokeAssessment(models.Model):
+class StrokeAssessment(ChangeTrackedModel):
     """
     Represents a detailed stroke assessment for a specific patient.
     Links to the Patient model and includes various clinical and imaging findings.
@@ -97,8 +366,11 @@ class StrokeAssessment(models.Model):
     )
 
     # Assessment Timings (for this specific assessment)
+    # Defaults to the creation time, but can be set explicitly (e.g. when importing
+    # pre-hospital assessments), unlike auto_now_add which always overwrites it.
     assessment_time = models.DateTimeField(
-        auto_now_add=True, # Automatically sets the time when the assessment is created
+        default=timezone.now,
+        editable=False,
         help_text="Time when this assessment was recorded."
     )
 
@@ -284,28 +556,132 @@ class StrokeAssessment(models.Model):
         help_text="Recommended treatment plan based on guidelines."
     )
 
+    # Denormalized scores, kept in sync on save() so the database can filter,
+    # sort and aggregate on them. Use the backfill_computed_scores command for
+    # rows saved before these columns existed.
+    nihss_total_score = models.IntegerField(
+        blank=True, null=True, editable=False, db_index=True,
+        help_text="Stored Modified NIHSS total (see calculate_nihss_total_score)."
+    )
+    race_score = models.IntegerField(
+        blank=True, null=True, editable=False, db_index=True,
+        help_text="Stored RACE score (see calculate_race_score)."
+    )
+    hours_since_lkw = models.FloatField(
+        blank=True, null=True, editable=False, db_index=True,
+        help_text="Stored hours from last known well to this assessment (see get_time_since_lkw_hours)."
+    )
+    COMPUTED_SCORE_FIELDS = ('nihss_total_score', 'race_score', 'hours_since_lkw')
+
+    # Inputs that the clinical decision bundle depends on. If any of these change
+    # (on the assessment or on its patient), the cached bundle is recomputed.
+    # Fields read by the triage rules are tracked by the rule engine itself.
+    DECISION_INPUT_FIELDS = ('assessment_time',) + NIHSS_FIELDS
+    PATIENT_DECISION_INPUT_FIELDS = (
+        'arrival_time',
+        'last_known_well_time',
+        'weight_kg',
+    )
+
+    def save(self, *args, **kwargs):
+        self.refresh_computed_scores()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | set(self.COMPUTED_SCORE_FIELDS)
+        super().save(*args, **kwargs)
+
+    def refresh_computed_scores(self):
+        """
+        Copies the current NIHSS total, RACE score and hours since LKW into the
+        denormalized columns. Does not save.
+        """
+        decisions = self.get_clinical_decisions()
+        self.nihss_total_score = decisions['nihss_total_score']
+        self.race_score = decisions['race_score']
+        self.hours_since_lkw = decisions['time_since_lkw_hours']
+
+    def clear_clinical_decisions(self):
+        """
+        Discards the cached clinical decision bundle so the next access recomputes it.
+        """
+        self.__dict__.pop('_clinical_decisions', None)
+
+    def _get_decision_inputs(self):
+        """
+        Returns a tuple snapshot of every field the decision bundle depends on.
+        Used as the cache key, so in-memory edits to the assessment or patient
+        invalidate the bundle without needing an explicit save.
+        """
+        patient = self.patient
+        engine = get_rule_engine()
+        return (
+            tuple(getattr(self, name) for name in self.DECISION_INPUT_FIELDS),
+            tuple(getattr(patient, name) for name in self.PATIENT_DECISION_INPUT_FIELDS),
+            # Fields read by the triage rules, and the rule table itself.
+            engine,
+            engine.inputs(self),
+        )
+
+    def get_clinical_decisions(self):
+        """
+        Returns a dict with every computed score, eligibility status and
+        recommendation for this assessment.
+        The bundle is evaluated once and cached on the instance; it is recomputed
+        after save() or when any of its input fields change.
+        """
+        inputs = self._get_decision_inputs()
+        cached = self.__dict__.get('_clinical_decisions')
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        decisions = self._evaluate_clinical_decisions()
+        self._clinical_decisions = (inputs, decisions)
+        return decisions
+
+    def _evaluate_clinical_decisions(self):
+        """
+        Runs the full decision chain once. Each step reuses the results of the
+        earlier steps instead of calling back into the public methods.
+        Windows, eligibility statuses and recommendations come from the
+        triage rule table (see rules.py).
+        """
+        patient = self.patient
+        decisions = {}
+
+        # Ensure both LKW time and assessment time are available for calculation
+        time_since_lkw = None
+        if patient.last_known_well_time and self.assessment_time:
+            # Django's DateTimeField stores timezone-aware datetimes.
+            time_since_lkw = self.assessment_time - patient.last_known_well_time
+        decisions['time_since_lkw'] = time_since_lkw
+
+        hours_since_lkw = None
+        if time_since_lkw:
+            # Convert timedelta to total seconds and then to hours
+            hours_since_lkw = round(time_since_lkw.total_seconds() / 3600, 2)
+        decisions['time_since_lkw_hours'] = hours_since_lkw
+        decisions['nihss_total_score'] = self._compute_nihss_total_score()
+        decisions['race_score'] = race_score(self)
+
+        get_rule_engine().evaluate(self, decisions)
+
+        decisions['tpa_dose'] = self._compute_tpa_dose(patient)
+        decisions['critical_time_targets'] = self._compute_critical_time_targets(patient)
+        return decisions
+
     def calculate_time_since_lkw(self):
         """
         Calculates the time difference between the patient's last_known_well_time
         and the current assessment_time.
         Returns a timedelta object or None if LKW time is not available.
         """
-        # Ensure both LKW time and assessment time are available for calculation
-        if self.patient.last_known_well_time and self.assessment_time:
-            # Calculate the difference. Django's DateTimeField stores timezone-aware datetimes.
-            return self.assessment_time - self.patient.last_known_well_time
-        return None
+        return self.get_clinical_decisions()['time_since_lkw']
 
     def get_time_since_lkw_hours(self):
         """
         Returns the time since last known well in hours, rounded to two decimal places.
         Returns None if LKW time is not available or calculation fails.
         """
-        time_delta = self.calculate_time_since_lkw()
-        if time_delta:
-            # Convert timedelta to total seconds and then to hours
-            return round(time_delta.total_seconds() / 3600, 2)
-        return None
+        return self.get_clinical_decisions()['time_since_lkw_hours']
 
     def is_within_tpa_window(self):
         """
@@ -313,10 +689,7 @@ class StrokeAssessment(models.Model):
         Simplified rule: within 4.5 hours from Last Known Well time.
         Returns False if LKW time is not available.
         """
-        hours_since_lkw = self.get_time_since_lkw_hours()
-        if hours_since_lkw is not None and hours_since_lkw <= 4.5:
-            return True
-        return False
+        return self.get_clinical_decisions()['within_tpa_window']
 
     def is_within_thrombectomy_window(self):
         """
@@ -324,38 +697,19 @@ class StrokeAssessment(models.Model):
         Simplified rule: within 6 hours from Last Known Well time.
         Returns False if LKW time is not available.
         """
-        hours_since_lkw = self.get_time_since_lkw_hours()
-        if hours_since_lkw is not None and hours_since_lkw <= 6:
-            return True
-        return False
+        return self.get_clinical_decisions()['within_thrombectomy_window']
 
     def calculate_nihss_total_score(self):
         """
         Calculates the total Modified NIHSS score by summing relevant components.
         Returns the total score or None if essential components are missing.
         """
-        # List of NIHSS fields to sum. Use .get() with a default of 0 to handle None values gracefully.
-        # NIHSS scores are typically integers, so sum them directly.
-        nihss_components = [
-            self.nihss_1a_loc_alert,
-            self.nihss_1b_loc_questions,
-            self.nihss_1c_loc_commands,
-            self.nihss_2_best_gaze,
-            self.nihss_3_visual_field,
-            self.nihss_4_facial_palsy,
-            self.nihss_5a_motor_left_arm,
-            self.nihss_5b_motor_right_arm,
-            self.nihss_6a_motor_left_leg,
-            self.nihss_6b_motor_right_leg,
-            self.nihss_7_limb_ataxia,
-            self.nihss_8_sensory,
-            self.nihss_9_best_language,
-            self.nihss_10_dysarthria,
-            self.nihss_11_extinction_inattention,
-        ]
+        return self.get_clinical_decisions()['nihss_total_score']
 
+    def _compute_nihss_total_score(self):
         total_score = 0
-        for component in nihss_components:
+        for name in NIHSS_FIELDS:
+            component = getattr(self, name)
             # Only add if the component has a value (is not None)
             if component is not None:
                 total_score += component
@@ -376,70 +730,9 @@ class StrokeAssessment(models.Model):
         - Aphasia (NIHSS 9): 0=0, 1=0, 2=1, 3=2 (max 2)
         - Agnosia (NIHSS 11): 0=0, 1=1, 2=2 (max 2)
         Total RACE score ranges from 0-9.
+        The points per item value come from the lookup tables in race.py.
         """
-        race_score = 0
-
-        # Facial Palsy (NIHSS 4)
-        if self.nihss_4_facial_palsy is not None:
-            if self.nihss_4_facial_palsy == 1: race_score += 1
-            elif self.nihss_4_facial_palsy >= 2: race_score += 2
-
-        # Arm Motor (NIHSS 5a/5b) - take the worse score
-        arm_motor_score = 0
-        if self.nihss_5a_motor_left_arm is not None and self.nihss_5b_motor_right_arm is not None:
-            worse_arm = max(self.nihss_5a_motor_left_arm, self.nihss_5b_motor_right_arm)
-            if worse_arm >= 2: arm_motor_score = 1
-            if worse_arm >= 4: arm_motor_score = 2 # Score 4 is for no movement
-        elif self.nihss_5a_motor_left_arm is not None:
-            if self.nihss_5a_motor_left_arm >= 2: arm_motor_score = 1
-            if self.nihss_5a_motor_left_arm >= 4: arm_motor_score = 2
-        elif self.nihss_5b_motor_right_arm is not None:
-            if self.nihss_5b_motor_right_arm >= 2: arm_motor_score = 1
-            if self.nihss_5b_motor_right_arm >= 4: arm_motor_score = 2
-        race_score += arm_motor_score
-
-        # Leg Motor (NIHSS 6a/6b) - take the worse score
-        leg_motor_score = 0
-        if self.nihss_6a_motor_left_leg is not None and self.nihss_6b_motor_right_leg is not None:
-            worse_leg = max(self.nihss_6a_motor_left_leg, self.nihss_6b_motor_right_leg)
-            if worse_leg >= 2: leg_motor_score = 1
-            if worse_leg >= 4: leg_motor_score = 2
-        elif self.nihss_6a_motor_left_leg is not None:
-            if self.nihss_6a_motor_left_leg >= 2: leg_motor_score = 1
-            if self.nihss_6a_motor_left_leg >= 4: leg_motor_score = 2
-        elif self.nihss_6b_motor_right_leg is not None:
-            if self.nihss_6b_motor_right_leg >= 2: leg_motor_score = 1
-            if self.nihss_6b_motor_right_leg >= 4: leg_motor_score = 2
-        race_score += leg_motor_score
-
-        # Gaze (NIHSS 2)
-        if self.nihss_2_best_gaze is not None:
-            if self.nihss_2_best_gaze == 1: race_score += 1
-            elif self.nihss_2_best_gaze == 2: race_score += 2
-
-        # Aphasia (NIHSS 9)
-        if self.nihss_9_best_language is not None:
-            if self.nihss_9_best_language >= 2: race_score += 2 # Score 2 or 3 for aphasia
-
-        # Agnosia (NIHSS 11) - Extinction and Inattention
-        if self.nihss_11_extinction_inattention is not None:
-            if self.nihss_11_extinction_inattention >= 1: race_score += 1 # Score 1 or 2 for agnosia
-
-        # If any relevant NIHSS component is None, we cannot calculate a complete RACE score.
-        # You might choose to return None or a partial score depending on clinical requirements.
-        # For simplicity, if any required component is None, we'll return None.
-        required_race_components = [
-            self.nihss_4_facial_palsy,
-            self.nihss_5a_motor_left_arm, self.nihss_5b_motor_right_arm,
-            self.nihss_6a_motor_left_leg, self.nihss_6b_motor_right_leg,
-            self.nihss_2_best_gaze,
-            self.nihss_9_best_language,
-            self.nihss_11_extinction_inattention,
-        ]
-        if any(c is None for c in required_race_components):
-             return None # Cannot calculate full RACE score if components are missing
-
-        return race_score
+        return self.get_clinical_decisions()['race_score']
 
     def get_aspects_interpretation(self):
         """
@@ -450,55 +743,26 @@ class StrokeAssessment(models.Model):
         - 5-7: Moderate ischemia
         - 0-4: Severe ischemia, typically contraindication for IV thrombolysis/thrombectomy
         """
-        if self.aspects_score is None:
-            return "ASPECTS score not available."
-        elif self.aspects_score == 10:
-            return "Normal CT scan (no early ischemic changes)."
-        elif self.aspects_score >= 8: # 8 or 9
-            return "Mild early ischemic changes."
-        elif self.aspects_score >= 5: # 5, 6, or 7
-            return "Moderate early ischemic changes."
-        elif self.aspects_score >= 0: # 0, 1, 2, 3, or 4
-            return "Severe early ischemic changes (significant infarction)."
-        else:
-            return "Invalid ASPECTS score."
-        
+        return self.get_clinical_decisions()['aspects_interpretation']
+
     def get_tpa_eligibility_status(self):
         """
-        Determines overall tPA eligibility based on time window and contraindications.
+        Determines overall tPA eligibility based on time window and contraindications,
+        following the tpa_eligibility_status rules in rules.py.
         Returns a string indicating eligibility status.
         """
-        # Check for time window
-        if not self.is_within_tpa_window():
-            return "Not Eligible (Outside Time Window)"
-
-        # Check for major contraindications
-        if self.hemorrhage_present:
-            return "Contraindicated (Intracranial Hemorrhage)"
-        if self.patient.systolic_bp is not None and self.patient.systolic_bp > 185:
-            return "Contraindicated (BP > 185 mmHg)"
-        if self.patient.diastolic_bp is not None and self.patient.diastolic_bp > 110:
-            return "Contraindicated (BP > 110 mmHg)"
-        if self.recent_surgery or self.prior_stroke_head_trauma or self.gi_urinary_hemorrhage:
-            return "Contraindicated (Major Bleeding Risk Factors)"
-        if self.low_platelets:
-            return "Contraindicated (Low Platelets)"
-        if self.elevated_inr:
-            return "Contraindicated (Elevated INR)"
-        if self.current_anticoagulant_use:
-            return "Contraindicated (Current Anticoagulant Use)"
-        # Add other contraindications as needed based on guidelines
-
-        # If within time window and no contraindications
-        return "Potentially Eligible"
+        return self.get_clinical_decisions()['tpa_eligibility_status']
 
     def calculate_tpa_dose(self):
         """
         Calculates the tPA dose based on patient weight (0.9 mg/kg, max 90mg).
         Returns the calculated dose in mg, or None if weight is missing.
         """
-        if self.patient.weight_kg is not None:
-            calculated_dose = float(self.patient.weight_kg) * 0.9
+        return self.get_clinical_decisions()['tpa_dose']
+
+    def _compute_tpa_dose(self, patient):
+        if patient.weight_kg is not None:
+            calculated_dose = float(patient.weight_kg) * 0.9
             # Max dose is 90mg
             return min(calculated_dose, 90.0)
         return None
@@ -510,23 +774,10 @@ class StrokeAssessment(models.Model):
         - Within 6-hour window (already checked by is_within_thrombectomy_window)
         - LVO present
         - ASPECTS score >= 6 (common threshold, but varies)
+        The thresholds live in the thrombectomy_candidacy rules in rules.py.
         Returns a string indicating candidacy.
         """
-        if not self.is_within_thrombectomy_window():
-            return "Not Candidate (Outside Time Window)"
-
-        if self.hemorrhage_present:
-            return "Not Candidate (Intracranial Hemorrhage)"
-
-        if self.lvo_status != 'PRESENT':
-            return "Not Candidate (No LVO Detected)"
-
-        if self.aspects_score is None:
-            return "Pending (ASPECTS Score Missing)"
-        elif self.aspects_score < 6: # Threshold for poor outcome/contraindication
-            return "Not Candidate (ASPECTS < 6)"
-
-        return "Potentially Candidate"
+        return self.get_clinical_decisions()['thrombectomy_candidacy']
 
     def get_bp_management_target(self):
         """
@@ -537,64 +788,73 @@ class StrokeAssessment(models.Model):
         - Otherwise: BP < 220/120 mmHg
         Returns a string with the target.
         """
-        tpa_eligibility = self.get_tpa_eligibility_status()
-        thrombectomy_candidacy = self.get_thrombectomy_candidacy()
+        return self.get_clinical_decisions()['bp_management_target']
 
-        if tpa_eligibility == "Potentially Eligible":
-            return "Target BP < 185/110 mmHg (for tPA)"
-        elif thrombectomy_candidacy == "Potentially Candidate":
-            # If thrombectomy candidate but not tPA eligible (e.g., outside tPA window)
-            return "Target BP < 185/110 mmHg (for thrombectomy)"
-        else:
-            return "Target BP < 220/120 mmHg (permissive hypertension)"
     def get_stroke_center_recommendation(self):
         """
         Recommends the appropriate level of stroke center based on assessment findings.
         Simplified logic based on LVO candidacy and NIHSS.
         """
-        thrombectomy_candidacy = self.get_thrombectomy_candidacy()
-        nihss_score = self.calculate_nihss_total_score()
-
-        if thrombectomy_candidacy == "Potentially Candidate":
-            return "Comprehensive Stroke Center (CSC) recommended for thrombectomy."
-        elif nihss_score is not None and nihss_score >= 5: # Example threshold for moderate-severe stroke
-            return "Primary Stroke Center (PSC) recommended for IV thrombolysis and stroke care."
-        else:
-            return "Acute Stroke Ready Hospital (ASRH) or general hospital for initial stabilization."
+        return self.get_clinical_decisions()['stroke_center_recommendation']
 
     def get_transfer_recommendation(self):
         """
         Provides transfer recommendations based on stroke center needs.
         Simplified logic: if CSC recommended, suggest transfer if not already at one.
         """
-        center_recommendation = self.get_stroke_center_recommendation()
-        # This assumes the system doesn't know the current facility's capability.
-        # In a real system, you'd have a field for 'current_facility_type'.
-        if "Comprehensive Stroke Center (CSC)" in center_recommendation:
-            return "Consider immediate transfer to a Comprehensive Stroke Center (CSC) for advanced care."
-        elif "Primary Stroke Center (PSC)" in center_recommendation:
-            return "Consider transfer to a Primary Stroke Center (PSC) if not at one."
-        else:
-            return "No immediate transfer recommended based on current findings."
+        return self.get_clinical_decisions()['transfer_recommendation']
 
     def get_critical_time_targets(self):
         """
         Provides critical time targets based on AHA/ASA guidelines.
         These are ideal targets, not actual elapsed times.
         """
-        targets = {}
-        if self.patient.arrival_time:
-            # Door-to-CT/Imaging: ideally within 20 minutes of arrival
-            targets['Door-to-CT Target'] = (self.patient.arrival_time + timedelta(minutes=20)).strftime('%H:%M')
-
-            # Door-to-Needle (tPA) Target: ideally within 60 minutes of arrival
-            targets['Door-to-Needle (tPA) Target'] = (self.patient.arrival_time + timedelta(minutes=60)).strftime('%H:%M')
-
-            # Door-to-Groin Puncture (Thrombectomy) Target: ideally within 90 minutes of arrival
-            targets['Door-to-Groin Puncture Target'] = (self.patient.arrival_time + timedelta(minutes=90)).strftime('%H:%M')
+        # Return a copy so callers can't mutate the cached bundle.
+        return dict(self.get_clinical_decisions()['critical_time_targets'])
 
+    def _compute_critical_time_targets(self, patient):
+        targets = {}
+        if patient.arrival_time:
+            for label, minutes in CRITICAL_TIME_TARGETS:
+                targets[label] = (patient.arrival_time + timedelta(minutes=minutes)).strftime('%H:%M')
         return targets
 
+    def get_countdown_timestamps(self):
+        """
+        Returns the times a live countdown needs, as Unix epoch seconds:
+        arrival, last known well and assessment times, each critical time
+        target and when each treatment window closes (None where unknown).
+        Small enough to embed in the page, so remaining time can be counted
+        down in the browser instead of by reloading.
+        """
+        patient = self.patient
+        engine = get_rule_engine()
+
+        def epoch(value):
+            return int(value.timestamp()) if value is not None else None
+
+        windows = []
+        for label, decision in TREATMENT_WINDOWS:
+            hours = engine.window_hours(decision)
+            closes = None
+            if hours is not None and patient.last_known_well_time:
+                closes = patient.last_known_well_time + timedelta(hours=hours)
+            windows.append({'label': label, 'closes': epoch(closes)})
+
+        targets = []
+        if patient.arrival_time:
+            targets = [
+                {'label': label, 'at': epoch(patient.arrival_time + timedelta(minutes=minutes))}
+                for label, minutes in CRITICAL_TIME_TARGETS
+            ]
+        return {
+            'arrival': epoch(patient.arrival_time),
+            'lkw': epoch(patient.last_known_well_time),
+            'assessment': epoch(self.assessment_time),
+            'targets': targets,
+            'windows': windows,
+        }
+
     # String representation of the object
     def __str__(self):
         return f"Assessment for Patient ID: {self.patient.id} at {self.assessment_time.strftime('%Y-%m-%d %H:%M')}"
@@ -602,4 +862,29 @@ class StrokeAssessment(models.Model):
     class Meta:
         verbose_name = "Stroke Assessment"
         verbose_name_plural = "Stroke Assessments"
-        ordering = ['-assessment_time'] # Order assessments by most recent first
\ No newline at end of file
+        ordering = ['-assessment_time'] # Order assessments by most recent first
+        indexes = [
+            # "Latest assessment for this patient" lookups on the triage board
+            models.Index(fields=['patient', '-assessment_time'], name='assessment_patient_latest_idx'),
+            # Eligibility filters, newest first
+            models.Index(fields=['tpa_eligibility', '-assessment_time'], name='assessment_tpa_elig_idx'),
+            models.Index(fields=['thrombectomy_eligibility', '-assessment_time'], name='assessment_thromb_elig_idx'),
+        ]
+
+
+@receiver(post_delete, sender=Patient)
+@receiver(post_delete, sender=StrokeAssessment)
+def _record_delete(sender, instance, **kwargs):
+    # Leaves a tombstone with a new change sequence number, so one read of the
+    # counter shows that something was deleted and incremental exports see it.
+    # Runs in the deleting transaction, cascaded deletes included; deletes made
+    # through the model or its queryset batch their tombstones.
+    pending = _pending_tombstones.get()
+    if pending is not None:
+        pending.append((sender._meta.model_name, instance.pk))
+        return
+    DeletedRecord.objects.using(kwargs['using']).create(
+        model_name=sender._meta.model_name,
+        object_id=instance.pk,
+        change_seq=allocate_change_sequence(),
+    )
@@ -0,0 +1,89 @@
+# assessment/pagination.py
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a pagination cursor from the query string cannot be decoded.
+    """
+
+
+def get_page_size(request):
+    """
+    Reads the page size from the 'page_size' query parameter, falling back to
+    PATIENT_LIST_PAGE_SIZE and capping it at PATIENT_LIST_MAX_PAGE_SIZE.
+    """
+    default_size = getattr(settings, 'PATIENT_LIST_PAGE_SIZE', 50)
+    max_size = getattr(settings, 'PATIENT_LIST_MAX_PAGE_SIZE', 200)
+    try:
+        page_size = int(request.GET.get('page_size', default_size))
+    except (TypeError, ValueError):
+        page_size = default_size
+    return max(1, min(page_size, max_size))
+
+
+def encode_patient_cursor(patient):
+    """
+    Builds an opaque cursor string from a patient's (arrival_time, id) sort key.
+    """
+    return f"{patient.arrival_time.isoformat()}~{patient.id}"
+
+
+def decode_patient_cursor(cursor):
+    """
+    Parses a cursor made by encode_patient_cursor back into (arrival_time, id).
+    Raises InvalidCursor if the string is malformed.
+    """
+    timestamp, _, patient_id = cursor.rpartition('~')
+    try:
+        arrival_time = parse_datetime(timestamp)
+        patient_id = int(patient_id)
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if arrival_time is None:
+        raise InvalidCursor(cursor)
+    return arrival_time, patient_id
+
+
+def _page_queryset(queryset, cursor, page_size):
+    """
+    Orders queryset newest arrival first, keeps the rows after cursor and
+    slices one row more than page_size, to find out whether another page exists.
+    """
+    queryset = queryset.order_by('-arrival_time', '-id')
+    if cursor:
+        arrival_time, patient_id = decode_patient_cursor(cursor)
+        queryset = queryset.filter(
+            Q(arrival_time__lt=arrival_time) | Q(arrival_time=arrival_time, id__lt=patient_id)
+        )
+    return queryset[:page_size + 1]
+
+
+def _split_page(patients, page_size):
+    next_cursor = None
+    if len(patients) > page_size:
+        patients = patients[:page_size]
+        next_cursor = encode_patient_cursor(patients[-1])
+    return patients, next_cursor
+
+
+def paginate_patients(queryset, cursor=None, page_size=50):
+    """
+    Keyset pagination over patients, newest arrival first.
+    Instead of OFFSET, each page filters on the (arrival_time, id) of the last
+    row seen, so fetching any page costs the same regardless of table size.
+    Returns (patients, next_cursor); next_cursor is None on the last page.
+    """
+    patients = list(_page_queryset(queryset, cursor, page_size))
+    return _split_page(patients, page_size)
+
+
+async def apaginate_patients(queryset, cursor=None, page_size=50):
+    """
+    Async version of paginate_patients(), fetching the page with async iteration.
+    """
+    patients = [patient async for patient in _page_queryset(queryset, cursor, page_size)]
+    return _split_page(patients, page_size)
@@ -0,0 +1,69 @@
+# assessment/race.py
+"""
+RACE (Rapid Arterial oCclusion Evaluation) scoring from NIHSS items, as lookup tables.
+
+Each RACE component maps an NIHSS item value to points through a small table
+indexed by the value. These tables are the single source of truth for both
+StrokeAssessment.calculate_race_score and the vectorized batch scoring in
+scoring.py, so neither walks a chain of branches.
+"""
+
+from operator import attrgetter
+
+# Points per NIHSS item value (index = item value). A value past the end of
+# a table scores like its last entry; negative values score 0.
+FACIAL_PALSY_POINTS = (0, 1, 2)          # NIHSS 4: 0=0, 1=1, 2-3=2
+MOTOR_POINTS = (0, 0, 1, 1, 2)           # NIHSS 5a/5b, 6a/6b: 0-1=0, 2-3=1, 4=2
+GAZE_POINTS = (0, 1, 2, 0)               # NIHSS 2: 0=0, 1=1, 2=2, anything else=0
+LANGUAGE_POINTS = (0, 0, 2)              # NIHSS 9: 0-1=0, 2-3=2
+INATTENTION_POINTS = (0, 1)              # NIHSS 11: 0=0, 1-2=1
+
+# (points table, NIHSS fields) per RACE component. Components with two
+# fields (left/right) score the worse side.
+RACE_ITEMS = (
+    (FACIAL_PALSY_POINTS, ('nihss_4_facial_palsy',)),
+    (MOTOR_POINTS, ('nihss_5a_motor_left_arm', 'nihss_5b_motor_right_arm')),
+    (MOTOR_POINTS, ('nihss_6a_motor_left_leg', 'nihss_6b_motor_right_leg')),
+    (GAZE_POINTS, ('nihss_2_best_gaze',)),
+    (LANGUAGE_POINTS, ('nihss_9_best_language',)),
+    (INATTENTION_POINTS, ('nihss_11_extinction_inattention',)),
+)
+
+# NIHSS items that must all be present for a RACE score, in RACE_ITEMS order.
+RACE_FIELDS = tuple(field for _, fields in RACE_ITEMS for field in fields)
+
+
+def padded_table(points):
+    """
+    Returns (table, last) where table is points with a leading 0 for negative
+    values, so any item value v maps to table[min(max(v, -1), last) + 1].
+    """
+    return (0,) + tuple(points), len(points) - 1
+
+
+# (padded table, last index, number of fields) per component, built once.
+_COMPONENTS = tuple(padded_table(points) + (len(fields),) for points, fields in RACE_ITEMS)
+_get_race_fields = attrgetter(*RACE_FIELDS)
+
+
+def race_score_from_values(values):
+    """
+    Returns the RACE score for item values given in RACE_FIELDS order, or
+    None if any of them is missing.
+    """
+    if None in values:
+        return None
+    score = 0
+    position = 0
+    for table, last, width in _COMPONENTS:
+        value = max(values[position:position + width])
+        position += width
+        score += table[min(max(value, -1), last) + 1]
+    return score
+
+
+def race_score(assessment):
+    """
+    Returns the RACE score for a StrokeAssessment, or None if any RACE item is missing.
+    """
+    return race_score_from_values(_get_race_fields(assessment))
@@ -0,0 +1,440 @@
+# assessment/rules.py
+"""
+Declarative triage rule table and the evaluator compiled from it.
+
+Each decision is an ordered list of rules. A rule holds a list of conditions
+that must all be true and the outcome it produces; the first matching rule
+wins, and 'default' applies when none match. Conditions are
+(fact, operator, value) tuples, or (fact, operator) for the unary operators.
+A fact is an assessment field, a patient field written 'patient__<field>',
+one of the COMPUTED_FACTS, or a decision listed earlier in the table. A table
+must define every decision in REQUIRED_DECISIONS.
+
+The table is compiled once into precomputed accessors and predicates, which
+evaluate either one StrokeAssessment or whole NumPy columns (see scoring.py).
+Set TRIAGE_RULES to a dict shaped like DEFAULT_TRIAGE_RULES, or to the path
+of a JSON file holding one, to change the protocol without touching code.
+"""
+
+import json
+import keyword
+import operator
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+# Values worked out by StrokeAssessment before the rules run.
+COMPUTED_FACTS = (
+    'time_since_lkw_hours',
+    'nihss_total_score',
+    'race_score',
+)
+
+# Decisions read by StrokeAssessment, the API serializers and the exports.
+REQUIRED_DECISIONS = (
+    'within_tpa_window',
+    'within_thrombectomy_window',
+    'aspects_interpretation',
+    'tpa_eligibility_status',
+    'thrombectomy_candidacy',
+    'bp_management_target',
+    'stroke_center_recommendation',
+    'transfer_recommendation',
+)
+
+DEFAULT_TRIAGE_RULES = {
+    'within_tpa_window': {
+        'rules': [
+            {'when': [('time_since_lkw_hours', '<=', 4.5)], 'then': True},
+        ],
+        'default': False,
+    },
+    'within_thrombectomy_window': {
+        'rules': [
+            {'when': [('time_since_lkw_hours', '<=', 6)], 'then': True},
+        ],
+        'default': False,
+    },
+    'aspects_interpretation': {
+        'rules': [
+            {'when': [('aspects_score', 'is null')], 'then': "ASPECTS score not available."},
+            {'when': [('aspects_score', '==', 10)], 'then': "Normal CT scan (no early ischemic changes)."},
+            {'when': [('aspects_score', '>=', 8)], 'then': "Mild early ischemic changes."},
+            {'when': [('aspects_score', '>=', 5)], 'then': "Moderate early ischemic changes."},
+            {'when': [('aspects_score', '>=', 0)], 'then': "Severe early ischemic changes (significant infarction)."},
+        ],
+        'default': "Invalid ASPECTS score.",
+    },
+    'tpa_eligibility_status': {
+        'rules': [
+            {'when': [('within_tpa_window', 'is false')], 'then': "Not Eligible (Outside Time Window)"},
+            {'when': [('hemorrhage_present', 'is true')], 'then': "Contraindicated (Intracranial Hemorrhage)"},
+            {'when': [('patient__systolic_bp', '>', 185)], 'then': "Contraindicated (BP > 185 mmHg)"},
+            {'when': [('patient__diastolic_bp', '>', 110)], 'then': "Contraindicated (BP > 110 mmHg)"},
+            {'when': [('recent_surgery', 'is true')], 'then': "Contraindicated (Major Bleeding Risk Factors)"},
+            {'when': [('prior_stroke_head_trauma', 'is true')], 'then': "Contraindicated (Major Bleeding Risk Factors)"},
+            {'when': [('gi_urinary_hemorrhage', 'is true')], 'then': "Contraindicated (Major Bleeding Risk Factors)"},
+            {'when': [('low_platelets', 'is true')], 'then': "Contraindicated (Low Platelets)"},
+            {'when': [('elevated_inr', 'is true')], 'then': "Contraindicated (Elevated INR)"},
+            {'when': [('current_anticoagulant_use', 'is true')], 'then': "Contraindicated (Current Anticoagulant Use)"},
+        ],
+        'default': "Potentially Eligible",
+    },
+    'thrombectomy_candidacy': {
+        'rules': [
+            {'when': [('within_thrombectomy_window', 'is false')], 'then': "Not Candidate (Outside Time Window)"},
+            {'when': [('hemorrhage_present', 'is true')], 'then': "Not Candidate (Intracranial Hemorrhage)"},
+            {'when': [('lvo_status', '!=', 'PRESENT')], 'then': "Not Candidate (No LVO Detected)"},
+            {'when': [('aspects_score', 'is null')], 'then': "Pending (ASPECTS Score Missing)"},
+            {'when': [('aspects_score', '<', 6)], 'then': "Not Candidate (ASPECTS < 6)"},
+        ],
+        'default': "Potentially Candidate",
+    },
+    'bp_management_target': {
+        'rules': [
+            {'when': [('tpa_eligibility_status', '==', "Potentially Eligible")],
+             'then': "Target BP < 185/110 mmHg (for tPA)"},
+            {'when': [('thrombectomy_candidacy', '==', "Potentially Candidate")],
+             'then': "Target BP < 185/110 mmHg (for thrombectomy)"},
+        ],
+        'default': "Target BP < 220/120 mmHg (permissive hypertension)",
+    },
+    'stroke_center_recommendation': {
+        'rules': [
+            {'when': [('thrombectomy_candidacy', '==', "Potentially Candidate")],
+             'then': "Comprehensive Stroke Center (CSC) recommended for thrombectomy."},
+            {'when': [('nihss_total_score', '>=', 5)],
+             'then': "Primary Stroke Center (PSC) recommended for IV thrombolysis and stroke care."},
+        ],
+        'default': "Acute Stroke Ready Hospital (ASRH) or general hospital for initial stabilization.",
+    },
+    'transfer_recommendation': {
+        'rules': [
+            {'when': [('stroke_center_recommendation', 'contains', "Comprehensive Stroke Center (CSC)")],
+             'then': "Consider immediate transfer to a Comprehensive Stroke Center (CSC) for advanced care."},
+            {'when': [('stroke_center_recommendation', 'contains', "Primary Stroke Center (PSC)")],
+             'then': "Consider transfer to a Primary Stroke Center (PSC) if not at one."},
+        ],
+        'default': "No immediate transfer recommended based on current findings.",
+    },
+}
+
+
+def _compare(op):
+    # A missing (None) value never satisfies an ordering or equality test.
+    return lambda value, target: value is not None and op(value, target)
+
+
+# Scalar predicates: f(value, target) -> bool. Semantics match the original if-chains.
+OPERATORS = {
+    '==': _compare(operator.eq),
+    '!=': lambda value, target: value != target,
+    '<': _compare(operator.lt),
+    '<=': _compare(operator.le),
+    '>': _compare(operator.gt),
+    '>=': _compare(operator.ge),
+    'contains': lambda value, target: value is not None and target in value,
+    'is null': lambda value, target: value is None,
+    'is true': lambda value, target: bool(value),
+    'is false': lambda value, target: not value,
+}
+UNARY_OPERATORS = ('is null', 'is true', 'is false')
+
+# Vectorized predicates for computed numeric facts: f(values, missing, target) -> bool array.
+_NUMERIC_OPERATORS = {
+    '==': lambda values, missing, target: ~missing & (values == target),
+    '!=': lambda values, missing, target: missing | (values != target),
+    '<': lambda values, missing, target: ~missing & (values < target),
+    '<=': lambda values, missing, target: ~missing & (values <= target),
+    '>': lambda values, missing, target: ~missing & (values > target),
+    '>=': lambda values, missing, target: ~missing & (values >= target),
+    'is null': lambda values, missing, target: missing,
+    'is true': lambda values, missing, target: ~missing & (values != 0),
+    'is false': lambda values, missing, target: missing | (values == 0),
+}
+
+
+# Python source for each operator in the generated evaluator. {value} is the
+# fact expression and {target} the name of the constant it is compared with.
+_EXPRESSIONS = {
+    '==': '((value := {value}) is not None and value == {target})',
+    '!=': '({value} != {target})',
+    '<': '((value := {value}) is not None and value < {target})',
+    '<=': '((value := {value}) is not None and value <= {target})',
+    '>': '((value := {value}) is not None and value > {target})',
+    '>=': '((value := {value}) is not None and value >= {target})',
+    'contains': '((value := {value}) is not None and {target} in value)',
+    'is null': '({value} is None)',
+    'is true': '({value})',
+    'is false': '(not {value})',
+}
+
+
+def _check_name(name):
+    if not all(part.isidentifier() and not keyword.iskeyword(part) for part in name.split('__')):
+        raise ImproperlyConfigured(f"Invalid triage rule fact or decision name '{name}'.")
+
+
+def _model_facts():
+    # Facts read straight off the models: StrokeAssessment fields and
+    # 'patient__<field>' for Patient fields. Imported late, as models.py imports this module.
+    from .models import Patient, StrokeAssessment
+
+    def names(model):
+        return {field.name for field in model._meta.concrete_fields if not field.is_relation}
+
+    return names(StrokeAssessment) | {f"patient__{name}" for name in names(Patient)}
+
+
+class Condition:
+    """
+    One compiled (fact, operator, value) test.
+    """
+
+    def __init__(self, fact, op, target, from_facts):
+        self.fact = fact
+        self.op = op
+        self.target = target
+        self.test = OPERATORS[op]
+        self.from_facts = from_facts
+
+    def source(self, target_name):
+        """
+        Returns a Python expression for this test. Facts computed during
+        evaluation are locals of the generated function; model fields are
+        read straight off the assessment.
+        """
+        if self.from_facts:
+            value = f"f_{self.fact}"
+        else:
+            value = 'subject.' + self.fact.replace('__', '.')
+        return _EXPRESSIONS[self.op].format(value=value, target=target_name)
+
+
+class Decision:
+    """
+    One compiled decision: ordered (conditions, outcome) rules and a default.
+    outcomes lists every distinct outcome in rule order, default last; batch
+    evaluation returns codes indexing into it.
+    """
+
+    def __init__(self, name, rules, default):
+        self.name = name
+        self.rules = rules
+        self.default = default
+        self.outcomes = tuple(dict.fromkeys([outcome for _, outcome in rules] + [default]))
+        self._codes = {outcome: code for code, outcome in enumerate(self.outcomes)}
+
+    def code(self, outcome):
+        return self._codes[outcome]
+
+
+class RuleEngine:
+    """
+    Evaluator compiled from a rule table. Decisions run in table order, so a
+    decision can use any decision listed before it.
+
+    For single assessments the whole table is turned into one generated Python
+    function: an if/elif chain per decision with field reads and constants
+    inlined, so evaluation costs the same as the hand-written chains did.
+    """
+
+    def __init__(self, table):
+        self.decisions = []
+        known = set(COMPUTED_FACTS)
+        model_facts = _model_facts()
+        fields = []
+        for name, spec in table.items():
+            _check_name(name)
+            rules = []
+            try:
+                for rule in spec['rules']:
+                    conditions = tuple(
+                        self._compile_condition(condition, known, model_facts, fields)
+                        for condition in rule['when']
+                    )
+                    rules.append((conditions, rule['then']))
+                default = spec['default']
+            except (KeyError, TypeError, ValueError) as error:
+                raise ImproperlyConfigured(f"Invalid triage rule for '{name}': {error!r}")
+            self.decisions.append(Decision(name, rules, default))
+            known.add(name)
+        missing = [name for name in REQUIRED_DECISIONS if name not in known]
+        if missing:
+            raise ImproperlyConfigured(f"Triage rules must define {', '.join(missing)}.")
+        # Model fields the rules read, for cache keys and batch column loading.
+        self.fields = tuple(dict.fromkeys(fields))
+        self.outcomes = {decision.name: decision.outcomes for decision in self.decisions}
+        paths = [field.replace('__', '.') for field in self.fields]
+        self._get_inputs = operator.attrgetter(*paths) if paths else (lambda subject: ())
+        self.evaluate = self._generate_evaluator()
+
+    @staticmethod
+    def _compile_condition(condition, known, model_facts, fields):
+        fact, op, *rest = condition
+        _check_name(fact)
+        if op not in OPERATORS:
+            raise ImproperlyConfigured(f"Unknown triage rule operator '{op}'.")
+        if op in UNARY_OPERATORS:
+            target = None
+        elif len(rest) == 1:
+            target = rest[0]
+        else:
+            raise ImproperlyConfigured(f"Triage rule operator '{op}' needs exactly one value.")
+        from_facts = fact in known
+        if from_facts and fact in COMPUTED_FACTS and op not in _NUMERIC_OPERATORS:
+            raise ImproperlyConfigured(f"Triage rule operator '{op}' can't be used with '{fact}'.")
+        if not from_facts:
+            if fact not in model_facts:
+                raise ImproperlyConfigured(
+                    f"Unknown triage rule fact '{fact}': not a StrokeAssessment field, "
+                    f"'patient__<Patient field>', computed fact or earlier decision."
+                )
+            fields.append(fact)
+        return Condition(fact, op, target, from_facts)
+
+    def _generate_evaluator(self):
+        """
+        Builds evaluate(subject, facts), which evaluates every decision for one
+        assessment, adds the outcomes to facts (which must hold the
+        COMPUTED_FACTS) and returns it. Rule values and outcomes are passed in
+        as named constants, never pasted into the source.
+        """
+        constants = {}
+
+        def constant(value):
+            name = f"c{len(constants)}"
+            constants[name] = value
+            return name
+
+        lines = ['def evaluate(subject, facts):']
+        lines += [f"    f_{name} = facts['{name}']" for name in COMPUTED_FACTS]
+        for decision in self.decisions:
+            keyword_ = 'if'
+            for conditions, outcome in decision.rules:
+                test = ' and '.join(
+                    condition.source(None if condition.op in UNARY_OPERATORS else constant(condition.target))
+                    for condition in conditions
+                )
+                lines.append(f"    {keyword_} {test or 'True'}:")
+                lines.append(f"        f_{decision.name} = {constant(outcome)}")
+                keyword_ = 'elif'
+            if decision.rules:
+                lines.append('    else:')
+                lines.append(f"        f_{decision.name} = {constant(decision.default)}")
+            else:
+                lines.append(f"    f_{decision.name} = {constant(decision.default)}")
+            lines.append(f"    facts['{decision.name}'] = f_{decision.name}")
+        lines.append('    return facts')
+
+        namespace = dict(constants)
+        exec(compile('\n'.join(lines), '<triage rules>', 'exec'), namespace)
+        self.source = '\n'.join(lines)
+        return namespace['evaluate']
+
+    def window_hours(self, name):
+        """
+        Returns the hours after last known well at which a window decision
+        (like within_tpa_window) stops being true, for rules of the form
+        [('time_since_lkw_hours', '<=', hours)] -> True. Returns None for a
+        decision that isn't in the table or isn't shaped like that.
+        """
+        for decision in self.decisions:
+            if decision.name != name:
+                continue
+            if len(decision.rules) != 1 or decision.default is not False:
+                return None
+            conditions, outcome = decision.rules[0]
+            if outcome is not True or len(conditions) != 1:
+                return None
+            condition = conditions[0]
+            if condition.fact != 'time_since_lkw_hours' or condition.op not in ('<', '<='):
+                return None
+            return condition.target
+        return None
+
+    def inputs(self, subject):
+        """
+        Returns the values of every model field the rules read, as a tuple.
+        """
+        return self._get_inputs(subject)
+
+    def evaluate_columns(self, columns, facts):
+        """
+        Evaluates every decision for whole columns at once.
+        columns maps 'id' and the model field names in self.fields to sequences of values;
+        facts maps COMPUTED_FACTS to float NumPy arrays with NaN for None.
+        Returns {decision name: int8 codes indexing self.outcomes[name]}.
+        """
+        import numpy as np
+
+        count = len(columns['id'])
+        numeric = {name: (np.nan_to_num(values), np.isnan(values)) for name, values in facts.items()}
+        # Model fields are dictionary-encoded: each condition is evaluated once
+        # per distinct value with the scalar predicate, then broadcast by code.
+        # Triage fields have few distinct values, and the semantics stay
+        # identical to single-instance evaluation.
+        categorical = {}
+        for name in self.fields:
+            values = columns[name]
+            labels = tuple(dict.fromkeys(values))
+            index = {label: code for code, label in enumerate(labels)}
+            codes = np.fromiter(map(index.__getitem__, values), dtype=np.intp, count=count)
+            categorical[name] = (codes, labels)
+
+        def mask(condition):
+            if condition.fact in categorical:
+                codes, labels = categorical[condition.fact]
+                table = np.array([condition.test(label, condition.target) for label in labels], dtype=bool)
+                return table[codes] if len(labels) else np.zeros(count, dtype=bool)
+            values, missing = numeric[condition.fact]
+            return _NUMERIC_OPERATORS[condition.op](values, missing, condition.target)
+
+        results = {}
+        for decision in self.decisions:
+            choices = []
+            for conditions, outcome in decision.rules:
+                matched = np.ones(count, dtype=bool)
+                for condition in conditions:
+                    matched &= mask(condition)
+                choices.append(matched)
+            codes = np.select(
+                choices,
+                [decision.code(outcome) for _, outcome in decision.rules],
+                decision.code(decision.default),
+            ).astype(np.int8)
+            results[decision.name] = codes
+            # Later decisions test this one through its outcome labels.
+            categorical[decision.name] = (codes, decision.outcomes)
+        return results
+
+
+def load_rule_table():
+    """
+    Returns the TRIAGE_RULES setting (a dict, or the path of a JSON file), or
+    DEFAULT_TRIAGE_RULES when it isn't set.
+    """
+    table = getattr(settings, 'TRIAGE_RULES', None)
+    if table is None:
+        return DEFAULT_TRIAGE_RULES
+    if isinstance(table, str):
+        with open(table) as fh:
+            return json.load(fh)
+    return table
+
+
+@lru_cache(maxsize=None)
+def get_rule_engine():
+    """
+    Returns the RuleEngine compiled from the configured rule table, compiling it on first use.
+    """
+    return RuleEngine(load_rule_table())
+
+
+@receiver(setting_changed)
+def _reset_rule_engine(setting, **kwargs):
+    if setting == 'TRIAGE_RULES':
+        get_rule_engine.cache_clear()
@@ -0,0 +1,237 @@
+# assessment/scoring.py
+"""
+Vectorized batch scoring for StrokeAssessment cohorts.
+
+The per-instance methods on StrokeAssessment evaluate one assessment at a time.
+This module loads the columns they depend on for a whole queryset into NumPy
+arrays and computes the same results for every row at once. decode_scores()
+converts them back into the exact Python values those methods return, which
+tests/test_scoring.py checks column by column, LKW window boundaries and
+rounding ties included. Windows and eligibility statuses are evaluated
+column-wise by the same compiled triage rule table the model uses (see rules.py).
+
+Requires NumPy.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+
+from .models import NIHSS_FIELDS, CONTRAINDICATION_FIELDS
+from .race import RACE_FIELDS, RACE_ITEMS, padded_table
+from .rules import get_rule_engine
+
+
+# Columns read by score_assessments(), in values_list order.
+BATCH_COLUMNS = (
+    'id',
+    'assessment_time',
+    'patient__last_known_well_time',
+    'patient__weight_kg',
+    'patient__systolic_bp',
+    'patient__diastolic_bp',
+    'hemorrhage_present',
+    'aspects_score',
+    'lvo_status',
+) + NIHSS_FIELDS + CONTRAINDICATION_FIELDS
+
+def batch_columns():
+    """
+    Returns BATCH_COLUMNS plus any other fields read by the configured rule table.
+    """
+    return tuple(dict.fromkeys(BATCH_COLUMNS + get_rule_engine().fields))
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _nullable_column(values, dtype=np.float64):
+    """
+    Converts a column that may contain None into (values, missing_mask).
+    Missing entries are filled with 0 in the value array.
+    """
+    column = np.array(values, dtype=object)
+    missing = np.equal(column, None)
+    column[missing] = 0
+    return column.astype(dtype), missing
+
+
+def _datetime_column(values):
+    """
+    Converts aware datetimes (or None) to (int64 microseconds since epoch, missing_mask).
+    """
+    return _nullable_column(
+        [None if v is None else (v - _EPOCH) // _ONE_MICROSECOND for v in values],
+        dtype=np.int64,
+    )
+
+
+def load_assessment_columns(source):
+    """
+    Loads the batch_columns() of a StrokeAssessment queryset into a dict of
+    Python tuples keyed by column name.
+    source may also be an iterable of rows already in batch_columns() order
+    (e.g. from queryset.values_list(*batch_columns())).
+    """
+    names = batch_columns()
+    if hasattr(source, 'values_list'):
+        source = source.values_list(*names)
+    rows = list(source)
+    if rows:
+        columns = list(zip(*rows))
+    else:
+        columns = [()] * len(names)
+    return dict(zip(names, columns))
+
+
+def _hours_since_lkw(assessment_us, lkw_us, lkw_missing):
+    """
+    Mirrors StrokeAssessment.get_time_since_lkw_hours for whole columns.
+    Returns float hours with NaN where the method returns None.
+    """
+    delta_us = assessment_us - lkw_us
+    # The same two float divisions as timedelta.total_seconds() / 3600, so the
+    # unrounded hours are bit-for-bit those of the model.
+    exact = (delta_us / 10**6) / 3600
+    hours = np.round(exact, 2)
+    # A zero timedelta is falsy on the model, so it yields None there as well.
+    hours[lkw_missing | (delta_us == 0)] = np.nan
+
+    # np.round scales by 100 before rounding, so it can land on the other side
+    # of a tie than Python's correctly rounded round(); re-round the few values
+    # that sit within reach of one in Python.
+    scaled = np.abs(exact) * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    near_tie &= ~np.isnan(hours)
+    for i in np.flatnonzero(near_tie):
+        hours[i] = round(float(exact[i]), 2)
+    return hours
+
+
+def _nihss_totals(items):
+    """
+    Mirrors StrokeAssessment.calculate_nihss_total_score for whole columns.
+    items maps each NIHSS field to (values, missing_mask).
+    Returns float totals with NaN where any item is missing.
+    """
+    count = len(items[NIHSS_FIELDS[0]][0])
+    total = np.zeros(count, dtype=np.int64)
+    missing = np.zeros(count, dtype=bool)
+    for name in NIHSS_FIELDS:
+        values, item_missing = items[name]
+        total += values
+        missing |= item_missing
+    total = total.astype(np.float64)
+    total[missing] = np.nan
+    return total
+
+
+def _race_scores(items):
+    """
+    Mirrors StrokeAssessment.calculate_race_score for whole columns, using the
+    same lookup tables (see race.py) through np.take instead of per-row branches.
+    items maps each NIHSS field to (values, missing_mask).
+    Returns float scores with NaN where any RACE component is missing.
+    """
+    count = len(items[RACE_FIELDS[0]][0])
+    race = np.zeros(count, dtype=np.int64)
+    for points, fields in RACE_ITEMS:
+        table, last = padded_table(points)
+        worse = np.maximum.reduce([items[name][0] for name in fields])
+        race += np.take(table, np.clip(worse, -1, last) + 1)
+
+    race = race.astype(np.float64)
+    missing = np.zeros(count, dtype=bool)
+    for name in RACE_FIELDS:
+        missing |= items[name][1]
+    race[missing] = np.nan
+    return race
+
+
+def score_assessments(source):
+    """
+    Scores every assessment in source (a queryset or batch_columns() rows) at once.
+    Returns a dict of equal-length NumPy arrays:
+    - 'id': assessment ids
+    - 'time_since_lkw_hours': float, NaN where unavailable
+    - 'within_tpa_window', 'within_thrombectomy_window': bool
+    - 'nihss_total_score', 'race_score', 'tpa_dose': float, NaN where None
+    - 'tpa_status': int8 index into the rule engine's tpa_eligibility_status outcomes
+    - 'thrombectomy_status': int8 index into its thrombectomy_candidacy outcomes
+    """
+    return score_columns(load_assessment_columns(source))
+
+
+def score_columns(columns):
+    """
+    Same as score_assessments(), for columns already loaded into a dict keyed
+    by batch_columns() names (extra keys are ignored).
+    """
+    count = len(columns['id'])
+
+    assessment_us, _ = _datetime_column(columns['assessment_time'])
+    lkw_us, lkw_missing = _datetime_column(columns['patient__last_known_well_time'])
+    hours = _hours_since_lkw(assessment_us, lkw_us, lkw_missing)
+
+    items = {name: _nullable_column(columns[name], dtype=np.int64) for name in NIHSS_FIELDS}
+    nihss_total = _nihss_totals(items)
+    race = _race_scores(items)
+
+    engine = get_rule_engine()
+    codes = engine.evaluate_columns(columns, {
+        'time_since_lkw_hours': hours,
+        'nihss_total_score': nihss_total,
+        'race_score': race,
+    })
+    within_tpa = np.array(engine.outcomes['within_tpa_window'], dtype=bool)[codes['within_tpa_window']]
+    within_thrombectomy = np.array(
+        engine.outcomes['within_thrombectomy_window'], dtype=bool
+    )[codes['within_thrombectomy_window']]
+
+    weight, weight_missing = _nullable_column(
+        [None if w is None else float(w) for w in columns['patient__weight_kg']]
+    )
+    tpa_dose = np.minimum(weight * 0.9, 90.0)
+    tpa_dose[weight_missing] = np.nan
+
+    return {
+        'id': np.fromiter(columns['id'], dtype=np.int64, count=count),
+        'time_since_lkw_hours': hours,
+        'within_tpa_window': within_tpa,
+        'within_thrombectomy_window': within_thrombectomy,
+        'nihss_total_score': nihss_total,
+        'race_score': race,
+        'tpa_status': codes['tpa_eligibility_status'],
+        'thrombectomy_status': codes['thrombectomy_candidacy'],
+        'tpa_dose': tpa_dose,
+    }
+
+
+def decode_scores(scores):
+    """
+    Converts the arrays from score_assessments() into a list of dicts holding
+    the same Python values the per-instance StrokeAssessment methods return
+    (ints, floats, bools, None and status strings).
+    """
+    outcomes = get_rule_engine().outcomes
+    tpa_statuses = outcomes['tpa_eligibility_status']
+    thrombectomy_statuses = outcomes['thrombectomy_candidacy']
+
+    def nullable(value, cast):
+        return None if np.isnan(value) else cast(value)
+
+    results = []
+    for i in range(len(scores['id'])):
+        results.append({
+            'id': int(scores['id'][i]),
+            'time_since_lkw_hours': nullable(scores['time_since_lkw_hours'][i], float),
+            'within_tpa_window': bool(scores['within_tpa_window'][i]),
+            'within_thrombectomy_window': bool(scores['within_thrombectomy_window'][i]),
+            'nihss_total_score': nullable(scores['nihss_total_score'][i], int),
+            'race_score': nullable(scores['race_score'][i], int),
+            'tpa_eligibility_status': tpa_statuses[scores['tpa_status'][i]],
+            'thrombectomy_candidacy': thrombectomy_statuses[scores['thrombectomy_status'][i]],
+            'tpa_dose': nullable(scores['tpa_dose'][i], float),
+        })
+    return results
@@ -0,0 +1,96 @@
+# assessment/serializers.py
+
+from .models import NIHSS_FIELDS, CONTRAINDICATION_FIELDS
+
+
+# Stored assessment fields included in API payloads, besides id/patient/time.
+ASSESSMENT_FIELDS = (
+    'be_fast_balance',
+    'be_fast_eyes',
+    'be_fast_face_drooping',
+    'be_fast_arm_weakness',
+    'be_fast_speech_difficulty',
+    'be_fast_time_to_call',
+    'be_fast_plus_other',
+) + NIHSS_FIELDS + (
+    'ct_scan_time',
+    'hemorrhage_present',
+    'aspects_score',
+    'lvo_status',
+    'lvo_location',
+) + CONTRAINDICATION_FIELDS + (
+    'tpa_eligibility',
+    'thrombectomy_eligibility',
+    'treatment_recommendation',
+)
+
+# Computed values from StrokeAssessment.get_clinical_decisions() included in API payloads.
+DECISION_FIELDS = (
+    'time_since_lkw_hours',
+    'within_tpa_window',
+    'within_thrombectomy_window',
+    'nihss_total_score',
+    'race_score',
+    'aspects_interpretation',
+    'tpa_eligibility_status',
+    'tpa_dose',
+    'thrombectomy_candidacy',
+    'bp_management_target',
+    'stroke_center_recommendation',
+    'transfer_recommendation',
+    'critical_time_targets',
+)
+
+
+def plain_value(value):
+    """
+    Converts a model field value to a plain JSON/CSV-friendly one: datetimes
+    and dates to ISO 8601 strings, Decimals to floats; None, bools, numbers
+    and strings are returned as they are.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return float(value)
+
+
+def serialize_patient(patient):
+    """
+    Returns a JSON-ready dict for a Patient.
+    Includes latest_assessment_id when the queryset was annotated with it.
+    """
+    data = {
+        'id': patient.id,
+        'arrival_time': plain_value(patient.arrival_time),
+        'last_known_well_time': plain_value(patient.last_known_well_time),
+        'age': patient.age,
+        'weight_kg': plain_value(patient.weight_kg),
+        'systolic_bp': patient.systolic_bp,
+        'diastolic_bp': patient.diastolic_bp,
+        'blood_glucose': plain_value(patient.blood_glucose),
+        'anticoagulant_status': patient.anticoagulant_status,
+        'anticoagulant_medication': patient.anticoagulant_medication,
+        'last_anticoagulant_dose': plain_value(patient.last_anticoagulant_dose),
+    }
+    if hasattr(patient, 'latest_assessment_id'):
+        data['latest_assessment_id'] = patient.latest_assessment_id
+    return data
+
+
+def serialize_assessment(assessment, include_decisions=True):
+    """
+    Returns a JSON-ready dict for a StrokeAssessment, optionally with its
+    computed clinical decisions under 'decisions'.
+    """
+    data = {
+        'id': assessment.id,
+        'patient_id': assessment.patient_id,
+        'assessment_time': plain_value(assessment.assessment_time),
+    }
+    for name in ASSESSMENT_FIELDS:
+        data[name] = plain_value(getattr(assessment, name))
+    if include_decisions:
+        decisions = assessment.get_clinical_decisions()
+        data['decisions'] = {name: decisions[name] for name in DECISION_FIELDS}
+    return data
@@ -0,0 +1,45 @@
+# assessment/tests/factories.py
+"""
+Builders for the patients and assessments used across the test modules.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from ..models import NIHSS_FIELDS, Patient, StrokeAssessment
+
+ARRIVAL = datetime(2025, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def make_patient(save=True, **fields):
+    """
+    Returns a patient who arrived at ARRIVAL, last known well an hour before.
+    """
+    values = {
+        'arrival_time': ARRIVAL,
+        'last_known_well_time': ARRIVAL - timedelta(hours=1),
+        'age': 70,
+        'weight_kg': Decimal('80.00'),
+        'systolic_bp': 150,
+        'diastolic_bp': 85,
+        'blood_glucose': Decimal('110.00'),
+    }
+    values.update(fields)
+    patient = Patient(**values)
+    if save:
+        patient.save()
+    return patient
+
+
+def make_assessment(patient, save=True, **fields):
+    """
+    Returns an assessment of patient at its arrival time, every NIHSS item 0
+    unless given in fields.
+    """
+    values = dict.fromkeys(NIHSS_FIELDS, 0)
+    values.update(assessment_time=patient.arrival_time, lvo_status='UNKNOWN')
+    values.update(fields)
+    assessment = StrokeAssessment(patient=patient, **values)
+    if save:
+        assessment.save()
+    return assessment
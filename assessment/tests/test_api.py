@@ -0,0 +1,79 @@
+# assessment/tests/test_api.py
+"""
+Tests for access control on the JSON API's write endpoints.
+
+Run with: python manage.py test assessment
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Patient, StrokeAssessment
+from .factories import make_patient
+
+PATIENT_DATA = {
+    'arrival_time': '2025-01-01 12:00',
+    'last_known_well_time': '2025-01-01 11:00',
+    'age': 70,
+    'weight_kg': '80.00',
+    'systolic_bp': 150,
+    'diastolic_bp': 85,
+    'blood_glucose': '110.00',
+    'anticoagulant_status': 'NONE',
+}
+
+
+@override_settings(API_TOKENS=['tablet-token'])
+class ApiWriteAccessTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('nurse', password='pw')
+
+    def post(self, client, url, data, **headers):
+        return client.post(url, json.dumps(data), content_type='application/json', headers=headers)
+
+    def test_anonymous_post_is_unauthorized(self):
+        patient = make_patient()
+        for url, data in (
+            (reverse('assessment:api_patients'), PATIENT_DATA),
+            (reverse('assessment:api_assessment_create', args=[patient.id]), {}),
+            (reverse('assessment:api_assessment_bulk'), {'assessments': []}),
+        ):
+            with self.subTest(url=url):
+                response = self.post(Client(), url, data)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+        self.assertEqual(Patient.objects.count(), 1)
+        self.assertEqual(StrokeAssessment.objects.count(), 0)
+
+    def test_unknown_token_is_unauthorized(self):
+        response = self.post(
+            Client(), reverse('assessment:api_patients'), PATIENT_DATA, Authorization='Bearer wrong-token'
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_valid_token_may_post(self):
+        response = self.post(
+            Client(), reverse('assessment:api_patients'), PATIENT_DATA, Authorization='Bearer tablet-token'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Patient.objects.count(), 1)
+
+    def test_session_post_needs_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = self.post(client, reverse('assessment:api_patients'), PATIENT_DATA)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Patient.objects.count(), 0)
+
+        client.get(reverse('assessment:patient_form'))
+        response = self.post(
+            client, reverse('assessment:api_patients'), PATIENT_DATA, X_CSRFToken=client.cookies['csrftoken'].value
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_reads_stay_open(self):
+        self.assertEqual(Client().get(reverse('assessment:api_patients')).status_code, 200)
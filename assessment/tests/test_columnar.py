@@ -0,0 +1,76 @@
+# assessment/tests/test_columnar.py
+"""
+Tests for the Parquet export: writes a small dataset partitioned by arrival
+month and reads back its schema and row counts. Skipped without pyarrow.
+
+Run with: python manage.py test assessment
+"""
+
+import tempfile
+import unittest
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from .factories import ARRIVAL, make_assessment, make_patient
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from ..columnar import PARTITION_COLUMN, assessment_schema, patient_schema
+except ImportError:  # pyarrow and NumPy are only needed for the Parquet export.
+    ds = None
+
+
+def read_dataset(path, schema):
+    """
+    Returns the table read from a dataset written by export_parquet.
+    """
+    partitioning = ds.partitioning(pa.schema([schema.field(PARTITION_COLUMN)]), flavor='hive')
+    return ds.dataset(path, format='parquet', schema=schema, partitioning=partitioning).to_table()
+
+
+@unittest.skipUnless(ds, "pyarrow is not installed")
+class ParquetExportTests(TestCase):
+
+    def setUp(self):
+        january = make_patient()
+        february = make_patient(arrival_time=ARRIVAL + timedelta(days=31),
+                                last_known_well_time=ARRIVAL + timedelta(days=31, hours=-1))
+        make_assessment(january)
+        make_assessment(january, aspects_score=8)
+        make_assessment(february)
+
+    def export(self, directory):
+        call_command('export_parquet', directory, '--batch-size', '2', stdout=StringIO())
+        return Path(directory)
+
+    def test_datasets_are_partitioned_by_arrival_month(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = self.export(directory)
+            for name in ('patients', 'assessments'):
+                with self.subTest(dataset=name):
+                    partitions = sorted(path.name for path in (output / name).iterdir())
+                    self.assertEqual(partitions, ['arrival_month=2025-01', 'arrival_month=2025-02'])
+
+    def test_schema_and_row_counts_read_back(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = self.export(directory)
+            patients = read_dataset(output / 'patients', patient_schema())
+            assessments = read_dataset(output / 'assessments', assessment_schema())
+        self.assertEqual(patients.schema, patient_schema())
+        self.assertEqual(assessments.schema, assessment_schema())
+        self.assertEqual(patients.num_rows, 2)
+        self.assertEqual(assessments.num_rows, 3)
+        months = assessments.column(PARTITION_COLUMN).to_pylist()
+        self.assertEqual(sorted(months), ['2025-01', '2025-01', '2025-02'])
+        self.assertEqual(assessments.column('nihss_total_score').to_pylist(), [0, 0, 0])
+
+    def test_export_again_replaces_partitions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.export(directory)
+            output = self.export(directory)
+            self.assertEqual(read_dataset(output / 'assessments', assessment_schema()).num_rows, 3)
@@ -0,0 +1,88 @@
+# assessment/tests/test_conditional.py
+"""
+Tests for ETag / Last-Modified validators and 304 Not Modified responses.
+
+Run with: python manage.py test assessment
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from ..fragments import fragment_cache
+from .factories import make_assessment, make_patient
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        fragment_cache().clear()
+        self.patient = make_patient()
+        self.assessment = make_assessment(self.patient)
+
+    def assertRevalidates(self, url, change):
+        """
+        Checks url answers 304 to its own ETag until change() runs, then 200
+        with a new ETag. Returns the first response.
+        """
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        change()
+        changed = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        return response
+
+    def test_patient_list_revalidates_on_create(self):
+        response = self.assertRevalidates(reverse('assessment:patient_list'), make_patient)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_patient_list_revalidates_on_delete(self):
+        self.assertRevalidates(reverse('assessment:patient_list'), self.assessment.delete)
+
+    def test_patient_list_not_modified_costs_one_query(self):
+        url = reverse('assessment:patient_list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+    def test_api_patient_list_revalidates(self):
+        self.assertRevalidates(reverse('assessment:api_patients'), make_patient)
+
+    def test_assessment_detail_revalidates_on_assessment_change(self):
+        url = reverse('assessment:assessment_detail', args=[self.patient.id, self.assessment.id])
+
+        def change():
+            self.assessment.nihss_4_facial_palsy = 2
+            self.assessment.save()
+        response = self.assertRevalidates(url, change)
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_assessment_detail_revalidates_on_patient_change(self):
+        url = reverse('assessment:assessment_detail', args=[self.patient.id, self.assessment.id])
+
+        def change():
+            self.patient.weight_kg = 95
+            self.patient.save()
+        self.assertRevalidates(url, change)
+
+    def test_api_assessment_detail_may_be_reused(self):
+        url = reverse('assessment:api_assessment_detail', args=[self.patient.id, self.assessment.id])
+
+        def change():
+            self.assessment.aspects_score = 7
+            self.assessment.save()
+        response = self.assertRevalidates(url, change)
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertNotIn('no-cache', response['Cache-Control'])
+
+    def test_timeline_revalidates_on_new_assessment(self):
+        url = reverse('assessment:api_assessment_timeline', args=[self.patient.id])
+        self.assertRevalidates(url, lambda: make_assessment(self.patient))
+
+    def test_if_modified_since_is_honoured(self):
+        url = reverse('assessment:api_assessment_detail', args=[self.patient.id, self.assessment.id])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, headers={'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
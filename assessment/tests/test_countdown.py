@@ -0,0 +1,66 @@
+# assessment/tests/test_countdown.py
+"""
+Tests for the countdown payload embedded in the assessment detail page
+(StrokeAssessment.get_countdown_timestamps()).
+
+Run with: python manage.py test assessment
+"""
+
+import json
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..rules import DEFAULT_TRIAGE_RULES
+from .factories import ARRIVAL, make_assessment, make_patient
+
+ARRIVAL_EPOCH = int(ARRIVAL.timestamp())
+
+
+class CountdownTimestampTests(SimpleTestCase):
+
+    def test_with_lkw(self):
+        countdowns = make_assessment(make_patient(save=False), save=False).get_countdown_timestamps()
+        self.assertEqual(countdowns, {
+            'arrival': ARRIVAL_EPOCH,
+            'lkw': ARRIVAL_EPOCH - 3600,
+            'assessment': ARRIVAL_EPOCH,
+            'targets': [
+                {'label': 'Door-to-CT Target', 'at': ARRIVAL_EPOCH + 20 * 60},
+                {'label': 'Door-to-Needle (tPA) Target', 'at': ARRIVAL_EPOCH + 60 * 60},
+                {'label': 'Door-to-Groin Puncture Target', 'at': ARRIVAL_EPOCH + 90 * 60},
+            ],
+            'windows': [
+                {'label': 'tPA Window', 'closes': ARRIVAL_EPOCH - 3600 + int(4.5 * 3600)},
+                {'label': 'Thrombectomy Window', 'closes': ARRIVAL_EPOCH - 3600 + 6 * 3600},
+            ],
+        })
+
+    def test_with_null_lkw(self):
+        patient = make_patient(save=False, last_known_well_time=None)
+        countdowns = make_assessment(patient, save=False).get_countdown_timestamps()
+        self.assertIsNone(countdowns['lkw'])
+        self.assertEqual([window['closes'] for window in countdowns['windows']], [None, None])
+        # Targets count from arrival, so they don't need the LKW time.
+        self.assertEqual(countdowns['targets'][0]['at'], ARRIVAL_EPOCH + 20 * 60)
+
+    def test_windows_follow_the_rule_table(self):
+        table = dict(DEFAULT_TRIAGE_RULES, within_tpa_window={
+            'rules': [{'when': [('time_since_lkw_hours', '<=', 3)], 'then': True}],
+            'default': False,
+        })
+        with override_settings(TRIAGE_RULES=table):
+            countdowns = make_assessment(make_patient(save=False), save=False).get_countdown_timestamps()
+        self.assertEqual(countdowns['windows'][0]['closes'], ARRIVAL_EPOCH - 3600 + 3 * 3600)
+
+
+class CountdownPayloadTests(TestCase):
+
+    def test_detail_page_embeds_the_payload(self):
+        patient = make_patient()
+        assessment = make_assessment(patient, assessment_time=ARRIVAL + timedelta(minutes=5))
+        response = self.client.get(reverse('assessment:assessment_detail', args=[patient.id, assessment.id]))
+        embedded = response.content.decode().split('<script id="countdown-data" type="application/json">', 1)[1]
+        embedded = embedded.split('</script>', 1)[0]
+        self.assertEqual(json.loads(embedded), assessment.get_countdown_timestamps())
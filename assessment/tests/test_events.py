@@ -0,0 +1,115 @@
+# assessment/tests/test_events.py
+"""
+Tests for the live triage board's server-sent events: event order, resuming
+from Last-Event-ID, delete events, and the WSGI fallback.
+
+Run with: python manage.py test assessment
+"""
+
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import events
+from ..models import allocate_change_sequence, current_change_sequence
+from .factories import make_assessment, make_patient
+
+# Streams end after a few fast polls instead of staying open.
+FAST_STREAM = {
+    'BOARD_EVENTS_POLL_SECONDS': 0.01,
+    'BOARD_EVENTS_MAX_SECONDS': 0.1,
+    'BOARD_EVENTS_KEEPALIVE_SECONDS': 60,
+}
+
+
+def parse_events(text):
+    """
+    Returns (id, event name, data) for each event in a text/event-stream body.
+    """
+    parsed = []
+    for block in text.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'id' in fields:
+            parsed.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+@override_settings(**FAST_STREAM)
+class BoardEventTests(TestCase):
+
+    def setUp(self):
+        self.since = current_change_sequence()
+        self.patient = make_patient()
+        self.first = make_assessment(self.patient)
+        self.other = make_patient()
+        self.second = make_assessment(self.patient)
+
+    async def read_stream(self, since):
+        return parse_events(''.join([chunk async for chunk in events.stream_board_events(since)]))
+
+    async def read_view(self, **headers):
+        response = await self.async_client.get(reverse('assessment:board_events'), headers=headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return parse_events(b''.join([chunk async for chunk in response.streaming_content]).decode())
+
+    async def test_events_arrive_in_change_order(self):
+        received = await self.read_stream(self.since)
+        self.assertEqual(
+            [(name, data['id']) for _, name, data in received],
+            [('patient', self.patient.id), ('assessment', self.first.id),
+             ('patient', self.other.id), ('assessment', self.second.id)],
+        )
+        self.assertEqual([seq for seq, _, _ in received], sorted(seq for seq, _, _ in received))
+        self.assertEqual(received[-1][0], self.second.change_seq)
+
+    async def test_batches_stop_where_every_table_is_covered(self):
+        received = await events.achanges_since(self.since, limit=1)
+        self.assertEqual([(name, data['id']) for _, name, data in received], [('patient', self.patient.id)])
+
+    async def test_resumes_after_last_event_id(self):
+        received = await self.read_view(**{'Last-Event-ID': str(self.first.change_seq)})
+        self.assertEqual(
+            [(name, data['id']) for _, name, data in received],
+            [('patient', self.other.id), ('assessment', self.second.id)],
+        )
+
+    async def test_invalid_last_event_id(self):
+        response = await self.async_client.get(reverse('assessment:board_events'), headers={'Last-Event-ID': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_deletes_are_sent(self):
+        since = self.second.change_seq
+        assessment_id, patient_id = self.first.id, self.other.id
+        await sync_to_async(self.first.delete)()
+        await sync_to_async(self.other.delete)()
+        received = await self.read_stream(since)
+        self.assertEqual(
+            [(name, data) for _, name, data in received],
+            [('delete', {'model': 'strokeassessment', 'id': assessment_id}),
+             ('delete', {'model': 'patient', 'id': patient_id})],
+        )
+
+    async def test_counter_moves_without_board_rows_are_read_once(self):
+        since = self.second.change_seq
+        await sync_to_async(allocate_change_sequence)()
+        with mock.patch.object(events, 'achanges_since', wraps=events.achanges_since) as achanges_since:
+            self.assertEqual(await self.read_stream(since), [])
+        achanges_since.assert_called_once_with(since)
+
+
+class WsgiFallbackTests(TestCase):
+
+    def test_event_stream_answers_no_content(self):
+        response = self.client.get(reverse('assessment:board_events'))
+        self.assertEqual(response.status_code, 204)
+
+    def test_board_does_not_open_the_stream(self):
+        response = self.client.get(reverse('assessment:patient_list'))
+        self.assertFalse(response.context['live_board'])
+
+    async def test_board_opens_the_stream_under_asgi(self):
+        response = await self.async_client.get(reverse('assessment:patient_list'))
+        self.assertTrue(response.context['live_board'])
@@ -0,0 +1,152 @@
+# assessment/tests/test_export.py
+"""
+Tests for the streaming export and its incremental watermarks.
+
+Run with: python manage.py test assessment
+"""
+
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..export import changed_assessments, get_watermark, iter_deleted_rows, iter_export_rows
+from ..models import DeletedRecord, Patient, current_change_sequence
+from .factories import make_assessment, make_patient
+
+
+def run_incremental_export(watermark='test'):
+    """
+    Runs export_assessments --incremental as NDJSON and returns its rows.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / 'export.ndjson'
+        call_command(
+            'export_assessments', '--incremental', '--format', 'ndjson', '--watermark', watermark,
+            '--output', str(output), stderr=StringIO(),
+        )
+        return [json.loads(line) for line in output.read_text().splitlines()]
+
+
+class IncrementalExportTests(TestCase):
+
+    def setUp(self):
+        self.patient = make_patient()
+        self.first = make_assessment(self.patient)
+        self.second = make_assessment(self.patient, assessment_time=self.patient.arrival_time + timedelta(hours=1))
+
+    def test_first_run_exports_everything_and_sets_watermark(self):
+        rows = run_incremental_export()
+        self.assertEqual([row['id'] for row in rows], [self.first.id, self.second.id])
+        self.assertFalse(any(row['deleted'] for row in rows))
+        self.assertEqual(get_watermark('test'), current_change_sequence())
+
+    def test_unchanged_run_exports_nothing(self):
+        run_incremental_export()
+        self.assertEqual(run_incremental_export(), [])
+
+    def test_changed_assessment_is_exported_again(self):
+        run_incremental_export()
+        self.second.nihss_1a_loc_alert = 2
+        self.second.save()
+        rows = run_incremental_export()
+        self.assertEqual([row['id'] for row in rows], [self.second.id])
+        self.assertEqual(rows[0]['nihss_total_score'], 2)
+
+    def test_patient_change_exports_its_assessments(self):
+        run_incremental_export()
+        self.patient.age = 71
+        self.patient.save()
+        rows = run_incremental_export()
+        self.assertEqual([row['id'] for row in rows], [self.first.id, self.second.id])
+        self.assertEqual({row['patient_age'] for row in rows}, {71})
+
+    def test_watermarks_are_independent(self):
+        run_incremental_export('one')
+        self.assertEqual(len(run_incremental_export('two')), 2)
+
+    def test_deleted_assessment_is_exported_as_tombstone(self):
+        run_incremental_export()
+        deleted_id = self.first.id
+        self.first.delete()
+        rows = run_incremental_export()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], deleted_id)
+        self.assertTrue(rows[0]['deleted'])
+        self.assertIsNone(rows[0]['patient_age'])
+        self.assertEqual(run_incremental_export(), [])
+
+    def test_deleting_patient_leaves_tombstones_for_its_assessments(self):
+        since = current_change_sequence()
+        self.patient.delete()
+        self.assertEqual(
+            sorted(row['id'] for row in iter_deleted_rows(since)), sorted([self.first.id, self.second.id])
+        )
+        self.assertTrue(DeletedRecord.objects.filter(model_name='patient').exists())
+
+    def test_queryset_delete_writes_tombstones_in_one_insert(self):
+        other = make_patient()
+        make_assessment(other)
+        since = current_change_sequence()
+        with CaptureQueriesContext(connection) as queries:
+            Patient.objects.all().delete()
+        inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT INTO "assessment_deletedrecord"')]
+        self.assertEqual(len(inserts), 1)
+        seqs = sorted(DeletedRecord.objects.filter(change_seq__gt=since).values_list('change_seq', flat=True))
+        self.assertEqual(seqs, list(range(since + 1, since + 6)))
+        self.assertEqual(current_change_sequence(), since + 5)
+
+    def test_rows_after_until_wait_for_next_run(self):
+        until = current_change_sequence()
+        make_assessment(self.patient)
+        self.assertEqual(changed_assessments(None, until).count(), 2)
+
+    def test_full_export_rows_are_not_deleted(self):
+        rows = list(iter_export_rows())
+        self.assertEqual(len(rows), 2)
+        self.assertEqual({row['deleted'] for row in rows}, {False})
+
+
+class PatientRestampTests(TestCase):
+
+    def setUp(self):
+        self.patient = make_patient()
+        self.assessment = make_assessment(self.patient)
+
+    def test_unrelated_patient_change_leaves_assessments_alone(self):
+        change_seq = self.assessment.change_seq
+        self.patient.age = 71
+        self.patient.save()
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.change_seq, change_seq)
+
+    def test_unchanged_save_leaves_assessments_alone(self):
+        change_seq = self.assessment.change_seq
+        self.patient.save()
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.change_seq, change_seq)
+
+    def test_lkw_change_restamps_and_rescores_assessments(self):
+        change_seq = self.assessment.change_seq
+        self.patient.last_known_well_time -= timedelta(hours=2)
+        self.patient.save()
+        self.assessment.refresh_from_db()
+        self.assertGreater(self.assessment.change_seq, change_seq)
+        self.assertAlmostEqual(self.assessment.hours_since_lkw, 3.0)
+
+    def test_lkw_set_from_null_restamps_and_rescores_assessments(self):
+        patient = make_patient(last_known_well_time=None)
+        assessment = make_assessment(patient)
+        self.assertIsNone(assessment.hours_since_lkw)
+        change_seq = assessment.change_seq
+        patient.last_known_well_time = self.patient.last_known_well_time
+        patient.save()
+        assessment.refresh_from_db()
+        self.assertGreater(assessment.change_seq, change_seq)
+        self.assertAlmostEqual(assessment.hours_since_lkw, 1.0)
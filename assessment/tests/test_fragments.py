@@ -0,0 +1,63 @@
+# assessment/tests/test_fragments.py
+"""
+Tests for the cache of rendered assessment detail fragments.
+
+Run with: python manage.py test assessment
+"""
+
+from django.test import TestCase
+from django.urls import reverse
+
+from ..fragments import fragment_cache, fragment_key, fragment_tag
+from ..models import StrokeAssessment, stamp_changes
+from .factories import make_assessment, make_patient
+
+
+class FragmentCacheTests(TestCase):
+
+    def setUp(self):
+        fragment_cache().clear()
+        self.patient = make_patient()
+        self.assessment = make_assessment(self.patient)
+        self.url = reverse('assessment:assessment_detail', args=[self.patient.id, self.assessment.id])
+
+    def cached(self):
+        return fragment_cache().get(fragment_key(self.assessment.id))
+
+    def test_render_is_cached_under_its_tag(self):
+        self.client.get(self.url)
+        tag, html = self.cached()
+        self.assertEqual(tag, fragment_tag(self.assessment))
+        self.assertIn('NIHSS Total Score', html)
+
+    def test_assessment_save_drops_entry(self):
+        self.client.get(self.url)
+        self.assessment.save()
+        self.assertIsNone(self.cached())
+
+    def test_patient_save_drops_entries_of_its_assessments(self):
+        other = make_assessment(self.patient)
+        self.client.get(self.url)
+        self.client.get(reverse('assessment:assessment_detail', args=[self.patient.id, other.id]))
+        self.patient.save()
+        self.assertIsNone(self.cached())
+        self.assertIsNone(fragment_cache().get(fragment_key(other.id)))
+
+    def test_delete_drops_entry(self):
+        self.client.get(self.url)
+        key = fragment_key(self.assessment.id)
+        self.assessment.delete()
+        self.assertIsNone(fragment_cache().get(key))
+
+    def test_stale_tag_is_rerendered_after_write_without_signals(self):
+        self.client.get(self.url)
+        _, stale_html = self.cached()
+        # bulk_update sends no signals, so the entry stays but its tag no longer matches.
+        self.assessment.aspects_score = 3
+        stamp_changes([self.assessment])
+        StrokeAssessment.objects.bulk_update([self.assessment], ('aspects_score',) + StrokeAssessment.CHANGE_FIELDS)
+        self.assertIsNotNone(self.cached())
+        self.client.get(self.url)
+        tag, html = self.cached()
+        self.assertEqual(tag, fragment_tag(self.assessment))
+        self.assertNotEqual(html, stale_html)
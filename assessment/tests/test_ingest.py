@@ -0,0 +1,97 @@
+# assessment/tests/test_ingest.py
+"""
+Tests for bulk assessment ingestion: per-row error reporting, and agreement
+with StrokeAssessmentForm on which rows are rejected.
+
+Run with: python manage.py test assessment
+"""
+
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from ..forms import StrokeAssessmentForm
+from ..ingest import ingest_assessments
+from ..management.commands.run_benchmarks import ASSESSMENT_POST_DATA
+from ..models import StrokeAssessment
+from .factories import make_patient
+
+
+def form_rejects(row):
+    return not StrokeAssessmentForm(row).is_valid()
+
+
+class IngestTests(TestCase):
+
+    def setUp(self):
+        self.patient = make_patient()
+
+    def row(self, **fields):
+        values = dict(ASSESSMENT_POST_DATA, patient_id=self.patient.id)
+        values.update(fields)
+        return values
+
+    def test_valid_rows_are_created_with_scores(self):
+        result = ingest_assessments([self.row(), self.row(assessment_time='2025-01-01 12:30')])
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.errors, [])
+        created = StrokeAssessment.objects.filter(pk__in=result.created_ids)
+        self.assertEqual(created.count(), 2)
+        self.assertTrue(all(assessment.nihss_total_score is not None for assessment in created))
+        self.assertTrue(all(assessment.change_seq for assessment in created))
+
+    def test_errors_are_reported_by_row(self):
+        result = ingest_assessments([
+            self.row(),
+            'not an object',
+            self.row(patient_id='abc'),
+            {key: value for key, value in self.row().items() if key != 'patient_id'},
+            self.row(patient_id=self.patient.id + 1000),
+            self.row(lvo_status='SOMETIMES'),
+            self.row(assessment_time='yesterday'),
+        ])
+        self.assertEqual(result.created, 1)
+        errors = {error['row']: error['errors'] for error in result.errors}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(errors[1]), ['__all__'])
+        self.assertEqual(errors[2], {'patient_id': ["Enter a whole number."]})
+        self.assertEqual(errors[3], {'patient_id': ["This field is required."]})
+        self.assertEqual(errors[4], {'patient_id': ["Patient not found."]})
+        self.assertEqual(list(errors[5]), ['lvo_status'])
+        self.assertEqual(list(errors[6]), ['assessment_time'])
+
+    def test_rejects_the_same_rows_as_the_form(self):
+        rows = [
+            self.row(),
+            self.row(nihss_1a_loc_alert=9),
+            self.row(nihss_1a_loc_alert='x'),
+            self.row(nihss_2_best_gaze=''),
+            self.row(aspects_score=11),
+            self.row(aspects_score=-1),
+            self.row(lvo_status='SOMETIMES'),
+            self.row(lvo_location='M' * 500),
+            self.row(tpa_eligibility='MAYBE'),
+            self.row(ct_scan_time='not a time'),
+            self.row(hemorrhage_present='on'),
+        ]
+        self.assertIngestMatchesForm(rows)
+
+    def test_model_validation_rejects_rows_like_the_form(self):
+        # Model-level rules run through full_clean() in both paths.
+        def clean(assessment):
+            if assessment.hemorrhage_present and assessment.lvo_status == 'PRESENT':
+                raise ValidationError("Hemorrhage with LVO needs review.")
+
+        rows = [self.row(), self.row(hemorrhage_present=True), self.row(lvo_status='ABSENT', hemorrhage_present=True)]
+        with mock.patch.object(StrokeAssessment, 'clean', clean):
+            result = self.assertIngestMatchesForm(rows)
+        self.assertEqual(result.errors, [{'row': 1, 'errors': {'__all__': ["Hemorrhage with LVO needs review."]}}])
+
+    def assertIngestMatchesForm(self, rows):
+        result = ingest_assessments(rows)
+        rejected = {error['row'] for error in result.errors}
+        expected = {index for index, row in enumerate(rows) if form_rejects(row)}
+        self.assertEqual(rejected, expected)
+        self.assertEqual(result.created, len(rows) - len(expected))
+        return result
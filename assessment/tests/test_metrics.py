@@ -0,0 +1,59 @@
+# assessment/tests/test_metrics.py
+"""
+Tests for RequestMetricsMiddleware: the Server-Timing header and the query and
+template timings recorded for sync and async views.
+
+Run with: python manage.py test assessment
+"""
+
+import re
+
+from django.test import TestCase
+from django.urls import reverse
+
+from stroke_project import metrics
+from .factories import make_patient
+
+SERVER_TIMING = re.compile(
+    r'^total;dur=(?P<total>[\d.]+), db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", tpl;dur=(?P<tpl>[\d.]+)$'
+)
+
+
+class RequestMetricsTests(TestCase):
+
+    def setUp(self):
+        self.patient = make_patient()
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+
+    def assertTimed(self, response, view_name):
+        self.assertEqual(response.status_code, 200)
+        header = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(header, response['Server-Timing'])
+        total_ms, sql_count, sql_ms, template_ms = metrics.registry.samples[view_name][-1]
+        self.assertEqual(int(header['queries']), sql_count)
+        self.assertGreaterEqual(sql_count, 1)
+        self.assertGreater(sql_ms, 0)
+        self.assertGreater(template_ms, 0)
+        self.assertGreaterEqual(total_ms, sql_ms + template_ms)
+
+    def test_sync_view(self):
+        response = self.client.get(reverse('assessment:patient_delete', args=[self.patient.id]))
+        self.assertTimed(response, 'assessment:patient_delete')
+
+    async def test_async_view(self):
+        response = await self.async_client.get(reverse('assessment:patient_list'))
+        self.assertTimed(response, 'assessment:patient_list')
+
+    def test_unresolved_requests_are_grouped(self):
+        response = self.client.get('/no-such-page/')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('Server-Timing', response)
+        self.assertEqual(len(metrics.registry.samples['unresolved']), 1)
+
+    def test_summary_endpoint_is_staff_only(self):
+        self.client.get(reverse('assessment:patient_list'))
+        self.assertEqual(self.client.get(reverse('request_metrics')).status_code, 403)
+        with self.settings(DEBUG=True):
+            views = self.client.get(reverse('request_metrics')).json()['views']
+        self.assertEqual(views['assessment:patient_list']['count'], 1)
@@ -0,0 +1,76 @@
+# assessment/tests/test_pagination.py
+"""
+Tests for keyset pagination of the patient list and its cursors.
+
+Run with: python manage.py test assessment
+"""
+
+from datetime import timedelta
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Patient
+from ..pagination import (
+    InvalidCursor, decode_patient_cursor, encode_patient_cursor, get_page_size, paginate_patients,
+)
+from .factories import ARRIVAL, make_patient
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        patient = make_patient(save=False, id=42)
+        self.assertEqual(decode_patient_cursor(encode_patient_cursor(patient)), (ARRIVAL, 42))
+
+    def test_malformed_cursors_raise_invalid_cursor(self):
+        for cursor in ('', 'garbage', '~5', 'not-a-date~5', '2025-01-01T12:00:00+00:00~abc', '2025-13-01T12:00:00~5'):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidCursor):
+                    decode_patient_cursor(cursor)
+
+    @override_settings(PATIENT_LIST_PAGE_SIZE=25, PATIENT_LIST_MAX_PAGE_SIZE=100)
+    def test_page_size_is_defaulted_and_clamped(self):
+        factory = RequestFactory()
+        for query, expected in ({}, 25), ({'page_size': 'x'}, 25), ({'page_size': 0}, 1), ({'page_size': 500}, 100):
+            with self.subTest(query=query):
+                self.assertEqual(get_page_size(factory.get('/', query)), expected)
+
+
+class PaginatePatientsTests(TestCase):
+
+    def setUp(self):
+        # Three patients share each arrival time, so pages must break ties by id.
+        self.patients = [
+            make_patient(arrival_time=ARRIVAL - timedelta(minutes=index // 3)) for index in range(10)
+        ]
+
+    def test_pages_cover_every_patient_once_newest_first(self):
+        seen, cursor = [], None
+        while True:
+            page, cursor = paginate_patients(Patient.objects.all(), cursor=cursor, page_size=4)
+            seen.extend(patient.id for patient in page)
+            if cursor is None:
+                break
+        expected = sorted(self.patients, key=lambda patient: (patient.arrival_time, patient.id), reverse=True)
+        self.assertEqual(seen, [patient.id for patient in expected])
+
+    def test_last_page_has_no_cursor(self):
+        page, cursor = paginate_patients(Patient.objects.all(), page_size=10)
+        self.assertEqual(len(page), 10)
+        self.assertIsNone(cursor)
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        response = self.client.get(reverse('assessment:patient_list'), {'after': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('assessment:api_patients'), {'after': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': "Invalid pagination cursor."})
+
+    def test_list_view_follows_next_cursor(self):
+        response = self.client.get(reverse('assessment:api_patients'), {'page_size': 6})
+        first = response.json()
+        response = self.client.get(reverse('assessment:api_patients'), {'page_size': 6, 'after': first['next_cursor']})
+        second = response.json()
+        self.assertEqual(len(first['results']) + len(second['results']), 10)
+        self.assertIsNone(second['next_cursor'])
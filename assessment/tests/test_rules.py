@@ -0,0 +1,186 @@
+# assessment/tests/test_rules.py
+"""
+Tests for the triage rule table: the default table against reference copies
+of the original if-chains, TRIAGE_RULES overrides given as a dict or a JSON
+file, and the checks that reject a bad table at compile time.
+
+Run with: python manage.py test assessment
+"""
+
+import copy
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from ..rules import DEFAULT_TRIAGE_RULES, REQUIRED_DECISIONS, RuleEngine, get_rule_engine
+from .factories import ARRIVAL, make_assessment, make_patient
+from .test_scoring import lkw_offsets, varied_assessments
+
+
+def reference_decisions(assessment, nihss_score):
+    """
+    Copy of the if-chains StrokeAssessment used before the rule table.
+    """
+    patient = assessment.patient
+    hours = None
+    if patient.last_known_well_time and assessment.assessment_time:
+        elapsed = assessment.assessment_time - patient.last_known_well_time
+        if elapsed:
+            hours = round(elapsed.total_seconds() / 3600, 2)
+    within_tpa_window = hours is not None and hours <= 4.5
+    within_thrombectomy_window = hours is not None and hours <= 6
+
+    aspects = assessment.aspects_score
+    if aspects is None:
+        aspects_interpretation = "ASPECTS score not available."
+    elif aspects == 10:
+        aspects_interpretation = "Normal CT scan (no early ischemic changes)."
+    elif aspects >= 8:
+        aspects_interpretation = "Mild early ischemic changes."
+    elif aspects >= 5:
+        aspects_interpretation = "Moderate early ischemic changes."
+    elif aspects >= 0:
+        aspects_interpretation = "Severe early ischemic changes (significant infarction)."
+    else:
+        aspects_interpretation = "Invalid ASPECTS score."
+
+    if not within_tpa_window:
+        tpa = "Not Eligible (Outside Time Window)"
+    elif assessment.hemorrhage_present:
+        tpa = "Contraindicated (Intracranial Hemorrhage)"
+    elif patient.systolic_bp is not None and patient.systolic_bp > 185:
+        tpa = "Contraindicated (BP > 185 mmHg)"
+    elif patient.diastolic_bp is not None and patient.diastolic_bp > 110:
+        tpa = "Contraindicated (BP > 110 mmHg)"
+    elif assessment.recent_surgery or assessment.prior_stroke_head_trauma or assessment.gi_urinary_hemorrhage:
+        tpa = "Contraindicated (Major Bleeding Risk Factors)"
+    elif assessment.low_platelets:
+        tpa = "Contraindicated (Low Platelets)"
+    elif assessment.elevated_inr:
+        tpa = "Contraindicated (Elevated INR)"
+    elif assessment.current_anticoagulant_use:
+        tpa = "Contraindicated (Current Anticoagulant Use)"
+    else:
+        tpa = "Potentially Eligible"
+
+    if not within_thrombectomy_window:
+        thrombectomy = "Not Candidate (Outside Time Window)"
+    elif assessment.hemorrhage_present:
+        thrombectomy = "Not Candidate (Intracranial Hemorrhage)"
+    elif assessment.lvo_status != 'PRESENT':
+        thrombectomy = "Not Candidate (No LVO Detected)"
+    elif aspects is None:
+        thrombectomy = "Pending (ASPECTS Score Missing)"
+    elif aspects < 6:
+        thrombectomy = "Not Candidate (ASPECTS < 6)"
+    else:
+        thrombectomy = "Potentially Candidate"
+
+    if tpa == "Potentially Eligible":
+        bp_target = "Target BP < 185/110 mmHg (for tPA)"
+    elif thrombectomy == "Potentially Candidate":
+        bp_target = "Target BP < 185/110 mmHg (for thrombectomy)"
+    else:
+        bp_target = "Target BP < 220/120 mmHg (permissive hypertension)"
+
+    if thrombectomy == "Potentially Candidate":
+        center = "Comprehensive Stroke Center (CSC) recommended for thrombectomy."
+    elif nihss_score is not None and nihss_score >= 5:
+        center = "Primary Stroke Center (PSC) recommended for IV thrombolysis and stroke care."
+    else:
+        center = "Acute Stroke Ready Hospital (ASRH) or general hospital for initial stabilization."
+
+    if "Comprehensive Stroke Center (CSC)" in center:
+        transfer = "Consider immediate transfer to a Comprehensive Stroke Center (CSC) for advanced care."
+    elif "Primary Stroke Center (PSC)" in center:
+        transfer = "Consider transfer to a Primary Stroke Center (PSC) if not at one."
+    else:
+        transfer = "No immediate transfer recommended based on current findings."
+
+    return {
+        'within_tpa_window': within_tpa_window,
+        'within_thrombectomy_window': within_thrombectomy_window,
+        'aspects_interpretation': aspects_interpretation,
+        'tpa_eligibility_status': tpa,
+        'thrombectomy_candidacy': thrombectomy,
+        'bp_management_target': bp_target,
+        'stroke_center_recommendation': center,
+        'transfer_recommendation': transfer,
+    }
+
+
+def shortened_tpa_window(hours):
+    """
+    Returns a copy of the default table with the tPA window closing at hours.
+    """
+    table = copy.deepcopy(DEFAULT_TRIAGE_RULES)
+    table['within_tpa_window']['rules'] = [{'when': [('time_since_lkw_hours', '<=', hours)], 'then': True}]
+    return table
+
+
+class DefaultRuleTableTests(SimpleTestCase):
+
+    def test_matches_original_if_chains(self):
+        assessments = varied_assessments(lkw_offsets())
+        # Reach the ASPECTS branches the varied cohort doesn't, the invalid ones included.
+        for assessment, aspects in zip(assessments, [-1, 4, 8, 9, 11] * len(assessments)):
+            if assessment.pk % 3 == 0:
+                assessment.aspects_score = aspects
+        for assessment in assessments:
+            decisions = assessment.get_clinical_decisions()
+            expected = reference_decisions(assessment, decisions['nihss_total_score'])
+            actual = {name: decisions[name] for name in expected}
+            self.assertEqual(actual, expected, f"assessment {assessment.pk}")
+
+
+class RuleOverrideTests(SimpleTestCase):
+
+    def assertTpaWindowIsThreeHours(self):
+        self.assertEqual(get_rule_engine().window_hours('within_tpa_window'), 3)
+        for hours, eligible in ((3, True), (4, False)):
+            patient = make_patient(save=False, last_known_well_time=ARRIVAL - timedelta(hours=hours))
+            decisions = make_assessment(patient, save=False).get_clinical_decisions()
+            self.assertEqual(decisions['within_tpa_window'], eligible)
+        self.assertEqual(decisions['tpa_eligibility_status'], "Not Eligible (Outside Time Window)")
+
+    def test_dict_override(self):
+        with override_settings(TRIAGE_RULES=shortened_tpa_window(3)):
+            self.assertTpaWindowIsThreeHours()
+        self.assertEqual(get_rule_engine().window_hours('within_tpa_window'), 4.5)
+
+    def test_json_file_override(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'rules.json'
+            path.write_text(json.dumps(shortened_tpa_window(3)))
+            with override_settings(TRIAGE_RULES=str(path)):
+                self.assertTpaWindowIsThreeHours()
+
+
+class RuleValidationTests(SimpleTestCase):
+
+    def assertRejected(self, table, message):
+        with self.assertRaisesMessage(ImproperlyConfigured, message):
+            RuleEngine(table)
+
+    def test_unknown_assessment_field(self):
+        table = shortened_tpa_window(3)
+        table['aspects_interpretation']['rules'][0]['when'] = [('aspects_scor', 'is null')]
+        self.assertRejected(table, "Unknown triage rule fact 'aspects_scor'")
+
+    def test_unknown_patient_field(self):
+        table = shortened_tpa_window(3)
+        table['tpa_eligibility_status']['rules'][2]['when'] = [('patient__systolic', '>', 185)]
+        self.assertRejected(table, "Unknown triage rule fact 'patient__systolic'")
+
+    def test_decision_used_before_it_is_defined(self):
+        table = {'bp_management_target': DEFAULT_TRIAGE_RULES['bp_management_target']}
+        table.update((name, spec) for name, spec in DEFAULT_TRIAGE_RULES.items() if name != 'bp_management_target')
+        self.assertRejected(table, "Unknown triage rule fact 'tpa_eligibility_status'")
+
+    def test_missing_required_decisions(self):
+        table = {name: spec for name, spec in DEFAULT_TRIAGE_RULES.items() if name not in REQUIRED_DECISIONS[-2:]}
+        self.assertRejected(table, "Triage rules must define stroke_center_recommendation, transfer_recommendation.")
@@ -0,0 +1,351 @@
+# assessment/tests/test_scoring.py
+"""
+Exhaustive equivalence tests for the NIHSS and RACE scoring code.
+
+NIHSS items have small finite domains, so the input space of the scoring
+methods can be enumerated in vectorized form and every implementation (the
+per-instance model methods, race.py and the NumPy batch functions in
+scoring.py) checked against reference copies of the original branch-by-branch
+methods. To validate a new or optimized implementation, add it to
+RACE_IMPLEMENTATIONS or NIHSS_TOTAL_IMPLEMENTATIONS.
+
+BatchScoringTests then checks every output column of the batch scorer,
+decoded with decode_scores(), against the per-instance methods over a varied
+cohort that includes the LKW window boundaries and hour rounding ties.
+
+Run with: python manage.py test assessment
+"""
+
+import random
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from ..models import CONTRAINDICATION_FIELDS, NIHSS_FIELDS, NIHSS_ITEM_MAXIMUMS, Patient, StrokeAssessment
+from ..race import RACE_FIELDS, race_score_from_values
+from ..rules import get_rule_engine
+
+try:
+    import numpy as np
+    from ..scoring import _nihss_totals, _race_scores, batch_columns, decode_scores, score_assessments
+except ImportError:  # NumPy is only needed for batch scoring.
+    np = None
+
+
+def item_domain(name, out_of_range=True):
+    """
+    Returns every value an NIHSS item can take: None, the valid range and,
+    optionally, one value below and one above it.
+    """
+    values = list(range(NIHSS_ITEM_MAXIMUMS[name] + 1))
+    if out_of_range:
+        values = [-1] + values + [NIHSS_ITEM_MAXIMUMS[name] + 1]
+    return [None] + values
+
+
+def enumerate_space(domains):
+    """
+    Enumerates the cartesian product of domains (sequences that may contain
+    None) without Python loops. Returns one (values, missing) pair of NumPy
+    arrays per domain, rows in itertools.product order.
+    """
+    sizes = [len(domain) for domain in domains]
+    indices = np.unravel_index(np.arange(np.prod(sizes)), sizes)
+    columns = []
+    for domain, index in zip(domains, indices):
+        values = np.array([0 if value is None else value for value in domain], dtype=np.int64)
+        missing = np.array([value is None for value in domain])
+        columns.append((values[index], missing[index]))
+    return columns
+
+
+def column_rows(columns):
+    """
+    Converts (values, missing) columns into a list of row tuples holding ints and None.
+    """
+    return list(zip(*(np.where(missing, None, values).tolist() for values, missing in columns)))
+
+
+def as_float_array(results):
+    # None becomes NaN.
+    return np.array(list(results), dtype=np.float64)
+
+
+def reference_nihss_total_score(*items):
+    # Original StrokeAssessment.calculate_nihss_total_score; items in NIHSS_FIELDS order.
+    total_score = 0
+    for component in items:
+        if component is not None:
+            total_score += component
+        else:
+            return None
+    return total_score
+
+
+def reference_race_score(facial, left_arm, right_arm, left_leg, right_leg, gaze, language, inattention):
+    # Original StrokeAssessment.calculate_race_score; items in RACE_FIELDS order.
+    race_score = 0
+
+    if facial is not None:
+        if facial == 1: race_score += 1
+        elif facial >= 2: race_score += 2
+
+    arm_motor_score = 0
+    if left_arm is not None and right_arm is not None:
+        worse_arm = max(left_arm, right_arm)
+        if worse_arm >= 2: arm_motor_score = 1
+        if worse_arm >= 4: arm_motor_score = 2
+    elif left_arm is not None:
+        if left_arm >= 2: arm_motor_score = 1
+        if left_arm >= 4: arm_motor_score = 2
+    elif right_arm is not None:
+        if right_arm >= 2: arm_motor_score = 1
+        if right_arm >= 4: arm_motor_score = 2
+    race_score += arm_motor_score
+
+    leg_motor_score = 0
+    if left_leg is not None and right_leg is not None:
+        worse_leg = max(left_leg, right_leg)
+        if worse_leg >= 2: leg_motor_score = 1
+        if worse_leg >= 4: leg_motor_score = 2
+    elif left_leg is not None:
+        if left_leg >= 2: leg_motor_score = 1
+        if left_leg >= 4: leg_motor_score = 2
+    elif right_leg is not None:
+        if right_leg >= 2: leg_motor_score = 1
+        if right_leg >= 4: leg_motor_score = 2
+    race_score += leg_motor_score
+
+    if gaze is not None:
+        if gaze == 1: race_score += 1
+        elif gaze == 2: race_score += 2
+
+    if language is not None:
+        if language >= 2: race_score += 2
+
+    if inattention is not None:
+        if inattention >= 1: race_score += 1
+
+    if None in (facial, left_arm, right_arm, left_leg, right_leg, gaze, language, inattention):
+        return None
+    return race_score
+
+
+def _scalar(function):
+    """
+    Adapts a function of one row tuple into an implementation over whole columns.
+    """
+    return lambda fields, columns: as_float_array(map(function, column_rows(columns)))
+
+
+def _vectorized(function):
+    """
+    Adapts a scoring.py batch function (taking {field: (values, missing)}) into an implementation.
+    """
+    return lambda fields, columns: function(dict(zip(fields, columns)))
+
+
+def _model_method(method):
+    """
+    Adapts a StrokeAssessment method into an implementation, calling it on one
+    unsaved assessment whose items are set row by row.
+    """
+    def run(fields, columns):
+        arrival = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        patient = Patient(
+            arrival_time=arrival, last_known_well_time=arrival, age=70, weight_kg=Decimal('70'),
+            systolic_bp=140, diastolic_bp=80, blood_glucose=Decimal('100'),
+        )
+        assessment = StrokeAssessment(patient=patient, assessment_time=arrival, lvo_status='UNKNOWN')
+        for name in NIHSS_FIELDS:
+            setattr(assessment, name, 0)
+        results = []
+        for row in column_rows(columns):
+            assessment.__dict__.update(zip(fields, row))
+            results.append(method(assessment))
+        return as_float_array(results)
+    return run
+
+
+# Implementations compared against the references, as name -> f(fields, columns).
+RACE_IMPLEMENTATIONS = {
+    'race.race_score_from_values': _scalar(race_score_from_values),
+    'scoring._race_scores': _vectorized(_race_scores),
+}
+NIHSS_TOTAL_IMPLEMENTATIONS = {
+    'scoring._nihss_totals': _vectorized(_nihss_totals),
+}
+# The model methods go through the whole decision bundle, so they are run on
+# the clinically valid space only to keep the suite under a minute.
+RACE_MODEL_IMPLEMENTATIONS = {
+    'StrokeAssessment.calculate_race_score': _model_method(StrokeAssessment.calculate_race_score),
+}
+NIHSS_TOTAL_MODEL_IMPLEMENTATIONS = {
+    'StrokeAssessment.calculate_nihss_total_score': _model_method(StrokeAssessment.calculate_nihss_total_score),
+}
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class ScoringEquivalenceTests(SimpleTestCase):
+
+    def assertImplementationsMatch(self, implementations, reference, fields, columns):
+        expected = as_float_array(reference(*row) for row in column_rows(columns))
+        for name, implementation in implementations.items():
+            with self.subTest(implementation=name):
+                actual = implementation(fields, columns)
+                mismatched = np.flatnonzero(~((actual == expected) | (np.isnan(actual) & np.isnan(expected))))
+                if len(mismatched):
+                    row = column_rows([(values[mismatched[:1]], missing[mismatched[:1]]) for values, missing in columns])[0]
+                    self.fail(
+                        f"{name} differs from the reference on {len(mismatched)} of {len(expected)} inputs, "
+                        f"e.g. {dict(zip(fields, row))}: {actual[mismatched[0]]} != {expected[mismatched[0]]}"
+                    )
+
+    def test_race_score_all_item_combinations(self):
+        # Every combination of None, the valid values and one value either side
+        # of the valid range, for all eight RACE items (about 7.2M inputs).
+        columns = enumerate_space([item_domain(name) for name in RACE_FIELDS])
+        self.assertImplementationsMatch(RACE_IMPLEMENTATIONS, reference_race_score, RACE_FIELDS, columns)
+
+    def test_race_score_model_method(self):
+        columns = enumerate_space([item_domain(name, out_of_range=False) for name in RACE_FIELDS])
+        self.assertImplementationsMatch(RACE_MODEL_IMPLEMENTATIONS, reference_race_score, RACE_FIELDS, columns)
+
+    def test_nihss_total_score(self):
+        # The 15-item product is far too large to enumerate, but the total is a
+        # plain sum: cover every missing/present pattern of the 15 items, and
+        # every value of each item against every value of every other item.
+        fields = NIHSS_FIELDS
+        patterns = np.arange(2 ** len(fields))
+        columns = []
+        for position, name in enumerate(fields):
+            missing = (patterns >> position) & 1 == 1
+            values = (patterns * (position + 1)) % (NIHSS_ITEM_MAXIMUMS[name] + 1)
+            columns.append((values.astype(np.int64), missing))
+        implementations = dict(NIHSS_TOTAL_IMPLEMENTATIONS, **NIHSS_TOTAL_MODEL_IMPLEMENTATIONS)
+        self.assertImplementationsMatch(implementations, reference_nihss_total_score, fields, columns)
+
+        for first in range(len(fields)):
+            for second in range(first + 1, len(fields)):
+                domains = [[1] for _ in fields]
+                domains[first] = item_domain(fields[first])
+                domains[second] = item_domain(fields[second])
+                columns = enumerate_space(domains)
+                self.assertImplementationsMatch(
+                    NIHSS_TOTAL_IMPLEMENTATIONS, reference_nihss_total_score, fields, columns
+                )
+
+
+# decode_scores() output column -> the per-instance method returning the same value.
+BATCH_SCORE_METHODS = {
+    'time_since_lkw_hours': StrokeAssessment.get_time_since_lkw_hours,
+    'within_tpa_window': StrokeAssessment.is_within_tpa_window,
+    'within_thrombectomy_window': StrokeAssessment.is_within_thrombectomy_window,
+    'nihss_total_score': StrokeAssessment.calculate_nihss_total_score,
+    'race_score': StrokeAssessment.calculate_race_score,
+    'tpa_eligibility_status': StrokeAssessment.get_tpa_eligibility_status,
+    'thrombectomy_candidacy': StrokeAssessment.get_thrombectomy_candidacy,
+    'tpa_dose': StrokeAssessment.calculate_tpa_dose,
+}
+
+
+def lkw_offsets():
+    """
+    Returns times from last known well to assessment that probe the batch
+    hours column: both sides of each treatment window, ties of the two-decimal
+    rounding (every 18 seconds is a multiple of 0.005 h), zero and negative.
+    """
+    offsets = [timedelta(0), timedelta(hours=-1), timedelta(microseconds=1), timedelta(days=400)]
+    engine = get_rule_engine()
+    for name in ('within_tpa_window', 'within_thrombectomy_window'):
+        hours = engine.window_hours(name)
+        for nudge in (timedelta(0), timedelta(microseconds=1), timedelta(seconds=1), timedelta(seconds=18)):
+            offsets += [timedelta(hours=hours) - nudge, timedelta(hours=hours) + nudge]
+    offsets += [timedelta(seconds=18 * k) for k in range(1, 2001)]
+    offsets += [timedelta(seconds=18 * k, microseconds=delta) for k in range(1, 200) for delta in (-1, 1)]
+    return offsets
+
+
+def varied_assessments(offsets, seed=1):
+    """
+    Returns one unsaved assessment (with an unsaved patient) per LKW offset,
+    with the other decision inputs drawn at random from their domains.
+    """
+    rng = random.Random(seed)
+    arrival = datetime(2025, 1, 1, 12, tzinfo=dt_timezone.utc)
+    assessments = []
+    for index, offset in enumerate(offsets, start=1):
+        patient = Patient(
+            arrival_time=arrival,
+            last_known_well_time=None if index % 97 == 0 else arrival - offset,
+            age=70,
+            weight_kg=rng.choice([None, Decimal('55.5'), Decimal('80.00'), Decimal('100.00'), Decimal('130.25')]),
+            systolic_bp=rng.choice([120, 184, 185, 186, 220]),
+            diastolic_bp=rng.choice([80, 109, 110, 111]),
+            blood_glucose=Decimal('110'),
+        )
+        assessment = StrokeAssessment(
+            id=index,
+            patient=patient,
+            assessment_time=arrival,
+            hemorrhage_present=rng.random() < 0.1,
+            aspects_score=rng.choice([None, 0, 5, 6, 7, 10]),
+            lvo_status=rng.choice(['NOT_ASSESSED', 'PRESENT', 'ABSENT', 'UNKNOWN']),
+        )
+        for name in NIHSS_FIELDS:
+            setattr(assessment, name, None if rng.random() < 0.02 else rng.randint(0, NIHSS_ITEM_MAXIMUMS[name]))
+        for name in CONTRAINDICATION_FIELDS:
+            setattr(assessment, name, rng.random() < 0.05)
+        assessments.append(assessment)
+    return assessments
+
+
+def batch_rows(assessments):
+    """
+    Returns each assessment's batch_columns() values, as values_list() would.
+    """
+    def value(obj, path):
+        for name in path.split('__'):
+            obj = getattr(obj, name)
+        return obj
+    names = batch_columns()
+    return [tuple(value(assessment, name) for name in names) for assessment in assessments]
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class BatchScoringTests(SimpleTestCase):
+
+    def test_decoded_batch_scores_match_model_methods(self):
+        assessments = varied_assessments(lkw_offsets())
+        decoded = decode_scores(score_assessments(batch_rows(assessments)))
+        self.assertEqual([row['id'] for row in decoded], [assessment.id for assessment in assessments])
+        for column, method in BATCH_SCORE_METHODS.items():
+            with self.subTest(column=column):
+                mismatched = [
+                    (assessment, row[column])
+                    for assessment, row in zip(assessments, decoded)
+                    if row[column] != method(assessment) or type(row[column]) is not type(method(assessment))
+                ]
+                if mismatched:
+                    assessment, actual = mismatched[0]
+                    self.fail(
+                        f"{column} differs from {method.__name__} on {len(mismatched)} of {len(assessments)} "
+                        f"assessments, e.g. LKW {assessment.calculate_time_since_lkw()} before: "
+                        f"{actual!r} != {method(assessment)!r}"
+                    )
+
+    def test_window_boundaries_are_inclusive(self):
+        engine = get_rule_engine()
+        for name in ('within_tpa_window', 'within_thrombectomy_window'):
+            hours = engine.window_hours(name)
+            with self.subTest(window=name, hours=hours):
+                # Hours are rounded to 0.01 (36 seconds) before the windows are applied.
+                on_edge, past_edge = varied_assessments(
+                    [timedelta(hours=hours), timedelta(hours=hours, seconds=36)]
+                )
+                decoded = decode_scores(score_assessments(batch_rows([on_edge, past_edge])))
+                self.assertEqual(decoded[0]['time_since_lkw_hours'], hours)
+                self.assertIs(decoded[0][name], True)
+                self.assertIs(decoded[1][name], False)
@@ -0,0 +1,101 @@
+# assessment/tests/test_settings.py
+"""
+Tests for the environment-driven settings: the database (DATABASE_ENGINE,
+SQLITE_TUNING and the PostgreSQL pool options), ASSESSMENT_FRAGMENT_CACHE
+and API_TOKENS.
+
+Run with: python manage.py test assessment
+"""
+
+import os
+import runpy
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+import stroke_project
+
+SETTINGS_PATH = Path(stroke_project.__file__).parent / 'settings.py'
+
+# Variables the tested settings read, cleared before each load.
+SETTINGS_VARIABLES = (
+    'DATABASE_ENGINE', 'DATABASE_POOL', 'DATABASE_CONN_MAX_AGE', 'SQLITE_TUNING', 'SQLITE_BUSY_TIMEOUT', 'SQLITE_PATH',
+    'ASSESSMENT_FRAGMENT_CACHE', 'API_TOKENS',
+)
+
+
+def load_settings(**environ):
+    """
+    Executes settings.py afresh with environ set and returns its globals.
+    """
+    cleared = {name: value for name, value in os.environ.items() if name not in SETTINGS_VARIABLES}
+    with mock.patch.dict(os.environ, dict(cleared, **environ), clear=True):
+        return runpy.run_path(str(SETTINGS_PATH))
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+
+    def test_default_is_sqlite_in_wal_mode(self):
+        settings = load_settings()
+        database = settings['DATABASES']['default']
+        self.assertEqual(database['ENGINE'], 'stroke_project.sqlite_backend')
+        self.assertEqual(database['OPTIONS'], settings['SQLITE_TUNING_MODES']['wal'])
+
+    def test_sqlite_tuning_modes(self):
+        for mode in ('off', 'wal', 'contention'):
+            with self.subTest(mode=mode):
+                settings = load_settings(SQLITE_TUNING=mode, SQLITE_BUSY_TIMEOUT='2.5')
+                options = settings['DATABASES']['default']['OPTIONS']
+                self.assertEqual(options, settings['SQLITE_TUNING_MODES'][mode])
+                self.assertEqual(options['timeout'], 2.5)
+        self.assertTrue(load_settings(SQLITE_TUNING='contention')['DATABASES']['default']['OPTIONS']['serialize_writes'])
+
+    def test_unknown_sqlite_tuning_is_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "Unknown SQLITE_TUNING 'fast'"):
+            load_settings(SQLITE_TUNING='fast')
+
+    def test_unknown_database_engine_is_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "Unknown DATABASE_ENGINE 'mysql'"):
+            load_settings(DATABASE_ENGINE='mysql')
+
+    def test_postgresql_pools_connections_by_default(self):
+        database = load_settings(DATABASE_ENGINE='postgresql')['DATABASES']['default']
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 20)
+
+    def test_postgresql_without_pool_keeps_connections(self):
+        database = load_settings(
+            DATABASE_ENGINE='postgresql', DATABASE_POOL='0', DATABASE_CONN_MAX_AGE='30'
+        )['DATABASES']['default']
+        self.assertIs(database['OPTIONS']['pool'], False)
+        self.assertEqual(database['CONN_MAX_AGE'], 30)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+
+class FragmentCacheSettingsTests(SimpleTestCase):
+
+    def test_backends(self):
+        for name in ('locmem', 'file', 'redis'):
+            with self.subTest(name=name):
+                settings = load_settings(ASSESSMENT_FRAGMENT_CACHE=name)
+                cache = settings['CACHES']['assessment_fragments']
+                self.assertEqual(cache['BACKEND'], settings['ASSESSMENT_FRAGMENT_CACHE_BACKENDS'][name]['BACKEND'])
+        self.assertIn('LocMemCache', load_settings()['CACHES']['assessment_fragments']['BACKEND'])
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaisesMessage(
+            ImproperlyConfigured, "Unknown ASSESSMENT_FRAGMENT_CACHE 'memcached'; use one of locmem, file, redis."
+        ):
+            load_settings(ASSESSMENT_FRAGMENT_CACHE='memcached')
+
+
+class ApiTokenSettingsTests(SimpleTestCase):
+
+    def test_tokens_are_stripped(self):
+        self.assertEqual(load_settings(API_TOKENS=' tablet-1 , tablet-2,, ')['API_TOKENS'], ['tablet-1', 'tablet-2'])
+
+    def test_no_tokens_by_default(self):
+        self.assertEqual(load_settings()['API_TOKENS'], [])
@@ -0,0 +1,102 @@
+# assessment/tests/test_timeline.py
+"""
+Tests for the delta-encoded assessment timeline and its NIHSS trend.
+
+Run with: python manage.py test assessment
+"""
+
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from ..timeline import DETERIORATION_POINTS, TIMELINE_FIELDS, build_timeline
+from .factories import ARRIVAL, make_assessment, make_patient
+
+
+def timeline_row(index, nihss_total_score, **fields):
+    row = dict.fromkeys(TIMELINE_FIELDS, 0)
+    row.update(
+        id=index + 1,
+        assessment_time=ARRIVAL + timedelta(minutes=15 * index),
+        nihss_total_score=nihss_total_score,
+        **fields,
+    )
+    return row
+
+
+class BuildTimelineTests(SimpleTestCase):
+
+    def test_first_entry_is_complete_and_later_entries_are_deltas(self):
+        rows = [
+            timeline_row(0, 5, nihss_4_facial_palsy=2),
+            timeline_row(1, 5, nihss_4_facial_palsy=2),
+            timeline_row(2, 3, nihss_4_facial_palsy=0),
+        ]
+        entries, _ = build_timeline(rows)
+        self.assertEqual(set(entries[0]['changes']), set(TIMELINE_FIELDS))
+        self.assertEqual(entries[1]['changes'], {})
+        self.assertEqual(entries[2]['changes'], {'nihss_4_facial_palsy': 0, 'nihss_total_score': 3})
+        self.assertEqual(entries[2]['assessment_time'], rows[2]['assessment_time'].isoformat())
+
+    def test_nihss_changes_and_trend(self):
+        entries, trend = build_timeline(
+            [timeline_row(0, 10), timeline_row(1, None), timeline_row(2, 6), timeline_row(3, 8)]
+        )
+        self.assertEqual([entry['nihss_change'] for entry in entries], [None, None, -4, 2])
+        self.assertEqual(trend, {
+            'assessment_count': 4,
+            'baseline': 10,
+            'latest': 8,
+            'best': 6,
+            'worst': 10,
+            'change_from_baseline': -2,
+            'deterioration': None,
+        })
+
+    def test_deterioration_is_first_rise_over_best(self):
+        rows = [
+            timeline_row(0, 8),
+            timeline_row(1, 4),
+            timeline_row(2, 4 + DETERIORATION_POINTS),
+            timeline_row(3, 20),
+        ]
+        _, trend = build_timeline(rows)
+        self.assertEqual(trend['deterioration'], {
+            'assessment_id': 3,
+            'assessment_time': rows[2]['assessment_time'].isoformat(),
+            'points_over_best': DETERIORATION_POINTS,
+            'best_time': rows[1]['assessment_time'].isoformat(),
+        })
+
+    def test_rise_below_threshold_is_not_deterioration(self):
+        _, trend = build_timeline([timeline_row(0, 4), timeline_row(1, 4 + DETERIORATION_POINTS - 1)])
+        self.assertIsNone(trend['deterioration'])
+
+    def test_empty(self):
+        entries, trend = build_timeline([])
+        self.assertEqual(entries, [])
+        self.assertEqual(trend['assessment_count'], 0)
+        self.assertIsNone(trend['change_from_baseline'])
+
+
+class TimelineApiTests(TestCase):
+
+    def test_assessments_oldest_first(self):
+        patient = make_patient()
+        later = make_assessment(patient, assessment_time=ARRIVAL + timedelta(hours=1), nihss_8_sensory=2)
+        earlier = make_assessment(patient)
+        data = self.client.get(reverse('assessment:api_assessment_timeline', args=[patient.id])).json()
+        self.assertEqual([entry['id'] for entry in data['assessments']], [earlier.id, later.id])
+        # Sensory is no RACE item, so race_score stays unchanged and is left out.
+        self.assertEqual(
+            data['assessments'][1]['changes'], {'nihss_8_sensory': 2, 'nihss_total_score': 2, 'hours_since_lkw': 2.0}
+        )
+        self.assertEqual(data['trend']['change_from_baseline'], 2)
+
+    def test_patient_without_assessments_and_unknown_patient(self):
+        patient = make_patient()
+        response = self.client.get(reverse('assessment:api_assessment_timeline', args=[patient.id]))
+        self.assertEqual(response.json()['assessments'], [])
+        response = self.client.get(reverse('assessment:api_assessment_timeline', args=[patient.id + 1]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,93 @@
+# assessment/timeline.py
+"""
+Per-patient assessment timeline for neuro-check trending.
+
+All of a patient's assessments are read in one ordered query of plain values
+(no model instances, no decision bundles; scores come from the stored
+columns). The first entry carries every field, later entries only the fields
+that changed since the entry before, and the NIHSS trend is worked out in the
+same pass.
+"""
+
+from .models import StrokeAssessment
+from .serializers import ASSESSMENT_FIELDS, plain_value
+
+# Fields delta-encoded along the timeline: the recorded items and flags, plus stored scores.
+TIMELINE_FIELDS = tuple(
+    name for name in ASSESSMENT_FIELDS if name != 'treatment_recommendation'
+) + StrokeAssessment.COMPUTED_SCORE_FIELDS
+
+# An NIHSS rise of at least this many points over the best score so far is
+# flagged as early neurological deterioration.
+DETERIORATION_POINTS = 4
+
+
+def timeline_rows(patient_id):
+    """
+    Returns the patient's assessments oldest first as dicts of TIMELINE_FIELDS,
+    'id' and 'assessment_time'. Served by the (patient, assessment_time) index.
+    """
+    return StrokeAssessment.objects.filter(patient_id=patient_id).order_by(
+        'assessment_time', 'id'
+    ).values('id', 'assessment_time', *TIMELINE_FIELDS)
+
+
+def build_timeline(rows):
+    """
+    Delta-encodes assessment rows (oldest first, as from timeline_rows) and
+    computes the NIHSS trend. Returns (entries, trend).
+    Each entry holds id, assessment_time, nihss_total_score, nihss_change
+    (from the previous scored assessment) and 'changes', the TIMELINE_FIELDS
+    whose value differs from the previous entry (all of them on the first).
+    """
+    entries = []
+    previous = None
+    baseline = best = worst = last_score = None
+    best_time = None
+    deterioration = None
+    for row in rows:
+        if previous is None:
+            changes = {name: plain_value(row[name]) for name in TIMELINE_FIELDS}
+        else:
+            changes = {
+                name: plain_value(row[name]) for name in TIMELINE_FIELDS if row[name] != previous[name]
+            }
+        score = row['nihss_total_score']
+        nihss_change = None
+        if score is not None:
+            if baseline is None:
+                baseline = best = worst = score
+                best_time = row['assessment_time']
+            else:
+                nihss_change = score - last_score
+                if score < best:
+                    best, best_time = score, row['assessment_time']
+                worst = max(worst, score)
+                if deterioration is None and score - best >= DETERIORATION_POINTS:
+                    deterioration = {
+                        'assessment_id': row['id'],
+                        'assessment_time': plain_value(row['assessment_time']),
+                        'points_over_best': score - best,
+                        'best_time': plain_value(best_time),
+                    }
+            last_score = score
+        entries.append({
+            'id': row['id'],
+            'assessment_time': plain_value(row['assessment_time']),
+            'nihss_total_score': score,
+            'nihss_change': nihss_change,
+            'changes': changes,
+        })
+        previous = row
+
+    trend = {
+        'assessment_count': len(entries),
+        'baseline': baseline,
+        'latest': last_score,
+        'best': best,
+        'worst': worst,
+        'change_from_baseline': last_score - baseline if baseline is not None else None,
+        # First rise of DETERIORATION_POINTS or more over the best score so far.
+        'deterioration': deterioration,
+    }
+    return entries, trend
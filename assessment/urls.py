@@ -1,7 +1,7 @@
 # assessment/urls.py
 
 from django.urls import path
-from . import views
+from . import api, events, views
 
 app_name = 'assessment'
 
@@ -19,4 +19,15 @@ urlpatterns = [
     # NEW: Detail view for a specific assessment
     path('patient/<int:patient_id>/assessment/<int:assessment_id>/', views.assessment_detail_view, name='assessment_detail'),
     path('patient/<int:patient_id>/delete/', views.patient_delete_view, name='patient_delete'),
+    # Live triage board updates as server-sent events (see events.py)
+    path('events/board/', events.board_events_view, name='board_events'),
+    # Streaming export of all assessments with computed scores (staff only)
+    path('export/assessments.<str:export_format>', views.assessment_export_view, name='assessment_export'),
+
+    # JSON API (see api.py)
+    path('api/patients/', api.patients_api_view, name='api_patients'),
+    path('api/patients/<int:patient_id>/assessments/', api.assessment_create_api_view, name='api_assessment_create'),
+    path('api/patients/<int:patient_id>/timeline/', api.assessment_timeline_api_view, name='api_assessment_timeline'),
+    path('api/patients/<int:patient_id>/assessments/<int:assessment_id>/', api.assessment_detail_api_view, name='api_assessment_detail'),
+    path('api/assessments/bulk/', api.assessment_bulk_api_view, name='api_assessment_bulk'),
 ]
@@ -1,18 +1,65 @@
 # assessment/views.py
+"""
+The patient list, assessment detail and form views are async and use Django's
+async ORM, so under ASGI (stroke_project/asgi.py) a worker serves many tablets
+at once instead of holding a thread per request. Under WSGI Django runs them
+synchronously.
+"""
 
+from asgiref.sync import sync_to_async
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponseBadRequest, StreamingHttpResponse, Http404
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages # NEW: Import messages for user feedback
+from .conditional import assessment_validators, board_validators, not_modified_response, set_validators
 from .forms import PatientForm, StrokeAssessmentForm
-from .models import Patient, StrokeAssessment # Ensure both models are imported
+from .events import live_board_enabled
+from .export import STREAM_WRITERS, iter_export_rows
+from .fragments import arender_assessment_detail
+from .models import Patient, StrokeAssessment, acurrent_change_sequence # Ensure both models are imported
+from .pagination import InvalidCursor, apaginate_patients, get_page_size
 
-def patient_list_view(request):
+async def aget_object_or_404(queryset, **kwargs):
     """
-    Displays a list of all registered patients.
+    Async counterpart of get_object_or_404 for a queryset or manager.
     """
-    patients = Patient.objects.all().order_by('id') # Changed to order by 'id' ascending
-    return render(request, 'assessment/patient_list.html', {'patients': patients})
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
 
-def patient_form_view(request):
+async def patient_list_view(request):
+    """
+    Displays registered patients, newest arrival first, one page at a time.
+    The 'after' query parameter is the cursor of the last patient on the previous page.
+    """
+    # Answer polling displays with 304 Not Modified when nothing changed, before querying the page.
+    # Read before the page, so the live event stream (events.py) replays anything saved in between.
+    board_since = await acurrent_change_sequence()
+    etag, last_modified = board_validators(board_since)
+    response = not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+    cursor = request.GET.get('after')
+    page_size = get_page_size(request)
+    # latest_assessment_id is annotated in the same query, avoiding a lookup per patient in the template
+    try:
+        patients, next_cursor = await apaginate_patients(
+            Patient.objects.with_latest_assessment(), cursor=cursor, page_size=page_size
+        )
+    except InvalidCursor:
+        return HttpResponseBadRequest("Invalid pagination cursor.")
+    response = render(request, 'assessment/patient_list.html', {
+        'patients': patients,
+        'next_cursor': next_cursor,
+        'is_first_page': not cursor,
+        'page_size': page_size,
+        'board_since': board_since,
+        'live_board': live_board_enabled(request),
+    })
+    return set_validators(request, response, etag, last_modified)
+
+async def patient_form_view(request):
     """
     Handles the display and submission of the PatientForm.
     Upon successful submission, redirects to the stroke assessment form for the new patient.
@@ -20,7 +67,8 @@ def patient_form_view(request):
     if request.method == 'POST':
         form = PatientForm(request.POST)
         if form.is_valid():
-            patient = form.save() # Save the new patient object
+            patient = form.save(commit=False)
+            await patient.asave() # Save the new patient object
             # MODIFIED: Redirect directly to the stroke assessment form for the newly created patient
             return redirect('assessment:stroke_assessment_form', patient_id=patient.id)
     else:
@@ -37,18 +85,18 @@ def patient_success_view(request, patient_id):
     # MODIFIED: Always redirect to the patient list
     return redirect('assessment:patient_list')
 
-def stroke_assessment_form_view(request, patient_id):
+async def stroke_assessment_form_view(request, patient_id):
     """
     Handles the display and submission of the StrokeAssessmentForm for a specific patient.
     """
-    patient = get_object_or_404(Patient, pk=patient_id)
+    patient = await aget_object_or_404(Patient.objects, pk=patient_id)
 
     if request.method == 'POST':
         form = StrokeAssessmentForm(request.POST)
         if form.is_valid():
             assessment = form.save(commit=False) # Don't save to DB yet
             assessment.patient = patient # Assign the retrieved patient to the assessment
-            assessment.save() # Now save the assessment to the database
+            await assessment.asave() # Now save the assessment to the database
 
             # NEW: Add a success message for the user
             messages.success(request, f"Assessment for Patient {patient.id} saved successfully!")
@@ -70,13 +118,32 @@ def stroke_assessment_success_view(request, patient_id, assessment_id):
     # MODIFIED: Always redirect to the assessment detail page
     return redirect('assessment:assessment_detail', patient_id=patient.id, assessment_id=assessment.id)
 
-def assessment_detail_view(request, patient_id, assessment_id):
+async def assessment_detail_view(request, patient_id, assessment_id):
     """
     Displays the details of a specific stroke assessment.
     """
-    patient = get_object_or_404(Patient, pk=patient_id)
-    assessment = get_object_or_404(StrokeAssessment, pk=assessment_id, patient=patient)
-    return render(request, 'assessment/assessment_detail.html', {'patient': patient, 'assessment': assessment})
+    # Load the assessment and its patient in one query; the decision bundle reads assessment.patient.
+    assessment = await aget_object_or_404(
+        StrokeAssessment.objects.select_related('patient'), pk=assessment_id, patient_id=patient_id
+    )
+    patient = assessment.patient
+    etag, last_modified = assessment_validators(assessment)
+    response = not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+    countdowns = assessment.get_countdown_timestamps()
+    # The page body is rendered once per version of the assessment and served from cache after that.
+    detail_html = await arender_assessment_detail(assessment, {
+        'patient': patient,
+        'assessment': assessment,
+        'countdowns': countdowns,
+    })
+    response = render(request, 'assessment/assessment_detail.html', {
+        'patient': patient,
+        'detail_html': detail_html,
+        'countdowns': countdowns,
+    })
+    return set_validators(request, response, etag, last_modified)
 
 def patient_delete_view(request, patient_id):
     """
@@ -93,3 +160,17 @@ def patient_delete_view(request, patient_id):
     else:
         # If the request is GET, display the confirmation page
         return render(request, 'assessment/patient_delete_confirm.html', {'patient': patient})
+
+@staff_member_required
+def assessment_export_view(request, export_format):
+    """
+    Streams every assessment, with patient fields and computed scores, as CSV or NDJSON.
+    Rows are generated while the response is sent, so memory use doesn't grow with the table.
+    Restricted to staff because it exports the full patient dataset.
+    """
+    if export_format not in STREAM_WRITERS:
+        raise Http404("Unknown export format.")
+    writer, content_type = STREAM_WRITERS[export_format]
+    response = StreamingHttpResponse(writer(iter_export_rows()), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="assessments.{export_format}"'
+    return response
@@ -2,6 +2,9 @@
 ASGI config for stroke_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project through it (e.g. ``uvicorn stroke_project.asgi:application``)
+when using the live triage board: its event stream (assessment/events.py) is
+async and holds a connection open per board without tying up a worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
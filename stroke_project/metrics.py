@@ -0,0 +1,185 @@
+"""
+In-process request metrics for stroke_project.
+
+RequestMetricsMiddleware opens a per-request collector; SQL queries (through a
+connection execute wrapper) and template renders (through TimedDjangoTemplates)
+add their timings to it. Finished requests are kept in a rolling window per
+view, which the internal metrics endpoint summarizes.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+# Collector for the request currently being handled, or None outside a request.
+_current_metrics = ContextVar('request_metrics', default=None)
+
+# Upper bounds (ms) of the latency histogram buckets; anything slower goes in "+Inf".
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class RequestMetrics:
+    """
+    Accumulates timings for a single request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.total_ms = None
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        return self
+
+    def server_timing(self):
+        """
+        Formats the metrics as a Server-Timing header value.
+        """
+        return (
+            f'total;dur={self.total_ms:.1f}, '
+            f'db;dur={self.sql_ms:.1f};desc="{self.sql_count} queries", '
+            f'tpl;dur={self.template_ms:.1f}'
+        )
+
+
+def start_request():
+    """
+    Starts collecting metrics for the current request and returns (metrics, reset token).
+    """
+    metrics = RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def end_request(token):
+    _current_metrics.reset(token)
+
+
+def sql_metrics_wrapper(execute, sql, params, many, context):
+    """
+    Database execute wrapper that adds each query's duration to the current request.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_count += 1
+        metrics.sql_ms += (time.perf_counter() - started) * 1000
+
+
+def install_sql_wrapper(connection, **kwargs):
+    """
+    Adds sql_metrics_wrapper to a database connection once.
+    Connected to connection_created so it also covers connections opened in
+    worker threads (e.g. by async views).
+    """
+    if sql_metrics_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_metrics_wrapper)
+
+
+connection_created.connect(install_sql_wrapper)
+
+
+class TimedTemplate(Template):
+    """
+    Django template wrapper that adds its render time to the current request.
+    """
+
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_ms += (time.perf_counter() - started) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    DjangoTemplates backend whose templates report render time to RequestMetricsMiddleware.
+    """
+
+    def from_string(self, template_code):
+        template = super().from_string(template_code)
+        return TimedTemplate(template.template, self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+class MetricsRegistry:
+    """
+    Thread-safe rolling window of finished request metrics, grouped by view name.
+    """
+
+    def __init__(self, window=None):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = defaultdict(self._new_window)
+
+    def _new_window(self):
+        window = self.window or getattr(settings, 'REQUEST_METRICS_WINDOW', 1000)
+        return deque(maxlen=window)
+
+    def record(self, view_name, metrics):
+        with self.lock:
+            self.samples[view_name].append(
+                (metrics.total_ms, metrics.sql_count, metrics.sql_ms, metrics.template_ms)
+            )
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self):
+        """
+        Returns a JSON-serializable summary per view: request count, percentiles
+        of each timing, and a latency histogram over the rolling window.
+        """
+        with self.lock:
+            snapshot = {name: list(samples) for name, samples in self.samples.items()}
+        summary = {}
+        for name, samples in sorted(snapshot.items()):
+            total_ms, sql_count, sql_ms, template_ms = zip(*samples)
+            buckets = dict.fromkeys([str(bound) for bound in LATENCY_BUCKETS_MS] + ['+Inf'], 0)
+            for value in total_ms:
+                for bound in LATENCY_BUCKETS_MS:
+                    if value <= bound:
+                        buckets[str(bound)] += 1
+                        break
+                else:
+                    buckets['+Inf'] += 1
+            summary[name] = {
+                'count': len(samples),
+                'total_ms': _percentiles(total_ms),
+                'sql_queries': _percentiles(sql_count),
+                'sql_ms': _percentiles(sql_ms),
+                'template_ms': _percentiles(template_ms),
+                'latency_histogram_ms': buckets,
+            }
+        return summary
+
+
+def _percentiles(values):
+    ordered = sorted(values)
+
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 2)
+
+    return {'p50': pick(0.5), 'p90': pick(0.9), 'p99': pick(0.99), 'max': round(ordered[-1], 2)}
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,52 @@
+"""
+Middleware for stroke_project.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Measures wall time, SQL query count and time, and template render time for
+    each request. Adds them to the response as a Server-Timing header and to
+    the in-process registry served by the internal metrics endpoint.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        # Connections opened before this module was imported missed connection_created.
+        for connection in connections.all(initialized_only=True):
+            metrics.install_sql_wrapper(connection)
+        request_metrics, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    def finish(self, request, response, request_metrics):
+        request_metrics.finish()
+        response['Server-Timing'] = request_metrics.server_timing()
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else 'unresolved'
+        metrics.registry.record(view_name, request_metrics)
+        return response
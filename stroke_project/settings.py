@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +44,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the middleware stack
+    'stroke_project.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,7 +59,8 @@ ROOT_URLCONF = 'stroke_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates subclass that reports render time to RequestMetricsMiddleware
+        'BACKEND': 'stroke_project.metrics.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -74,11 +79,118 @@ WSGI_APPLICATION = 'stroke_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 'sqlite' (single-node deployments and development) or 'postgresql'
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite')
+
+if DATABASE_ENGINE == 'postgresql':
+    # Needs psycopg 3 (pip install "psycopg[pool]")
+    DATABASE_POOL = os.environ.get('DATABASE_POOL', '1') == '1'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('POSTGRES_DB', 'stroke_triage'),
+            'USER': os.environ.get('POSTGRES_USER', 'stroke_triage'),
+            'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+            'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+            'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+            # Django's pool hands connections out per request and can't be combined
+            # with persistent connections; without it, keep connections open instead.
+            'CONN_MAX_AGE': 0 if DATABASE_POOL else int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+            # Check a reused persistent connection is still alive before each request
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+                    'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 20)),
+                    # Seconds a request waits for a free connection before failing
+                    'timeout': float(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+                } if DATABASE_POOL else False,
+            },
+        }
     }
+elif DATABASE_ENGINE == 'sqlite':
+    # Seconds a write waits for another writer's lock before "database is locked"
+    SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 20))
+    # Connection OPTIONS per tuning mode, applied to every new connection.
+    # Compare them under load with: python manage.py stress_test_writes
+    SQLITE_TUNING_MODES = {
+        # Rollback journal and deferred transactions as in stock SQLite, with the
+        # same busy timeout as the other modes so only the journaling differs.
+        'off': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': 'PRAGMA journal_mode=DELETE;',
+        },
+        # WAL lets readers run alongside a writer; synchronous=NORMAL is
+        # durable in WAL mode except against power loss, and much faster.
+        'wal': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+        # WAL, plus each process queues its write transactions on a lock (see
+        # stroke_project/sqlite_backend), for surges of concurrent assessment
+        # POSTs. Writers still fail once the busy timeout runs out, but far
+        # fewer do at a given timeout; BEGIN IMMEDIATE and larger caches made
+        # no difference in stress_test_writes and are left out.
+        'contention': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'serialize_writes': True,
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+    }
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'wal')
+    if SQLITE_TUNING not in SQLITE_TUNING_MODES:
+        raise ImproperlyConfigured(f"Unknown SQLITE_TUNING '{SQLITE_TUNING}'; use one of {', '.join(SQLITE_TUNING_MODES)}.")
+    DATABASES = {
+        'default': {
+            # Django's SQLite backend, plus the 'serialize_writes' option
+            'ENGINE': 'stroke_project.sqlite_backend',
+            'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': dict(SQLITE_TUNING_MODES[SQLITE_TUNING]),
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown DATABASE_ENGINE '{DATABASE_ENGINE}'; use 'sqlite' or 'postgresql'.")
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Backends for the rendered assessment detail cache (see assessment/fragments.py),
+# chosen with the ASSESSMENT_FRAGMENT_CACHE environment variable.
+ASSESSMENT_FRAGMENT_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'assessment-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Shared by every worker process on the host
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('ASSESSMENT_FRAGMENT_CACHE_DIR', BASE_DIR / '.cache' / 'assessment_fragments'),
+    },
+    # A local Redis instance; needs the redis package (pip install redis)
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('ASSESSMENT_FRAGMENT_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+ASSESSMENT_FRAGMENT_CACHE = os.environ.get('ASSESSMENT_FRAGMENT_CACHE', 'locmem')
+if ASSESSMENT_FRAGMENT_CACHE not in ASSESSMENT_FRAGMENT_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"Unknown ASSESSMENT_FRAGMENT_CACHE '{ASSESSMENT_FRAGMENT_CACHE}'; "
+        f"use one of {', '.join(ASSESSMENT_FRAGMENT_CACHE_BACKENDS)}."
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'assessment_fragments': {
+        **ASSESSMENT_FRAGMENT_CACHE_BACKENDS[ASSESSMENT_FRAGMENT_CACHE],
+        # Seconds a render is kept; entries are also dropped when the assessment or patient changes
+        'TIMEOUT': 24 * 60 * 60,
+    },
 }
 
 
@@ -122,3 +234,41 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Patient list pagination (keyset/cursor based, see assessment/pagination.py)
+
+PATIENT_LIST_PAGE_SIZE = int(os.environ.get('PATIENT_LIST_PAGE_SIZE', 50))
+
+PATIENT_LIST_MAX_PAGE_SIZE = 200
+
+
+# Request metrics (see stroke_project/metrics.py)
+
+# Number of recent requests per view kept for the /internal/metrics/ summary
+REQUEST_METRICS_WINDOW = 1000
+
+
+# JSON API (see assessment/api.py)
+
+# Seconds clients may reuse an assessment response without asking again
+API_ASSESSMENT_MAX_AGE = 60
+
+# Largest number of rows accepted by the bulk assessment endpoint in one request
+API_BULK_MAX_ROWS = 10000
+
+# Bearer tokens accepted on API writes from devices without a login session
+# (e.g. ambulance tablets), comma-separated. Logged-in users need none.
+API_TOKENS = [token.strip() for token in os.environ.get('API_TOKENS', '').split(',') if token.strip()]
+
+
+# Live triage board events (see assessment/events.py)
+
+# Seconds between checks for new changes on each open event stream
+BOARD_EVENTS_POLL_SECONDS = 1.0
+
+# Seconds an event stream stays open before the browser reconnects
+BOARD_EVENTS_MAX_SECONDS = 300
+
+# Seconds without events after which a keepalive comment is sent
+BOARD_EVENTS_KEEPALIVE_SECONDS = 15
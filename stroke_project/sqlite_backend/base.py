@@ -0,0 +1,68 @@
+"""
+SQLite backend that can queue a process's write transactions on a lock.
+
+SQLite lets one writer in at a time. A connection that finds the database
+locked sleeps and retries (up to 100 ms between tries) until its busy timeout
+runs out, so with many threads writing at once most of them sleep through the
+moments the lock is free and some give up with "database is locked".
+
+With the 'serialize_writes' option, every transaction opened by atomic()
+first takes a lock shared by the process's threads, and releases it on commit,
+rollback or close. Threads then wait their turn on that lock, which wakes the
+next one as soon as it is released, and only one connection per process is
+left competing for SQLite's lock. Without the option this is Django's SQLite
+backend unchanged.
+"""
+
+import threading
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+_write_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    serialize_writes = False
+    _holds_write_lock = False
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # Read on each connect, so a changed OPTIONS applies to new connections.
+        self.serialize_writes = kwargs.pop('serialize_writes', False)
+        return kwargs
+
+    def _start_transaction_under_autocommit(self):
+        if self.serialize_writes and not self._holds_write_lock:
+            # Waiting here counts against the same busy timeout as waiting on SQLite.
+            if not _write_lock.acquire(timeout=self.settings_dict['OPTIONS'].get('timeout', 5)):
+                raise OperationalError('database is locked')
+            self._holds_write_lock = True
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self._release_write_lock()
+            raise
+
+    def _release_write_lock(self):
+        if self._holds_write_lock:
+            self._holds_write_lock = False
+            _write_lock.release()
+
+    def _commit(self):
+        try:
+            super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            self._release_write_lock()
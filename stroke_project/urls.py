@@ -17,7 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include # Import include
 
+from .views import request_metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('assessment/', include('assessment.urls')), # Include your assessment app's URLs
+    path('internal/metrics/', request_metrics_view, name='request_metrics'), # Rolling request timings (staff only)
 ]
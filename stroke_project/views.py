@@ -0,0 +1,21 @@
+"""
+Project-level views for stroke_project.
+"""
+
+from django.conf import settings
+from django.http import JsonResponse, HttpResponseForbidden
+
+from .metrics import registry
+
+
+def request_metrics_view(request):
+    """
+    Returns the rolling per-view request metrics as JSON.
+    Only available to staff users, or to anyone when DEBUG is on.
+    """
+    if not (settings.DEBUG or request.user.is_staff):
+        return HttpResponseForbidden("Staff access required.")
+    return JsonResponse({
+        'window': getattr(settings, 'REQUEST_METRICS_WINDOW', 1000),
+        'views': registry.summary(),
+    })